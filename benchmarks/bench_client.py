@@ -0,0 +1,110 @@
+"""Latency benchmark for FanSyncBleClient against the simulated fan.
+
+Runs GET and CONTROL operations through the real client code over
+``tests.fansync_sim.SimulatedTransport`` and reports p50/p95/p99 latency per
+operation plus completed sessions (operations) and radio connects per minute. No radio is needed.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_client --ops 200 --connect-latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from custom_components.fansync_ble.client import FanSyncBleClient
+from tests.fansync_sim import SimConfig, SimulatedFan, SimulatedTransport
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(name: str, samples: list[float]) -> str:
+    ms = [s * 1000 for s in samples]
+    return (
+        f"{name:<5} n={len(ms):<5} mean={statistics.fmean(ms) if ms else 0:8.1f}ms "
+        f"p50={percentile(ms, 50):8.1f}ms p95={percentile(ms, 95):8.1f}ms "
+        f"p99={percentile(ms, 99):8.1f}ms"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    fan = SimulatedFan(
+        SimConfig(
+            connect_latency=args.connect_latency,
+            notify_delay=args.notify_delay,
+            loss=args.loss,
+            disconnect_rate=args.disconnect_rate,
+            seed=args.seed,
+        ),
+        speed=1,
+        down=50,
+    )
+    client = FanSyncBleClient(
+        "SIM:00:00:00:00:01",
+        keep_alive=args.keep_alive,
+        transport=SimulatedTransport(fan),
+    )
+    rng = random.Random(args.seed)
+    timings: dict[str, list[float]] = {"get": [], "set": []}
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(args.ops):
+        op = "set" if rng.random() < args.set_ratio else "get"
+        t0 = time.perf_counter()
+        try:
+            if op == "get":
+                await client.get_state(timeout=args.timeout)
+            else:
+                await client.set_fields(
+                    speed=rng.randint(0, 3), down=rng.randint(0, 100)
+                )
+        except Exception:
+            errors += 1
+            continue
+        timings[op].append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    await client.async_close()
+
+    print(
+        f"ops={args.ops} errors={errors} elapsed={elapsed:.2f}s "
+        f"keep_alive={args.keep_alive} connect_latency={args.connect_latency}s "
+        f"notify_delay={args.notify_delay}s loss={args.loss} "
+        f"disconnect_rate={args.disconnect_rate}"
+    )
+    for name, samples in timings.items():
+        print(summarize(name, samples))
+    done = sum(len(samples) for samples in timings.values())
+    print(
+        f"sessions/min={done / elapsed * 60:.1f} "
+        f"connects/min={fan.connects / elapsed * 60:.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=100)
+    parser.add_argument("--set-ratio", type=float, default=0.5)
+    parser.add_argument("--connect-latency", type=float, default=0.05)
+    parser.add_argument("--notify-delay", type=float, default=0.02)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    parser.add_argument("--keep-alive", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Microbenchmarks for the FanSync frame codec.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_codec --frames 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from custom_components.fansync_ble.codec import (
+    FanState,
+    FrameReassembler,
+    build_frame,
+    decode_frames,
+    encode_control,
+    encode_frames,
+)
+from custom_components.fansync_ble.const import RETURN_FAN_STATUS
+
+
+def bench(label: str, stmt, number: int, per: int = 1) -> None:
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    ns = best / (number * per) * 1e9
+    print(f"{label:<34} {ns:10.1f} ns/frame")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100_000)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    st = FanState(speed=2, direction=1, down=60, fan_type=7, valid=True)
+    ret = build_frame(RETURN_FAN_STATUS, 2, 1, 0, 60, 0, 0, 7)
+    states = [
+        FanState(speed=i % 4, down=i % 101, valid=True) for i in range(args.frames)
+    ]
+    capture = encode_frames(RETURN_FAN_STATUS, states)
+    # Captured notifications as a proxy might batch them: 3 frames per payload.
+    chunks = [capture[i : i + 30] for i in range(0, len(capture), 30)]
+
+    n = args.number
+    bench("build_frame", lambda: build_frame(0x31, 2, 1, 0, 60, 0, 0, 7), n)
+    bench("encode_control", lambda: encode_control(st, speed=3), n)
+    bench("FanState.from_bytes", lambda: FanState.from_bytes(ret), n)
+
+    single = FrameReassembler()
+    bench("FrameReassembler.feed (1 frame)", lambda: single.feed(ret), n)
+
+    def feed_chunks() -> None:
+        r = FrameReassembler()
+        for chunk in chunks:
+            r.feed(chunk)
+
+    bench("FrameReassembler.feed (batched)", feed_chunks, 1, args.frames)
+    bench("decode_frames (capture)", lambda: decode_frames(capture), 1, args.frames)
+    bench(
+        "encode_frames (capture)",
+        lambda: encode_frames(RETURN_FAN_STATUS, states),
+        1,
+        args.frames,
+    )
+
+
+if __name__ == "__main__":
+    main()
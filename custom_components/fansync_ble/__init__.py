@@ -1,28 +1,60 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
-from .const import CONF_POLL_INTERVAL, normalize_poll_interval
+from .const import (
+    CONF_IDLE_TIMEOUT,
+    CONF_KEEP_ALIVE,
+    CONF_POLL_INTERVAL,
+    CONF_POLL_MODE,
+    CONF_PUSH_UPDATES,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_PUSH_UPDATES,
+    normalize_idle_timeout,
+    normalize_poll_interval,
+    normalize_poll_mode,
+)
 
 if TYPE_CHECKING:
     # Only import HA types for type checking; avoid runtime dependency during tests
     from homeassistant.core import HomeAssistant
     from homeassistant.config_entries import ConfigEntry
 
-PLATFORMS: list[str] = ["fan", "light"]
+PLATFORMS: list[str] = ["fan", "light", "sensor"]
 
 
 async def async_setup_entry(hass: "HomeAssistant", entry: "ConfigEntry"):
     # Lazy import to avoid importing Home Assistant dependencies at module import time
     from .coordinator import FanSyncCoordinator
+    from .scheduler import async_get_scheduler, async_get_startup_queue
+    from .services import async_setup_services
 
     address = entry.data["address"]
-    poll = entry.options.get(CONF_POLL_INTERVAL) if entry.options else None
+    options = entry.options or {}
+    poll = options.get(CONF_POLL_INTERVAL)
     coord = FanSyncCoordinator(
-        hass, address, poll_interval=normalize_poll_interval(poll)
+        hass,
+        address,
+        poll_interval=normalize_poll_interval(poll),
+        keep_alive=bool(options.get(CONF_KEEP_ALIVE, DEFAULT_KEEP_ALIVE)),
+        idle_timeout=normalize_idle_timeout(options.get(CONF_IDLE_TIMEOUT)),
+        push_updates=bool(options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES)),
+        scheduler=async_get_scheduler(hass),
+        poll_mode=normalize_poll_mode(options.get(CONF_POLL_MODE)),
     )
-    await coord.async_config_entry_first_refresh()
+    # Start from the last persisted state so entities are usable before the radio answers.
+    await coord.async_restore_state()
+    coord.async_start_presence_tracking()
     entry.runtime_data = coord
 
+    # Entities start from the restored (or unknown) state; setup does not wait for
+    # the radio.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # First BLE read, staggered across entries so restarts don't storm the adapters.
+    entry.async_create_background_task(
+        hass,
+        async_get_startup_queue(hass).async_run(entry.entry_id, coord.async_refresh),
+        f"fansync_ble first refresh {address}",
+    )
+    async_setup_services(hass)
 
     # Reload entities when options change (e.g., dimmable flag)
     entry.async_on_unload(entry.add_update_listener(async_options_updated))
@@ -32,9 +64,21 @@ async def async_setup_entry(hass: "HomeAssistant", entry: "ConfigEntry"):
 async def async_unload_entry(hass: "HomeAssistant", entry: "ConfigEntry"):
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
+        await entry.runtime_data.async_shutdown()
         entry.runtime_data = None
     return unload_ok
 
 
+async def async_remove_entry(hass: "HomeAssistant", entry: "ConfigEntry"):
+    """Remove the persisted state of a deleted entry."""
+    from homeassistant.helpers.storage import Store
+
+    from .coordinator import STORAGE_VERSION, storage_key
+
+    await Store(
+        hass, STORAGE_VERSION, storage_key(entry.data["address"])
+    ).async_remove()
+
+
 async def async_options_updated(hass: "HomeAssistant", entry: "ConfigEntry"):
     await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+import asyncio
+import time
+from typing import Callable
+
+from bleak.exc import BleakError
+
+try:
+    from bleak_retry_connector import (
+        BleakAbortedError,
+        BleakConnectionError,
+        BleakNotFoundError,
+        BleakOutOfConnectionSlotsError,
+    )
+except Exception:  # bleak-retry-connector may be provided by HA runtime
+    BleakAbortedError = BleakConnectionError = None  # type: ignore
+    BleakNotFoundError = BleakOutOfConnectionSlotsError = None  # type: ignore
+try:
+    from bleak.exc import BleakDeviceNotFoundError
+except Exception:  # older bleak releases
+    BleakDeviceNotFoundError = None  # type: ignore
+try:
+    from bleak.exc import BleakBluetoothNotAvailableError
+except Exception:  # older bleak releases
+    BleakBluetoothNotAvailableError = None  # type: ignore
+try:
+    from bleak.exc import BleakCharacteristicNotFoundError
+except Exception:  # older bleak releases
+    BleakCharacteristicNotFoundError = None  # type: ignore
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_PROBE_INTERVAL,
+    BREAKER_PROBE_INTERVAL,
+)
+from .scheduler import SlotUnavailable
+
+# Failure kinds reported by ``classify_error``.
+ERROR_TIMEOUT = "timeout"
+ERROR_NOT_FOUND = "not_found"
+ERROR_NO_SLOT = "no_connection_slot"
+ERROR_CONNECTION = "connection_failed"
+ERROR_GATT = "gatt_error"
+ERROR_BLUETOOTH_UNAVAILABLE = "bluetooth_unavailable"
+ERROR_UNKNOWN = "unknown"
+
+# Failures of the shared adapter/proxy rather than the fan; they never trip a breaker.
+NON_DEVICE_ERRORS = frozenset({ERROR_NO_SLOT, ERROR_BLUETOOTH_UNAVAILABLE})
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def _is(err: BaseException, cls) -> bool:
+    return cls is not None and isinstance(err, cls)
+
+
+def classify_error(err: BaseException) -> str:
+    """Map a session failure to an ERROR_* kind by exception type.
+
+    ESPHome proxies and older bleak-retry-connector releases raise a bare
+    ``BleakError``; only then is the message inspected.
+    """
+    if isinstance(err, (asyncio.TimeoutError, TimeoutError)):
+        return ERROR_TIMEOUT
+    if isinstance(err, SlotUnavailable) or _is(err, BleakOutOfConnectionSlotsError):
+        return ERROR_NO_SLOT
+    if _is(err, BleakNotFoundError) or _is(err, BleakDeviceNotFoundError):
+        return ERROR_NOT_FOUND
+    if _is(err, BleakBluetoothNotAvailableError):
+        return ERROR_BLUETOOTH_UNAVAILABLE
+    if _is(err, BleakCharacteristicNotFoundError):
+        return ERROR_GATT
+    if _is(err, BleakConnectionError) or _is(err, BleakAbortedError):
+        return ERROR_CONNECTION
+    if isinstance(err, BleakError):
+        msg = str(err).lower()
+        if "connection slot" in msg:
+            return ERROR_NO_SLOT
+        if "not found" in msg or "reach address" in msg:
+            return ERROR_NOT_FOUND
+        return ERROR_CONNECTION
+    if isinstance(err, (ConnectionError, OSError)):
+        return ERROR_CONNECTION
+    return ERROR_UNKNOWN
+
+
+class CircuitBreaker:
+    """Per-device breaker that stops full sessions to a fan that keeps failing.
+
+    Closed: every poll runs. After ``threshold`` device failures in a row it opens
+    and polls are refused until the probe interval has passed; then it is
+    half-open and one cheap probe may run. A successful probe closes it, a failed
+    one reopens it with the interval doubled up to ``max_interval``.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        interval: float = BREAKER_PROBE_INTERVAL,
+        max_interval: float = BREAKER_MAX_PROBE_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._threshold = threshold
+        self._base_interval = interval
+        self._max_interval = max_interval
+        self._clock = clock
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.interval = interval
+        self.last_error_kind: str | None = None
+        self._opened_at: float | None = None
+        self._next_probe = 0.0
+        self.trips = 0
+        self.probes = 0
+        self.rejected = 0
+
+    @property
+    def probing(self) -> bool:
+        return self.state == STATE_HALF_OPEN
+
+    def allow(self) -> bool:
+        """Return True if a session may run now; may move open to half-open."""
+        if self.state == STATE_OPEN:
+            if self._clock() < self._next_probe:
+                self.rejected += 1
+                return False
+            self.state = STATE_HALF_OPEN
+        if self.state == STATE_HALF_OPEN:
+            self.probes += 1
+        return True
+
+    def seconds_until_probe(self) -> float | None:
+        if self.state != STATE_OPEN:
+            return None
+        return max(0.0, self._next_probe - self._clock())
+
+    def probe_now(self) -> None:
+        """Allow the next poll to probe, e.g. when the fan advertises again."""
+        if self.state == STATE_OPEN:
+            self._next_probe = self._clock()
+
+    def record_success(self) -> None:
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.interval = self._base_interval
+        self._opened_at = None
+
+    def record_failure(self, kind: str) -> bool:
+        """Count a failure of ``kind``; return True if the breaker (re)opened."""
+        self.last_error_kind = kind
+        if kind in NON_DEVICE_ERRORS:
+            if self.state == STATE_HALF_OPEN:
+                # The probe never reached the fan; try again at the same interval.
+                self._open()
+            return False
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN:
+            self.interval = min(self._max_interval, self.interval * 2)
+            self._open()
+            return True
+        if self.state == STATE_CLOSED and self.failures >= self._threshold:
+            self.trips += 1
+            self._open()
+            return True
+        return False
+
+    def _open(self) -> None:
+        now = self._clock()
+        if self.state == STATE_CLOSED:
+            self._opened_at = now
+        self.state = STATE_OPEN
+        self._next_probe = now + self.interval
+
+    def diagnostics(self) -> dict:
+        now = self._clock()
+        until = self.seconds_until_probe()
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "last_error_kind": self.last_error_kind,
+            "probe_interval": self.interval,
+            "next_probe_in": None if until is None else round(until, 1),
+            "open_for": (
+                None if self._opened_at is None else round(now - self._opened_at, 1)
+            ),
+            "trips": self.trips,
+            "probes": self.probes,
+            "rejected_polls": self.rejected,
+        }
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import asyncio
+import time
+from typing import Callable
+
+from .const import (
+    TIMEOUT_MARGIN,
+    TIMEOUT_MIN_SAMPLES,
+    WEAK_RSSI,
+    WEAK_RSSI_FACTOR,
+)
+from .metrics import SessionTimings
+
+
+class Deadline:
+    """End-to-end time budget for one operation, shared by all of its phases."""
+
+    def __init__(
+        self, seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._clock = clock
+        self.budget = seconds
+        self.expires = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cap(self, timeout: float) -> float:
+        """Return ``timeout`` shortened to the time left; raise if none is left."""
+        left = self.remaining()
+        if left <= 0:
+            raise asyncio.TimeoutError(
+                f"Operation budget of {self.budget:g}s exhausted"
+            )
+        return min(timeout, left)
+
+
+class AdaptiveTimeouts:
+    """Per-phase timeouts learned from a device's recent latency.
+
+    A phase uses its fixed ``default`` until it has TIMEOUT_MIN_SAMPLES timings,
+    then TIMEOUT_MARGIN x the p99 of its last TIMEOUT_WINDOW timings, but never
+    below ``minimum``: fast links fail fast and slow ones get the time they need.
+    Waits that timed out are recorded at the time waited, so each miss pushes the
+    timeout up. It is WEAK_RSSI_FACTOR longer when the link is at or below
+    WEAK_RSSI.
+    """
+
+    def __init__(self, timings: SessionTimings) -> None:
+        self._timings = timings
+        self._last: dict[str, float] = {}
+
+    def timeout(
+        self,
+        phase: str,
+        default: float,
+        minimum: float,
+        rssi: int | None = None,
+    ) -> float:
+        value = default
+        hist = self._timings.get(phase)
+        if hist is not None and len(hist.recent) >= TIMEOUT_MIN_SAMPLES:
+            value = max(minimum, hist.recent_percentile(99) / 1000 * TIMEOUT_MARGIN)
+        if rssi is not None and rssi <= WEAK_RSSI:
+            value *= WEAK_RSSI_FACTOR
+        self._last[phase] = value
+        return value
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the most recent timeout (seconds) chosen for each phase."""
+        return {phase: round(value, 3) for phase, value in self._last.items()}
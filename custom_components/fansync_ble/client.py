@@ -1,101 +1,73 @@
 from __future__ import annotations
 import asyncio
-from dataclasses import dataclass
 import inspect
-from typing import Callable, Awaitable, Any
+import time
+from contextlib import contextmanager
+from typing import Callable, Any, Iterator
 from bleak import BleakClient, BleakScanner
+from bleak.exc import BleakError
 
 try:
     from bleak_retry_connector import establish_connection
 except Exception:  # bleak-retry-connector may be provided by HA runtime
     establish_connection = None  # type: ignore
+try:
+    from bleak_retry_connector import (
+        BleakClientWithServiceCache,
+        close_stale_connections,
+        close_stale_connections_by_address,
+    )
+except Exception:  # older bleak-retry-connector releases
+    BleakClientWithServiceCache = None  # type: ignore
+    close_stale_connections = None  # type: ignore
+    close_stale_connections_by_address = None  # type: ignore
+from .budget import AdaptiveTimeouts, Deadline
 from .const import (
+    DEFAULT_IDLE_TIMEOUT,
+    POST_DISCONNECT_DELAY,
+    SESSION_BUDGET,
+    WRITE_CONFIRM_TIMEOUT,
     WRITE_CHAR_UUID,
     NOTIFY_CHAR_UUID,
-    GET_FAN_STATUS,
-    CONTROL_FAN_STATUS,
-    RETURN_FAN_STATUS,
+)
+from .codec import (
+    GET_FRAME as _GET_FRAME,
+    FanState,
+    FrameReassembler,
+    build_frame,  # noqa: F401 - re-exported for callers of the client module
+    encode_control,
+)
+from .metrics import (
+    PHASE_CONNECT,
+    PHASE_DISCONNECT,
+    PHASE_FIRST_RETURN,
+    PHASE_LOCK_WAIT,
+    PHASE_NOTIFY_START,
+    PHASE_RESOLVE,
+    PHASE_SERVICES,
+    PHASE_WRITE,
+    SessionTimings,
+)
+from .paths import (
+    ConnectionPath,
+    FanSyncPathSelector,
+    async_connection_paths,
+    connected_source,
+)
+from .transport import FanSyncTransport
+from .scheduler import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    FanSyncSessionScheduler,
+    PollSuperseded,
+    PrioritySessionLock,
+    SessionLease,
 )
 
 
-def _checksum9(b: bytes | bytearray) -> int:
-    """Compute checksum (sum of first 9 bytes & 0xFF) for 10-byte frames."""
-    return sum(b[:9]) & 0xFF
-
-
-def build_frame(
-    cmd_type: int,
-    speed: int,
-    direction: int,
-    up: int,
-    down: int,
-    timer_lo: int,
-    timer_hi: int,
-    fan_type: int,
-) -> bytes:
-    """Construct a 10-byte protocol frame with checksum.
-
-    Layout: [0]=0x53, [1]=cmd, [2]=speed, [3]=direction, [4]=up, [5]=down,
-            [6]=timerLo, [7]=timerHi, [8]=fanType, [9]=checksum.
-    """
-    arr = bytearray(
-        [
-            0x53,
-            cmd_type & 0xFF,
-            speed & 0xFF,
-            direction & 0xFF,
-            up & 0xFF,
-            down & 0xFF,
-            timer_lo & 0xFF,
-            timer_hi & 0xFF,
-            fan_type & 0xFF,
-        ]
-    )
-    arr.append(_checksum9(arr))
-    return bytes(arr)
-
-
-@dataclass
-class FanState:
-    """In-memory representation of fan state parsed from RETURN frames."""
-
-    speed: int = 0
-    direction: int = 0
-    up: int = 0
-    down: int = 0
-    timer_lo: int = 0
-    timer_hi: int = 0
-    fan_type: int = 0
-    valid: bool = False
-
-    @classmethod
-    def from_bytes(cls, data: bytes) -> "FanState":
-        """Parse a RETURN frame into a FanState, validating header, command, and checksum."""
-        # Expect a 10-byte frame: 9 data bytes + 1 checksum
-        if len(data) >= 10 and data[0] == 0x53 and data[1] == RETURN_FAN_STATUS:
-            # Validate checksum to avoid accepting corrupted frames
-            if _checksum9(data) == (data[9] & 0xFF):
-                return cls(
-                    data[2], data[3], data[4], data[5], data[6], data[7], data[8], True
-                )
-        return cls()
-
-    def minutes(self) -> int:
-        """Combine timer_hi/lo into minutes."""
-        return (self.timer_hi << 8) | self.timer_lo
-
-
-async def discover_candidates(
-    timeout: float = 8.0, name_hint: str | None = None
-) -> list[tuple[str, str]]:
-    """Discover BLE devices and return (address, name) pairs, optionally filtered by name substring."""
-    devices = await BleakScanner.discover(timeout=timeout)
-    nh = (name_hint or "").lower()
-    out: list[tuple[str, str]] = []
-    for d in devices:
-        if d.name and (nh in d.name.lower() if nh else True):
-            out.append((d.address, d.name))
-    return out
+def _echo_matches(frame: bytes, st: "FanState") -> bool:
+    """Return True if a RETURN state reflects the speed/direction/light of a CONTROL frame."""
+    return st.speed == frame[2] and st.direction == frame[3] and st.down == frame[5]
 
 
 def _bleak_ctor_accepts_disconnected() -> bool:
@@ -113,280 +85,805 @@ def _bleak_ctor_accepts_disconnected() -> bool:
     return "disconnected_callback" in sig.parameters
 
 
+# Connection strategies, resolved once per client by ``_connect_strategy``.
+STRATEGY_BRC_HASS = "brc_hass"
+STRATEGY_BRC_NAME = "brc_name"
+STRATEGY_BRC_LEGACY = "brc_legacy"
+STRATEGY_BLEAK_CALLBACK = "bleak_callback"
+STRATEGY_BLEAK_PLAIN = "bleak_plain"
+STRATEGY_TRANSPORT = "transport"
+_BRC_STRATEGIES = (STRATEGY_BRC_HASS, STRATEGY_BRC_NAME, STRATEGY_BRC_LEGACY)
+
+# Per-phase timeouts in seconds: the fixed value is used until the phase has
+# been timed, then the learned one, down to the minimum on a fast link (see
+# budget.AdaptiveTimeouts).
+_RESOLVE_TIMEOUT = 5.0
+_RESOLVE_MIN_TIMEOUT = 1.0
+_CONNECT_TIMEOUT = 15.0
+_CONNECT_MIN_TIMEOUT = 3.0
+_RETURN_MIN_TIMEOUT = 0.3
+
+
+def _brc_call_style(have_hass: bool) -> str:
+    """Pick the ``establish_connection`` signature from its parameters, without calling it."""
+    try:
+        params = inspect.signature(establish_connection).parameters
+    except Exception:
+        return STRATEGY_BRC_NAME
+    names = list(params)
+    if names and names[0] == "hass":
+        return STRATEGY_BRC_HASS if have_hass else STRATEGY_BRC_LEGACY
+    if "name" in params:
+        return STRATEGY_BRC_NAME
+    return STRATEGY_BRC_LEGACY
+
+
 class FanSyncBleClient:
     """Thin BLE client handling frame IO and short-lived sessions.
 
     Follows repository guideline: connect → GET/CONTROL → disconnect with small delays.
+    When ``keep_alive`` is enabled the connection is instead kept open between
+    operations and closed after ``idle_timeout`` seconds without activity. Push
+    mode (``async_start_push``) pins the connection open with a long-lived notify
+    subscription until it drops or is stopped.
     """
 
-    def __init__(self, address: str, connect_retries: int = 3, hass=None):
+    def __init__(
+        self,
+        address: str,
+        connect_retries: int = 3,
+        hass=None,
+        keep_alive: bool = False,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        scheduler: "FanSyncSessionScheduler | None" = None,
+        transport: "FanSyncTransport | None" = None,
+        session_budget: float = SESSION_BUDGET,
+    ):
         self._address = address
         self._connect_retries = connect_retries
         # Optional Home Assistant context; if provided, we can use HA's Bluetooth helper
         self._hass = hass
         # Serialize BLE sessions to avoid overlapping command/poll connections.
-        self._io_lock = asyncio.Lock()
+        # Commands are served before polls and preempt a running poll.
+        self._io_lock = PrioritySessionLock(on_preempt=self._preempt_poll)
+        self._poll_task: asyncio.Task | None = None
+        self._poll_preempted = False
+        # Optional integration-wide scheduler limiting concurrent sessions per adapter.
+        self._scheduler = scheduler
+        self._lease: "SessionLease | None" = None
+        # Optional replacement for bleak (e.g., a simulated fan); see transport.py.
+        self._transport = transport
+        # Keep-alive mode: reuse one connection across operations until idle.
+        self._keep_alive = keep_alive
+        self._idle_timeout = idle_timeout
+        self._client = None
+        self._idle_handle: asyncio.TimerHandle | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._closing = False
+        self._last_activity = 0.0
+        # Push mode: long-lived notify subscription forwarding every RETURN frame.
+        self._push_callback: Callable[[FanState], Any] | None = None
+        self._push_lost_callback: Callable[[], Any] | None = None
+        self._push_client = None
+        # Pending waits for RETURN frames: (future, optional accept predicate).
+        self._state_waiters: list[
+            tuple[asyncio.Future, Callable[[FanState], bool] | None]
+        ] = []
+        self._notify_client = None
+        self._frames = FrameReassembler()
+        # Loop time of the last disconnect; the next connect waits out the cool-down.
+        self._last_disconnect = 0.0
+        # Memoized connect path and HA device lookup (False when unavailable).
+        self._strategy: str | None = None
+        self._resolver: Callable[[], Any] | bool | None = None
+        self._connects: dict[str, int] = {}
+        # Clear stale BlueZ links before the first connect and after failed attempts.
+        self._stale_check_needed = True
+        # Adapter/proxy HA is expected to use for the next session; corrected to
+        # the one it actually used once connected.
+        self._paths = FanSyncPathSelector(
+            scheduler.free_slots if scheduler is not None else None
+        )
+        self._path: ConnectionPath | None = None
+        # Deadline of the operation holding the session lock; phases cut their
+        # learned timeouts to it.
+        self._session_budget = session_budget
+        self._deadline: Deadline | None = None
+        self._stale_cleanups = 0
+        # Per-phase session durations, reported in diagnostics.
+        self.timings = SessionTimings()
+        self._timeouts = AdaptiveTimeouts(self.timings)
+
+    @property
+    def keep_alive(self) -> bool:
+        return self._keep_alive
+
+    @property
+    def push_active(self) -> bool:
+        """Return True while the push notify subscription is live."""
+        return self._push_client is not None and self._push_client is self._client
+
+    @property
+    def _persistent(self) -> bool:
+        return self._keep_alive or self._push_callback is not None
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True if a kept-alive connection is currently open."""
+        return self._client is not None and bool(
+            getattr(self._client, "is_connected", True)
+        )
+
+    def _on_disconnected(self, client) -> None:
+        """Disconnect callback: drop the cached connection and reconnect if still active.
+
+        Called by Bleak on the event loop. Disconnects we initiate ourselves are ignored;
+        unexpected drops within the idle window trigger a background reconnect so the
+        next command is a single write again.
+        """
+        if client is not self._client:
+            return
+        self._client = None
+        self._notify_client = None
+        self._last_disconnect = asyncio.get_running_loop().time()
+        self._release_slot()
+        self._cancel_idle_timer()
+        if self._push_client is client:
+            self._push_client = None
+            lost = self._push_lost_callback
+            if lost is not None and not self._closing:
+                lost()
+            # The push owner decides when to resubscribe.
+            return
+        if self._closing or not self._keep_alive:
+            return
+        loop = asyncio.get_running_loop()
+        if loop.time() - self._last_activity >= self._idle_timeout:
+            return
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = loop.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """Re-open the kept-alive connection after an unexpected disconnect."""
+        await asyncio.sleep(0.4)
+        async with self._io_lock:
+            if self._client is not None or self._closing:
+                return
+            try:
+                with self._budgeted(Deadline(self._session_budget)):
+                    client = await self._open_session()
+            except Exception:
+                # Best-effort; the next operation will connect on demand.
+                return
+            self._close_session_later(client)
+
+    def _select_path(self) -> None:
+        """Predict the adapter or proxy HA will use for the next connect."""
+        if self._hass is None or self._transport is not None:
+            self._path = None
+            return
+        self._path = self._paths.select(
+            async_connection_paths(self._hass, self._address)
+        )
+
+    def _resolve_adapter(self) -> str | None:
+        """Return the source (adapter or proxy) for the next session, if known."""
+        if self._path is not None:
+            return self._path.source
+        if self._hass is None:
+            return None
+        try:
+            from homeassistant.components import bluetooth as ha_bt  # type: ignore
 
-    async def _establish_with_brc(self, target):
-        """Establish connection via bleak-retry-connector handling signature variants.
+            info = ha_bt.async_last_service_info(
+                self._hass, self._address, connectable=True
+            )
+        except Exception:
+            return None
+        return getattr(info, "source", None)
+
+    async def _acquire_slot(self) -> None:
+        """Take a connection slot, waiting no longer than the operation's deadline."""
+        if self._scheduler is None or self._lease is not None:
+            return
+        self._lease = await self._scheduler.async_acquire(
+            self._address,
+            self._resolve_adapter(),
+            self._deadline.remaining() if self._deadline is not None else None,
+        )
+
+    def _release_slot(self) -> None:
+        lease, self._lease = self._lease, None
+        if lease is not None:
+            lease.release()
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    def _on_idle(self) -> None:
+        self._idle_handle = None
+        asyncio.get_running_loop().create_task(self.async_disconnect())
+
+    def _on_reclaim(self) -> None:
+        """Close the idle link so a fan waiting for its slot can connect."""
+        self._cancel_idle_timer()
+        self._on_idle()
+
+    async def async_disconnect(self) -> None:
+        """Close a kept-alive connection, if any."""
+        async with self._io_lock:
+            self._cancel_idle_timer()
+            client, self._client = self._client, None
+            self._push_client = None
+            self._notify_client = None
+            if client is None:
+                return
+            try:
+                with self.timings.time(PHASE_DISCONNECT):
+                    await client.disconnect()
+            except Exception:
+                pass
+            self._last_disconnect = asyncio.get_running_loop().time()
+            self._release_slot()
+
+    async def async_close(self) -> None:
+        """Close the connection and stop reconnecting; used on unload."""
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        await self.async_disconnect()
+
+    async def _open_session(self, attempts: int | None = None):
+        """Return a connected client, reusing the kept-alive connection when possible."""
+        self._cancel_idle_timer()
+        self._last_activity = asyncio.get_running_loop().time()
+        if self._persistent and self.is_connected:
+            if self._lease is not None:
+                self._lease.mark_busy()
+            return self._client
+        # Short cool-down between back-to-back sessions, paid only when needed.
+        wait = self._last_disconnect + POST_DISCONNECT_DELAY - self._last_activity
+        if wait > 0:
+            await asyncio.sleep(wait)
+        if self._lease is None:
+            self._select_path()
+        await self._acquire_slot()
+        try:
+            client = await self._connect(attempts)
+        except BaseException:
+            self._release_slot()
+            raise
+        if self._persistent:
+            self._client = client
+        return client
+
+    async def _close_session(self, client) -> None:
+        """End a session: keep the connection open in keep-alive/push mode, otherwise disconnect."""
+        if self._persistent and client is self._client:
+            if self._push_client is not client:
+                self._close_session_later(client)
+            return
+        if client is self._client:
+            self._client = None
+        await self._stop_notify(client)
+        try:
+            # bleak-retry-connector returns a client compatible with BleakClient API
+            with self.timings.time(PHASE_DISCONNECT):
+                await client.disconnect()
+        except Exception:
+            pass
+        self._last_disconnect = asyncio.get_running_loop().time()
+        self._release_slot()
+
+    def _close_session_later(self, client) -> None:
+        """Schedule the idle disconnect for a kept-alive connection.
 
-        Tries multiple known signatures, always providing a stable name for logging/diagnostics.
+        The link keeps its slot while open; the scheduler closes it early when
+        another fan is waiting for that slot.
         """
-        if establish_connection is None:
-            raise RuntimeError("bleak-retry-connector not available")
-        name = f"fansync_ble_{self._address}"
-        # Preferred HA signature: (hass, client_class, device_or_address, name=..., timeout=...)
-        try:
-            if self._hass is not None:
-                return await establish_connection(
-                    self._hass, BleakClient, target, name=name, timeout=15.0
+        del client
+        if self._lease is not None:
+            self._lease.mark_idle(self._on_reclaim)
+        self._last_activity = asyncio.get_running_loop().time()
+        self._cancel_idle_timer()
+        self._idle_handle = asyncio.get_running_loop().call_later(
+            self._idle_timeout, self._on_idle
+        )
+
+    def _connect_strategy(self) -> str:
+        """Return how this client connects, probing signatures only on first use."""
+        if self._strategy is None and self._transport is not None:
+            self._strategy = STRATEGY_TRANSPORT
+        elif self._strategy is None:
+            ctor_ok = _bleak_ctor_accepts_disconnected()
+            if establish_connection is None:
+                self._strategy = (
+                    STRATEGY_BLEAK_CALLBACK if ctor_ok else STRATEGY_BLEAK_PLAIN
                 )
-        except TypeError:
-            # Fall through to other signatures
-            pass
-        # Signature with keyword name: (client_class, device_or_address, name=..., timeout=...)
+            elif not ctor_ok:
+                # Test stubs or BleakClient builds the connector cannot forward kwargs to
+                self._strategy = STRATEGY_BLEAK_PLAIN
+            else:
+                self._strategy = _brc_call_style(self._hass is not None)
+        return self._strategy
+
+    def _device_resolver(self) -> Callable[[], Any] | None:
+        """Return a cached HA lookup of the connectable BLEDevice, or None outside HA."""
+        if self._resolver is None:
+            resolver: Callable[[], Any] | bool = False
+            if self._hass is not None:
+                try:
+                    # Import lazily to avoid hard dependency outside HA
+                    from homeassistant.components import bluetooth as ha_bt  # type: ignore
+
+                    lookup = ha_bt.async_ble_device_from_address
+
+                    def resolver() -> Any:
+                        return lookup(self._hass, self._address, connectable=True)
+
+                except Exception:
+                    resolver = False
+            self._resolver = resolver
+        return self._resolver or None
+
+    async def _resolve_device(self):
+        """Return a BLEDevice for the address via HA, then BleakScanner, else None."""
+        resolver = self._device_resolver()
+        if resolver is not None:
+            try:
+                dev = resolver()
+            except Exception:
+                dev = None
+            if dev is not None:
+                return dev
         try:
-            return await establish_connection(
-                BleakClient, target, name=name, timeout=15.0
+            return await BleakScanner.find_device_by_address(
+                self._address,
+                timeout=self._phase_timeout(
+                    PHASE_RESOLVE, _RESOLVE_TIMEOUT, _RESOLVE_MIN_TIMEOUT
+                ),
             )
-        except TypeError:
-            pass
-        # Signature with positional name: (client_class, device_or_address, name, timeout=...)
+        except Exception:
+            return None
+
+    async def _close_stale_connections(self, dev) -> None:
+        """Drop connections BlueZ still holds for the fan (e.g., after a crash)."""
+        self._stale_check_needed = False
         try:
-            return await establish_connection(BleakClient, target, name, timeout=15.0)
-        except TypeError:
-            pass
+            if dev is not None and close_stale_connections is not None:
+                await close_stale_connections(dev)
+            elif close_stale_connections_by_address is not None:
+                await close_stale_connections_by_address(self._address)
+            else:
+                return
+        except Exception:
+            return
+        self._stale_cleanups += 1
+
+    async def _establish_with_brc(self, target, strategy: str, timeout: float = 15.0):
+        """Establish connection via bleak-retry-connector using the memoized signature.
+
+        Always provides a stable name for logging/diagnostics when supported. The
+        service-caching client lets repeat sessions skip GATT discovery.
+        """
+        name = f"fansync_ble_{self._address}"
+        client_class = BleakClientWithServiceCache or BleakClient
+        if strategy == STRATEGY_BRC_HASS:
+            # HA signature: (hass, client_class, device_or_address, name=..., timeout=...)
+            return await establish_connection(
+                self._hass,
+                client_class,
+                target,
+                name=name,
+                disconnected_callback=self._on_disconnected,
+                timeout=timeout,
+            )
+        if strategy == STRATEGY_BRC_NAME:
+            return await establish_connection(
+                client_class,
+                target,
+                name=name,
+                disconnected_callback=self._on_disconnected,
+                timeout=timeout,
+            )
         # Old signatures without name
-        return await establish_connection(BleakClient, target, timeout=15.0)
+        return await establish_connection(client_class, target, timeout=timeout)
 
-    async def _connect(self):
+    async def _connect(self, attempts: int | None = None):
+        strategy = self._connect_strategy()
+        attempts = attempts or self._connect_retries
         last = None
-        for _ in range(self._connect_retries):
+        for attempt in range(attempts):
+            if (
+                last is not None
+                and self._deadline is not None
+                and self._deadline.expired
+            ):
+                break
+            began = time.monotonic()
             try:
-                if establish_connection is not None:
-                    # Prefer HA bluetooth helper to resolve BLEDevice if hass is provided
-                    dev = None
-                    if self._hass is not None:
-                        try:
-                            # Import lazily to avoid hard dependency outside HA
-                            from homeassistant.components import bluetooth as ha_bt  # type: ignore
-
-                            dev = ha_bt.async_ble_device_from_address(
-                                self._hass, self._address, connectable=True
-                            )
-                        except Exception:
-                            dev = None
-                    if dev is None:
-                        # Fall back to BleakScanner lookup
-                        try:
-                            dev = await BleakScanner.find_device_by_address(
-                                self._address, timeout=5.0
-                            )
-                        except Exception:
-                            dev = None
-                    # Use bleak-retry-connector when available AND the BleakClient ctor supports
-                    # the extra kwargs that the connector forwards (like disconnected_callback).
-                    use_brc = _bleak_ctor_accepts_disconnected()
-                    if use_brc and dev is not None:
-                        client = await self._establish_with_brc(dev)
-                    elif use_brc:
-                        # Pass address directly; bleak-retry-connector resolves and retries internally
-                        client = await self._establish_with_brc(self._address)
+                if strategy in _BRC_STRATEGIES:
+                    # bleak-retry-connector resolves and retries internally when
+                    # only the address is known.
+                    with self.timings.time(PHASE_RESOLVE):
+                        dev = await self._resolve_device()
+                    if self._stale_check_needed:
+                        await self._close_stale_connections(dev)
+                    # Services are resolved (and cached) by the connector, which
+                    # may also retry internally; the whole call is held to the
+                    # operation's deadline.
+                    timeout = self._phase_timeout(
+                        PHASE_CONNECT, _CONNECT_TIMEOUT, _CONNECT_MIN_TIMEOUT
+                    )
+                    with self.timings.time(PHASE_CONNECT):
+                        client = await asyncio.wait_for(
+                            self._establish_with_brc(
+                                dev if dev is not None else self._address,
+                                strategy,
+                                timeout,
+                            ),
+                            self._deadline.remaining() if self._deadline else None,
+                        )
+                    self._connects[strategy] = self._connects.get(strategy, 0) + 1
+                    self._record_path(client, time.monotonic() - began)
+                    return client
+                timeout = self._phase_timeout(
+                    PHASE_CONNECT, _CONNECT_TIMEOUT, _CONNECT_MIN_TIMEOUT
+                )
+                with self.timings.time(PHASE_CONNECT):
+                    if strategy == STRATEGY_TRANSPORT:
+                        client = await asyncio.wait_for(
+                            self._transport.async_connect(
+                                self._address, self._on_disconnected
+                            ),
+                            timeout,
+                        )
+                    elif strategy == STRATEGY_BLEAK_CALLBACK:
+                        client = BleakClient(
+                            self._address, disconnected_callback=self._on_disconnected
+                        )
+                        await client.connect(timeout=timeout)
                     else:
-                        # Fallback for test stubs or environments without compatible BleakClient signature
                         client = BleakClient(self._address)
-                        await client.connect(timeout=15.0)
-                else:
-                    client = BleakClient(self._address)
-                    await client.connect(timeout=15.0)
+                        await client.connect(timeout=timeout)
                 try:
                     if not getattr(client, "services", None):
                         getter = getattr(client, "get_services", None)
                         if getter:
-                            await getter()
+                            with self.timings.time(PHASE_SERVICES):
+                                await getter()
                 except Exception:
                     pass
+                self._connects[strategy] = self._connects.get(strategy, 0) + 1
+                self._record_path(client, time.monotonic() - began)
                 return client
             except Exception as e:
                 last = e
-                await asyncio.sleep(0.8)
+                self._paths.record_failure()
+                self._stale_check_needed = True
+                if attempt + 1 < attempts:
+                    pause = 0.8
+                    if self._deadline is not None:
+                        pause = min(pause, self._deadline.remaining())
+                    await asyncio.sleep(pause)
         raise last
 
-    async def _ensure_notify(
-        self,
-        client: BleakClient,
-        on_state: Callable[[FanState], Any] | Callable[[FanState], Awaitable[Any]],
-    ):
-        """Start notify for RETURN frames and forward valid states to callback.
+    def _record_path(self, client, seconds: float) -> None:
+        """Base path history and the held slot on the scanner HA actually used."""
+        source = connected_source(client)
+        if source is None:
+            # Not HA's wrapper: the connect went where we resolved it.
+            source = self._path.source if self._path is not None else None
+        self._paths.record(source, seconds)
+        if source is None:
+            return
+        if self._path is None or self._path.source != source:
+            self._path = self._paths.candidate(source)
+        if self._lease is not None:
+            self._lease.move(source)
+
+    @contextmanager
+    def _budgeted(self, deadline: Deadline) -> Iterator[None]:
+        """Make ``deadline`` the budget of the session run inside the block."""
+        self._deadline = deadline
+        try:
+            yield
+        finally:
+            self._deadline = None
 
-        Broad exception handling is intentional: some backends may not support notifications
-        or may intermittently fail. In such cases we proceed with a best-effort GET.
-        """
+    def _phase_timeout(self, phase: str, default: float, minimum: float) -> float:
+        """Learned timeout for ``phase``, cut to what is left of the operation budget.
 
-        async def _cb(_, data: bytearray):
-            st = FanState.from_bytes(bytes(data))
-            if st.valid:
-                res = on_state(st)
-                if asyncio.iscoroutine(res):
-                    await res
+        Raises ``asyncio.TimeoutError`` once the budget is used up.
+        """
+        rssi = self._path.rssi if self._path is not None else None
+        timeout = self._timeouts.timeout(phase, default, minimum, rssi)
+        if self._deadline is not None:
+            timeout = self._deadline.cap(timeout)
+        return timeout
+
+    def connection_diagnostics(self) -> dict:
+        """Return the memoized connect strategy and successful connects per strategy."""
+        return {
+            "strategy": self._strategy,
+            "connects": dict(self._connects),
+            "service_cache": self._strategy in _BRC_STRATEGIES
+            and BleakClientWithServiceCache is not None,
+            "stale_cleanups": self._stale_cleanups,
+            "notifications": self._frames.diagnostics(),
+            "session_budget": self._session_budget,
+            "timeouts": self._timeouts.snapshot(),
+            "path": self._paths.diagnostics(),
+        }
+
+    async def _start_notify(self, client) -> bool:
+        """Subscribe to RETURN notifications on ``client`` once per connection.
 
+        Broad exception handling is intentional: some backends may not support notifications
+        or may intermittently fail. Callers then fall back to fixed delays.
+        """
+        if self._notify_client is client:
+            return True
+        self._frames.reset()
+        try:
+            with self.timings.time(PHASE_NOTIFY_START):
+                await client.start_notify(NOTIFY_CHAR_UUID, self._on_notify)
+        except Exception:
+            return False
+        self._notify_client = client
+        return True
+
+    async def _stop_notify(self, client) -> None:
+        if self._notify_client is not client:
+            return
+        self._notify_client = None
         try:
-            await client.start_notify(NOTIFY_CHAR_UUID, _cb)
+            await client.stop_notify(NOTIFY_CHAR_UUID)
         except Exception:
-            # Notification not critical for get_state fallback; ignore.
             pass
 
+    def _on_notify(self, _, data: bytearray) -> None:
+        """Notify handler: resolve matching waiters and feed the push subscription."""
+        for st in self._frames.feed(data):
+            for fut, accept in self._state_waiters:
+                if not fut.done() and (accept is None or accept(st)):
+                    fut.set_result(st)
+            if self._push_callback is not None:
+                self._push_callback(st)
+
     async def _write(self, client: BleakClient, payload: bytes) -> None:
         """Write payload to the device, trying with response then without as fallback."""
+        with self.timings.time(PHASE_WRITE):
+            await self._write_payload(client, payload)
+
+    async def _write_payload(self, client: BleakClient, payload: bytes) -> None:
         try:
             await client.write_gatt_char(WRITE_CHAR_UUID, payload, response=True)
         except Exception:
             await client.write_gatt_char(WRITE_CHAR_UUID, payload, response=False)
 
-    async def _get_state_unlocked(self, timeout: float = 2.0) -> FanState:
-        """Fetch current state via GET + notify, with timeout fallback.
-
-        Returns a FanState (valid=False if nothing received within timeout).
+    async def _exchange(
+        self,
+        client,
+        payload: bytes,
+        accept: Callable[[FanState], bool] | None,
+        timeout: float,
+    ) -> FanState | None:
+        """Write ``payload`` and wait for the first RETURN frame accepted by ``accept``.
+
+        Returns None when notifications are unavailable or nothing matched in time.
         """
-        client = await self._connect()
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        waiter = (fut, accept)
+        # Register before subscribing so a frame sent on subscribe is not lost.
+        self._state_waiters.append(waiter)
         try:
-            ev = asyncio.Event()
-            state = FanState()
-
-            def on_state(st: FanState) -> None:
-                nonlocal state
-                state = st
-                ev.set()
-
-            await self._ensure_notify(client, on_state)
-            await asyncio.sleep(0.1)
-            get = build_frame(GET_FAN_STATUS, 0, 0, 0, 0, 0, 0, 0)
-            await self._write(client, get)
+            subscribed = self._notify_client is client
+            if not await self._start_notify(client):
+                await self._write(client, payload)
+                return None
+            if not subscribed:
+                # Let the subscription settle before the first write.
+                await asyncio.sleep(0.1)
+            await self._write(client, payload)
+            sent = time.monotonic()
             try:
-                await asyncio.wait_for(ev.wait(), timeout=timeout)
+                st = await asyncio.wait_for(fut, timeout=timeout)
             except asyncio.TimeoutError:
-                pass
-            return state
+                # The reply took at least this long; record it so a slower link
+                # raises the learned timeout instead of missing every reply.
+                self.timings.record(PHASE_FIRST_RETURN, time.monotonic() - sent)
+                return None
+            self.timings.record(PHASE_FIRST_RETURN, time.monotonic() - sent)
+            return st
         finally:
-            try:
-                try:
-                    await client.stop_notify(NOTIFY_CHAR_UUID)
-                except Exception:
-                    pass
-                # bleak-retry-connector returns a client compatible with BleakClient API
-                await client.disconnect()
-            except Exception:
-                pass
-            await asyncio.sleep(0.4)
+            self._state_waiters.remove(waiter)
+
+    async def _read_state(self, client, timeout: float = 2.0) -> FanState:
+        """Send GET on an open connection and wait for the RETURN notification.
+
+        Returns a FanState (valid=False if nothing received within timeout).
+        """
+        wait = self._phase_timeout(PHASE_FIRST_RETURN, timeout, _RETURN_MIN_TIMEOUT)
+        st = await self._exchange(client, _GET_FRAME, None, wait)
+        return st if st is not None else FanState()
 
-    async def get_state(self, timeout: float = 2.0) -> FanState:
+    async def async_start_push(
+        self,
+        on_state: Callable[[FanState], Any],
+        on_lost: Callable[[], Any],
+        timeout: float = 2.0,
+    ) -> FanState:
+        """Open a held connection with a long-lived notify subscription.
+
+        Every valid RETURN frame is forwarded to ``on_state`` until the link drops, at
+        which point ``on_lost`` is called. Returns the state read right after subscribing.
+        """
+        deadline = Deadline(self._session_budget)
         async with self._io_lock:
-            return await self._get_state_unlocked(timeout=timeout)
+            self._push_callback = on_state
+            self._push_lost_callback = on_lost
+            client = None
+            try:
+                with self._budgeted(deadline):
+                    client = await self._open_session()
+                    if not await self._start_notify(client):
+                        raise BleakError("Notifications are not available")
+                    self._push_client = client
+                    self._cancel_idle_timer()
+                    return await self._read_state(client, timeout=timeout)
+            except BaseException:
+                self._push_callback = None
+                self._push_lost_callback = None
+                self._push_client = None
+                if client is not None:
+                    await self._close_session(client)
+                raise
+
+    async def async_stop_push(self) -> None:
+        """Drop the push subscription; the connection follows the keep-alive setting."""
+        async with self._io_lock:
+            client, self._push_client = self._push_client, None
+            self._push_callback = None
+            self._push_lost_callback = None
+            if client is None or client is not self._client:
+                return
+            await self._close_session(client)
+
+    async def _get_state_unlocked(
+        self, timeout: float = 2.0, attempts: int | None = None
+    ) -> FanState:
+        """Fetch current state via GET + notify, with timeout fallback."""
+        client = await self._open_session(attempts)
+        try:
+            return await self._read_state(client, timeout=timeout)
+        finally:
+            await self._close_session(client)
+
+    async def _control_unlocked(
+        self, st: FanState | None, make_frame: Callable[[FanState], bytes]
+    ) -> FanState | None:
+        """Run one CONTROL session; reads state first when none was provided.
+
+        Completes as soon as the device echoes a RETURN frame matching the written
+        speed, direction and light. Returns that echo, or None if none arrived within
+        WRITE_CONFIRM_TIMEOUT.
+        """
+        client = await self._open_session()
+        try:
+            if not st:
+                st = await self._read_state(client)
+            frame = make_frame(st)
+            echo = await self._exchange(
+                client,
+                frame,
+                lambda rx: _echo_matches(frame, rx),
+                self._phase_timeout(
+                    PHASE_FIRST_RETURN, WRITE_CONFIRM_TIMEOUT, _RETURN_MIN_TIMEOUT
+                ),
+            )
+            if self._notify_client is not client and not self._persistent:
+                # No notifications: give the device time to apply the frame before
+                # we drop the link.
+                await asyncio.sleep(0.6)
+            return echo
+        finally:
+            await self._close_session(client)
+
+    def _preempt_poll(self) -> None:
+        """Cancel the running poll so a waiting command can take the session."""
+        task = self._poll_task
+        if task is not None and not task.done():
+            self._poll_preempted = True
+            task.cancel()
+
+    async def get_state(
+        self, timeout: float = 2.0, attempts: int | None = None
+    ) -> FanState:
+        """Poll the device state at low priority.
+
+        ``attempts`` overrides the connect retries (1 for a cheap probe). The whole
+        poll, including the wait for the session lock, shares one deadline of
+        ``session_budget`` seconds; ``timeout`` is the default RETURN wait. Raises
+        ``PollSuperseded`` if a command is queued or arrives while polling.
+        """
+        deadline = Deadline(self._session_budget)
+        queued = time.monotonic()
+        async with self._io_lock.session(PRIORITY_POLL):
+            self.timings.record(PHASE_LOCK_WAIT, time.monotonic() - queued)
+            self._deadline = deadline
+            task = asyncio.get_running_loop().create_task(
+                self._get_state_unlocked(timeout=timeout, attempts=attempts)
+            )
+            self._poll_task = task
+            self._poll_preempted = False
+            try:
+                return await task
+            except asyncio.CancelledError:
+                if self._poll_preempted and task.cancelled():
+                    raise PollSuperseded from None
+                raise
+            finally:
+                self._poll_task = None
+                self._poll_preempted = False
+                self._deadline = None
+
+    async def set_fields(
+        self,
+        *,
+        speed: int | None = None,
+        direction: int | None = None,
+        down: int | None = None,
+        st: FanState | None = None,
+        assume_speed: int | None = None,
+        assume_light: int | None = None,
+    ) -> FanState | None:
+        """Send one CONTROL frame changing any of speed, direction and light.
+
+        Untouched fields are preserved from ``st`` (read from the device when not
+        provided). Without a valid prior state, missing fields fall back to
+        ``assume_speed`` (default 1), forward direction and ``assume_light`` (default 100).
+        Returns the state the device echoed back, or None if no echo was received.
+        """
+        if down is not None:
+            down = max(0, min(100, down))
+        if direction is not None:
+            direction = 1 if direction else 0
+
+        def make_frame(st: FanState) -> bytes:
+            if not st.valid:
+                st = FanState(
+                    speed=1 if assume_speed is None else assume_speed,
+                    down=max(
+                        0, min(100, 100 if assume_light is None else assume_light)
+                    ),
+                )
+            return encode_control(st, speed=speed, direction=direction, down=down)
+
+        deadline = Deadline(self._session_budget)
+        queued = time.monotonic()
+        async with self._io_lock.session(PRIORITY_COMMAND):
+            self.timings.record(PHASE_LOCK_WAIT, time.monotonic() - queued)
+            with self._budgeted(deadline):
+                return await self._control_unlocked(st, make_frame)
 
     async def set_speed(
         self,
         new_speed: int,
         st: FanState | None = None,
         assume_light: int | None = None,
-    ) -> None:
-        async with self._io_lock:
-            if not st:
-                st = await self._get_state_unlocked()
-            client = await self._connect()
-            try:
-                if st.valid:
-                    frame = build_frame(
-                        CONTROL_FAN_STATUS,
-                        new_speed,
-                        st.direction,
-                        st.up,
-                        st.down,
-                        st.timer_lo,
-                        st.timer_hi,
-                        st.fan_type,
-                    )
-                else:
-                    if assume_light is None:
-                        assume_light = 100
-                    frame = build_frame(
-                        CONTROL_FAN_STATUS,
-                        new_speed,
-                        0,
-                        0,
-                        max(0, min(100, assume_light)),
-                        0,
-                        0,
-                        0,
-                    )
-                await self._write(client, frame)
-                await asyncio.sleep(0.6)
-            finally:
-                try:
-                    await client.disconnect()
-                except Exception:
-                    pass
-            await asyncio.sleep(0.4)
+    ) -> FanState | None:
+        return await self.set_fields(speed=new_speed, st=st, assume_light=assume_light)
 
     async def set_light(
         self, percent: int, st: FanState | None = None, assume_speed: int | None = None
-    ) -> None:
-        async with self._io_lock:
-            if not st:
-                st = await self._get_state_unlocked()
-            client = await self._connect()
-            try:
-                new_down = max(0, min(100, percent))
-                if st.valid:
-                    frame = build_frame(
-                        CONTROL_FAN_STATUS,
-                        st.speed,
-                        st.direction,
-                        st.up,
-                        new_down,
-                        st.timer_lo,
-                        st.timer_hi,
-                        st.fan_type,
-                    )
-                else:
-                    if assume_speed is None:
-                        assume_speed = 1
-                    frame = build_frame(
-                        CONTROL_FAN_STATUS, assume_speed, 0, 0, new_down, 0, 0, 0
-                    )
-                await self._write(client, frame)
-                await asyncio.sleep(0.6)
-            finally:
-                try:
-                    await client.disconnect()
-                except Exception:
-                    pass
-            await asyncio.sleep(0.4)
+    ) -> FanState | None:
+        return await self.set_fields(down=percent, st=st, assume_speed=assume_speed)
 
-    async def set_direction(self, direction: int, st: FanState | None = None) -> None:
-        async with self._io_lock:
-            if not st:
-                st = await self._get_state_unlocked()
-            client = await self._connect()
-            try:
-                d = 1 if direction else 0
-                if st.valid:
-                    frame = build_frame(
-                        CONTROL_FAN_STATUS,
-                        st.speed,
-                        d,
-                        st.up,
-                        st.down,
-                        st.timer_lo,
-                        st.timer_hi,
-                        st.fan_type,
-                    )
-                else:
-                    frame = build_frame(CONTROL_FAN_STATUS, 1, d, 0, 100, 0, 0, 0)
-                await self._write(client, frame)
-                await asyncio.sleep(0.6)
-            finally:
-                try:
-                    await client.disconnect()
-                except Exception:
-                    pass
-            await asyncio.sleep(0.4)
+    async def set_direction(
+        self, direction: int, st: FanState | None = None
+    ) -> FanState | None:
+        return await self.set_fields(direction=direction, st=st)
@@ -0,0 +1,221 @@
+"""FanSync frame codec.
+
+Frames are 10 bytes: [0]=0x53, [1]=cmd, [2]=speed, [3]=direction, [4]=up,
+[5]=down, [6]=timerLo, [7]=timerHi, [8]=fanType, [9]=checksum, where the checksum
+is the sum of the first 9 bytes & 0xFF.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import struct
+from typing import Iterable, Iterator
+
+from .const import CONTROL_FAN_STATUS, GET_FAN_STATUS, RETURN_FAN_STATUS
+
+FRAME_LEN = 10
+FRAME_HEADER = 0x53
+
+# Payload fields in frame order (bytes 2..8), shared by encoders and FanState.
+STATE_FIELDS = ("speed", "direction", "up", "down", "timer_lo", "timer_hi", "fan_type")
+_FIELD_INDEX = {name: i for i, name in enumerate(STATE_FIELDS)}
+
+_BODY = struct.Struct("9B")
+_FRAME = struct.Struct("10B")
+
+
+def _checksum9(b: bytes | bytearray | memoryview) -> int:
+    """Compute checksum (sum of first 9 bytes & 0xFF) for 10-byte frames."""
+    return sum(b[:9]) & 0xFF
+
+
+def build_frame(
+    cmd_type: int,
+    speed: int,
+    direction: int,
+    up: int,
+    down: int,
+    timer_lo: int,
+    timer_hi: int,
+    fan_type: int,
+) -> bytes:
+    """Construct a 10-byte protocol frame with checksum."""
+    body = _BODY.pack(
+        FRAME_HEADER,
+        cmd_type & 0xFF,
+        speed & 0xFF,
+        direction & 0xFF,
+        up & 0xFF,
+        down & 0xFF,
+        timer_lo & 0xFF,
+        timer_hi & 0xFF,
+        fan_type & 0xFF,
+    )
+    return body + bytes((sum(body) & 0xFF,))
+
+
+# Constant frames, built once.
+GET_FRAME = build_frame(GET_FAN_STATUS, 0, 0, 0, 0, 0, 0, 0)
+
+
+@dataclass
+class FanState:
+    """In-memory representation of fan state parsed from RETURN frames."""
+
+    speed: int = 0
+    direction: int = 0
+    up: int = 0
+    down: int = 0
+    timer_lo: int = 0
+    timer_hi: int = 0
+    fan_type: int = 0
+    valid: bool = False
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "FanState":
+        """Parse a RETURN frame into a FanState, validating header, command, and checksum."""
+        if len(data) >= FRAME_LEN:
+            st = decode_frame(data)
+            if st is not None:
+                return st
+        return cls()
+
+    def minutes(self) -> int:
+        """Combine timer_hi/lo into minutes."""
+        return (self.timer_hi << 8) | self.timer_lo
+
+
+def encode_state(cmd_type: int, st: FanState) -> bytes:
+    """Encode the payload fields of ``st`` as a frame of ``cmd_type``."""
+    return build_frame(
+        cmd_type,
+        st.speed,
+        st.direction,
+        st.up,
+        st.down,
+        st.timer_lo,
+        st.timer_hi,
+        st.fan_type,
+    )
+
+
+def encode_control(st: FanState, **changes: int | None) -> bytes:
+    """Encode a CONTROL frame from ``st`` with the non-None ``changes`` applied."""
+    values = [getattr(st, name) for name in STATE_FIELDS]
+    for name, value in changes.items():
+        if value is not None:
+            values[_FIELD_INDEX[name]] = value
+    return build_frame(CONTROL_FAN_STATUS, *values)
+
+
+def decode_frame(data, offset: int = 0) -> FanState | None:
+    """Parse the RETURN frame at ``offset``; None if it is not a valid RETURN frame."""
+    f = _FRAME.unpack_from(data, offset)
+    if f[0] != FRAME_HEADER or f[1] != RETURN_FAN_STATUS or sum(f[:9]) & 0xFF != f[9]:
+        return None
+    return FanState(f[2], f[3], f[4], f[5], f[6], f[7], f[8], True)
+
+
+def encode_frames(cmd_type: int, states: Iterable[FanState]) -> bytes:
+    """Encode many states back to back into one buffer."""
+    return b"".join(encode_state(cmd_type, st) for st in states)
+
+
+def iter_decode(buffer) -> Iterator[FanState | None]:
+    """Decode a buffer of back-to-back 10-byte frames, yielding None for bad ones.
+
+    The buffer length must be a multiple of FRAME_LEN; use FrameReassembler for
+    captures that may be misaligned.
+    """
+    for f in _FRAME.iter_unpack(buffer):
+        if (
+            f[0] != FRAME_HEADER
+            or f[1] != RETURN_FAN_STATUS
+            or sum(f[:9]) & 0xFF != f[9]
+        ):
+            yield None
+        else:
+            yield FanState(f[2], f[3], f[4], f[5], f[6], f[7], f[8], True)
+
+
+def decode_frames(buffer) -> list[FanState]:
+    """Return every valid RETURN frame in an aligned buffer of frames."""
+    return [st for st in iter_decode(buffer) if st is not None]
+
+
+class FrameReassembler:
+    """Incremental RETURN-frame parser for split or batched notifications.
+
+    ``feed`` buffers partial frames across calls, resyncs on the 0x53 header and
+    returns every complete RETURN frame found. A lone, well-formed frame (the
+    common case) is parsed in place without buffering.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self.frames = 0
+        # Candidate frames that failed the checksum.
+        self.corrupt_frames = 0
+        # Well-formed frames of another command type.
+        self.ignored_frames = 0
+        # Bytes discarded while searching for a frame header.
+        self.dropped_bytes = 0
+
+    def reset(self) -> None:
+        """Forget a partial frame, e.g. after reconnecting."""
+        self.dropped_bytes += len(self._buf)
+        self._buf.clear()
+
+    def feed(self, data: bytes | bytearray | memoryview) -> list[FanState]:
+        if not self._buf and len(data) == FRAME_LEN:
+            st = self._parse(data, 0)
+            if st is not None:
+                return [st] if st.valid else []
+        self._buf += data
+        return self._drain()
+
+    def _parse(self, data, offset: int) -> FanState | None:
+        f = _FRAME.unpack_from(data, offset)
+        if f[0] != FRAME_HEADER or sum(f[:9]) & 0xFF != f[9]:
+            return None
+        if f[1] != RETURN_FAN_STATUS:
+            self.ignored_frames += 1
+            return FanState()
+        self.frames += 1
+        return FanState(f[2], f[3], f[4], f[5], f[6], f[7], f[8], True)
+
+    def _drain(self) -> list[FanState]:
+        buf = self._buf
+        out: list[FanState] = []
+        pos = 0
+        end = len(buf)
+        while True:
+            start = buf.find(FRAME_HEADER, pos)
+            if start < 0:
+                self.dropped_bytes += end - pos
+                pos = end
+                break
+            self.dropped_bytes += start - pos
+            pos = start
+            if end - pos < FRAME_LEN:
+                break
+            st = self._parse(buf, pos)
+            if st is None:
+                # Not a frame after all; resync past this header byte.
+                self.corrupt_frames += 1
+                self.dropped_bytes += 1
+                pos += 1
+                continue
+            if st.valid:
+                out.append(st)
+            pos += FRAME_LEN
+        del buf[:pos]
+        return out
+
+    def diagnostics(self) -> dict:
+        return {
+            "frames": self.frames,
+            "corrupt_frames": self.corrupt_frames,
+            "ignored_frames": self.ignored_frames,
+            "dropped_bytes": self.dropped_bytes,
+            "buffered_bytes": len(self._buf),
+        }
@@ -0,0 +1,157 @@
+from __future__ import annotations
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from .const import COMMAND_COALESCE_WINDOW, COMMAND_LATENCY_WINDOW
+
+if TYPE_CHECKING:
+    from .client import FanState
+    from .coordinator import FanSyncCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fields that make up a CONTROL intent; later submissions overwrite earlier ones.
+_INTENT_FIELDS = ("speed", "direction", "down", "assume_speed", "assume_light")
+
+
+def _echo_confirms(echo: FanState | None, applied: dict[str, Any]) -> bool:
+    """Return True if ``echo`` is a valid state carrying every written field."""
+    if echo is None or not echo.valid:
+        return False
+    return all(
+        value is None or getattr(echo, key) == value for key, value in applied.items()
+    )
+
+
+class FanSyncCommandQueue:
+    """Coalesce fan/light/direction intents into single CONTROL writes.
+
+    Intents submitted within ``window`` seconds of each other (or while a previous
+    write is still in flight) are merged, keeping only the latest value per field,
+    and sent as one CONTROL frame. Every caller awaits the write that carried its
+    intent. When the device echoes a state matching the write it is published
+    directly; otherwise the merged fields are applied locally and a single refresh
+    is scheduled.
+    """
+
+    def __init__(
+        self, coordinator: "FanSyncCoordinator", window: float = COMMAND_COALESCE_WINDOW
+    ) -> None:
+        self._coordinator = coordinator
+        self._window = window
+        self._pending: dict[str, int] = {}
+        self._waiters: list[asyncio.Future] = []
+        self._task: asyncio.Task | None = None
+        self._submitted = 0
+        self._sent = 0
+        self._confirmed = 0
+        # Durations (ms) of the most recent CONTROL sessions.
+        self._latencies: deque[float] = deque(maxlen=COMMAND_LATENCY_WINDOW)
+
+    async def async_submit(self, **intent: int | None) -> None:
+        """Queue an intent and wait until the CONTROL frame carrying it is written."""
+        for key, value in intent.items():
+            if key not in _INTENT_FIELDS:
+                raise TypeError(f"Unknown command field: {key}")
+            if value is not None:
+                self._pending[key] = value
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        self._submitted += 1
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        await fut
+
+    async def _run(self) -> None:
+        try:
+            await asyncio.sleep(self._window)
+            while self._waiters:
+                fields, waiters = self._pending, self._waiters
+                self._pending, self._waiters = {}, []
+                try:
+                    await self._send(fields)
+                except asyncio.CancelledError:
+                    # Unloaded mid-write: the batch already left self._waiters,
+                    # so cancel() cannot reach it.
+                    for fut in waiters:
+                        if not fut.done():
+                            fut.cancel()
+                    raise
+                except Exception as err:
+                    for fut in waiters:
+                        if not fut.done():
+                            fut.set_exception(err)
+                else:
+                    for fut in waiters:
+                        if not fut.done():
+                            fut.set_result(None)
+        finally:
+            self._task = None
+
+    async def _send(self, fields: dict[str, int]) -> None:
+        coord = self._coordinator
+        # A state restored from storage may be stale; have the client read the
+        # device first so old light/timer bytes are not written back.
+        st = coord._last_state if coord.state_verified else None
+        speed = fields.get("speed")
+        direction = fields.get("direction")
+        down = fields.get("down")
+        if speed is None and direction is None and down is None:
+            return
+        start = time.monotonic()
+        echo = await coord.client.set_fields(
+            speed=speed,
+            direction=direction,
+            down=down,
+            st=st,
+            assume_speed=fields.get("assume_speed"),
+            assume_light=fields.get("assume_light"),
+        )
+        self._latencies.append((time.monotonic() - start) * 1000)
+        self._sent += 1
+        applied: dict[str, Any] = {
+            "speed": speed,
+            "direction": direction,
+            "down": down,
+        }
+        if speed is None and not (st is not None and st.valid):
+            # Without a valid base the device was sent the assumed speed.
+            applied["speed"] = fields.get("assume_speed")
+        if _echo_confirms(echo, applied):
+            # The device already reported its new state; no read-back needed.
+            self._confirmed += 1
+            coord.async_apply_device_state(echo)
+            coord._async_note_activity()
+            return
+        coord.async_apply_local_state(**applied)
+        coord.async_schedule_immediate_refresh()
+
+    def cancel(self) -> None:
+        """Cancel the pending flush; waiting callers receive CancelledError."""
+        if self._task is not None:
+            self._task.cancel()
+        for fut in self._waiters:
+            if not fut.done():
+                fut.cancel()
+        self._pending, self._waiters = {}, []
+
+    @property
+    def last_latency_ms(self) -> float | None:
+        return round(self._latencies[-1], 1) if self._latencies else None
+
+    @property
+    def mean_latency_ms(self) -> float | None:
+        if not self._latencies:
+            return None
+        return round(sum(self._latencies) / len(self._latencies), 1)
+
+    def diagnostics(self) -> dict:
+        return {
+            "submitted": self._submitted,
+            "sent": self._sent,
+            "confirmed": self._confirmed,
+            "pending": len(self._waiters),
+        }
@@ -4,23 +4,102 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from .const import (
     DOMAIN,
-    DEFAULT_NAME_HINT,
     CONF_HAS_LIGHT,
     CONF_DIMMABLE,
     CONF_DIRECTION_SUPPORTED,
     CONF_POLL_INTERVAL,
     CONF_TURN_ON_SPEED,
+    CONF_KEEP_ALIVE,
+    CONF_IDLE_TIMEOUT,
+    CONF_PUSH_UPDATES,
+    CONF_POLL_MODE,
     DEFAULT_HAS_LIGHT,
     DEFAULT_DIMMABLE,
     DEFAULT_DIRECTION_SUPPORTED,
     DEFAULT_POLL_INTERVAL,
     DEFAULT_TURN_ON_SPEED,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_POLL_MODE,
+    POLL_MODES,
     MIN_SPEED,
     MAX_SPEED,
     MIN_POLL_INTERVAL,
     MAX_POLL_INTERVAL,
+    MIN_IDLE_TIMEOUT,
+    MAX_IDLE_TIMEOUT,
 )
-from .client import FanSyncBleClient, discover_candidates
+from .client import FanSyncBleClient
+from .discovery import async_get_scan_cache, is_fansync_advertisement
+
+
+def _device_options_fields() -> dict:
+    """Per-device options asked for when a fan is added."""
+    return {
+        vol.Required(CONF_HAS_LIGHT, default=DEFAULT_HAS_LIGHT): bool,
+        vol.Required(CONF_DIMMABLE, default=DEFAULT_DIMMABLE): bool,
+        vol.Required(
+            CONF_DIRECTION_SUPPORTED, default=DEFAULT_DIRECTION_SUPPORTED
+        ): bool,
+        vol.Required(CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL): vol.All(
+            vol.Coerce(int),
+            vol.Range(min=MIN_POLL_INTERVAL, max=MAX_POLL_INTERVAL),
+        ),
+        vol.Required(CONF_TURN_ON_SPEED, default=DEFAULT_TURN_ON_SPEED): vol.All(
+            vol.Coerce(int),
+            vol.Range(min=MIN_SPEED, max=MAX_SPEED),
+        ),
+    }
+
+
+def _device_options(user_input: dict) -> dict:
+    return {
+        CONF_HAS_LIGHT: user_input.get(CONF_HAS_LIGHT, DEFAULT_HAS_LIGHT),
+        CONF_DIMMABLE: user_input.get(CONF_DIMMABLE, DEFAULT_DIMMABLE),
+        CONF_DIRECTION_SUPPORTED: user_input.get(
+            CONF_DIRECTION_SUPPORTED, DEFAULT_DIRECTION_SUPPORTED
+        ),
+        CONF_POLL_INTERVAL: user_input.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+        CONF_TURN_ON_SPEED: user_input.get(CONF_TURN_ON_SPEED, DEFAULT_TURN_ON_SPEED),
+    }
+
+
+def _async_cached_candidates(hass) -> list[tuple[str, str]] | None:
+    """Return FanSync fans from HA's advertisement cache; None without HA bluetooth."""
+    if hass is None:
+        return None
+    try:
+        from homeassistant.components import bluetooth as ha_bt  # type: ignore
+
+        infos = ha_bt.async_discovered_service_info(hass, connectable=True)
+    except Exception:
+        return None
+    return [
+        (info.address, info.name or info.address)
+        for info in sorted(infos, key=lambda i: getattr(i, "rssi", -127), reverse=True)
+        if is_fansync_advertisement(info)
+    ]
+
+
+async def _async_scan_candidates(hass) -> list[tuple[str, str]]:
+    """Scan for fans, reusing a recent scan's results when there is one."""
+    results = await async_get_scan_cache(hass).async_scan()
+    return [(r.address, r.name) for r in results]
+
+
+async def _async_advertising(hass, address: str) -> bool:
+    """Return True once ``address`` is heard; False if a targeted scan misses it.
+
+    Also True when no scan can run, so the connection probe still decides.
+    """
+    key = address.upper()
+    if any(addr.upper() == key for addr, _ in _async_cached_candidates(hass) or []):
+        return True
+    try:
+        return await async_get_scan_cache(hass).async_find(address) is not None
+    except Exception:
+        return True
 
 
 class FanSyncConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -28,6 +107,40 @@ class FanSyncConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        self._discovered_address: str | None = None
+        self._discovered_name: str | None = None
+
+    async def async_step_bluetooth(self, discovery_info):
+        """Start from an advertisement matched by HA's bluetooth integration."""
+        await self.async_set_unique_id(discovery_info.address)
+        self._abort_if_unique_id_configured()
+        if not is_fansync_advertisement(discovery_info):
+            return self.async_abort(reason="not_supported")
+        self._discovered_address = discovery_info.address
+        self._discovered_name = discovery_info.name or discovery_info.address
+        self.context["title_placeholders"] = {"name": self._discovered_name}
+        return await self.async_step_bluetooth_confirm()
+
+    async def async_step_bluetooth_confirm(self, user_input=None):
+        """Confirm a discovered fan; it is advertising, so no probe session is needed."""
+        address = self._discovered_address
+        if user_input is not None:
+            return self.async_create_entry(
+                title=f"FanSync Bluetooth ({address})",
+                data={"address": address},
+                options=_device_options(user_input),
+            )
+        self._set_confirm_only()
+        return self.async_show_form(
+            step_id="bluetooth_confirm",
+            data_schema=vol.Schema(_device_options_fields()),
+            description_placeholders={
+                "name": self._discovered_name,
+                "address": address,
+            },
+        )
+
     async def async_step_user(self, user_input=None):
         errors = {}
         # If user submitted the form, validate
@@ -38,72 +151,44 @@ class FanSyncConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 await self.async_set_unique_id(address)
                 self._abort_if_unique_id_configured()
-                # Validate connectivity before creating the entry.
-                try:
-                    client = FanSyncBleClient(address, hass=getattr(self, "hass", None))
-                    state = await client.get_state(timeout=3.0)
-                    if not getattr(state, "valid", False):
-                        errors["base"] = "cannot_connect"
-                except Exception:
+                # Validate connectivity before creating the entry. A fan that
+                # is not advertising cannot be connected, so look for it first.
+                if not await _async_advertising(getattr(self, "hass", None), address):
                     errors["base"] = "cannot_connect"
+                else:
+                    await self._async_probe(address, errors)
 
             if not errors:
-                # Build options from submitted fields
-                options = {
-                    CONF_HAS_LIGHT: user_input.get(CONF_HAS_LIGHT, DEFAULT_HAS_LIGHT),
-                    CONF_DIMMABLE: user_input.get(CONF_DIMMABLE, DEFAULT_DIMMABLE),
-                    CONF_DIRECTION_SUPPORTED: user_input.get(
-                        CONF_DIRECTION_SUPPORTED, DEFAULT_DIRECTION_SUPPORTED
-                    ),
-                    CONF_POLL_INTERVAL: user_input.get(
-                        CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL
-                    ),
-                    CONF_TURN_ON_SPEED: user_input.get(
-                        CONF_TURN_ON_SPEED, DEFAULT_TURN_ON_SPEED
-                    ),
-                }
                 return self.async_create_entry(
                     title=f"FanSync Bluetooth ({address})",
                     data={"address": address},
-                    options=options,
+                    options=_device_options(user_input),
                 )
 
-        # Try to discover nearby devices (best-effort)
-        devices = []
+        # Prefer HA's cached advertisements (instant, no radio time); scan only
+        # when they hold no fan that is not configured yet.
+        hass = getattr(self, "hass", None)
+        configured = self._async_configured_addresses()
+        cached = _async_cached_candidates(hass)
+        devices = [d for d in cached or [] if d[0] not in configured]
         discovery_error = None
-        try:
-            devices = await discover_candidates(
-                timeout=8.0, name_hint=DEFAULT_NAME_HINT
-            )
-        except Exception:
-            discovery_error = "bluetooth_unavailable"
-
-        # Build selection list (address only for now)
-        choices = [addr for addr, _ in devices]
+        if not devices:
+            try:
+                devices = await _async_scan_candidates(hass)
+            except Exception:
+                devices = []
+                if cached is None:
+                    discovery_error = "bluetooth_unavailable"
+        choices = {
+            addr: f"{name} ({addr})" if name != addr else addr
+            for addr, name in devices
+            if addr not in configured
+        }
 
         # If no devices found or discovery failed: show a free-text field with helpful error and options
         if not choices:
             schema = vol.Schema(
-                {
-                    vol.Required("address", default=""): str,
-                    vol.Required(CONF_HAS_LIGHT, default=DEFAULT_HAS_LIGHT): bool,
-                    vol.Required(CONF_DIMMABLE, default=DEFAULT_DIMMABLE): bool,
-                    vol.Required(
-                        CONF_DIRECTION_SUPPORTED, default=DEFAULT_DIRECTION_SUPPORTED
-                    ): bool,
-                    vol.Required(
-                        CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL
-                    ): vol.All(
-                        vol.Coerce(int),
-                        vol.Range(min=MIN_POLL_INTERVAL, max=MAX_POLL_INTERVAL),
-                    ),
-                    vol.Required(
-                        CONF_TURN_ON_SPEED, default=DEFAULT_TURN_ON_SPEED
-                    ): vol.All(
-                        vol.Coerce(int),
-                        vol.Range(min=MIN_SPEED, max=MAX_SPEED),
-                    ),
-                }
+                {vol.Required("address", default=""): str, **_device_options_fields()}
             )
             if discovery_error:
                 errors.setdefault("base", discovery_error)
@@ -116,29 +201,25 @@ class FanSyncConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         # Devices found: present a dropdown plus options
         schema = vol.Schema(
-            {
-                vol.Required("address"): vol.In(choices),
-                vol.Required(CONF_HAS_LIGHT, default=DEFAULT_HAS_LIGHT): bool,
-                vol.Required(CONF_DIMMABLE, default=DEFAULT_DIMMABLE): bool,
-                vol.Required(
-                    CONF_DIRECTION_SUPPORTED, default=DEFAULT_DIRECTION_SUPPORTED
-                ): bool,
-                vol.Required(
-                    CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL
-                ): vol.All(
-                    vol.Coerce(int),
-                    vol.Range(min=MIN_POLL_INTERVAL, max=MAX_POLL_INTERVAL),
-                ),
-                vol.Required(
-                    CONF_TURN_ON_SPEED, default=DEFAULT_TURN_ON_SPEED
-                ): vol.All(
-                    vol.Coerce(int),
-                    vol.Range(min=MIN_SPEED, max=MAX_SPEED),
-                ),
-            }
+            {vol.Required("address"): vol.In(choices), **_device_options_fields()}
         )
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
 
+    async def _async_probe(self, address: str, errors: dict) -> None:
+        """Read the fan's state once; set ``cannot_connect`` if that fails."""
+        try:
+            client = FanSyncBleClient(address, hass=getattr(self, "hass", None))
+            state = await client.get_state(timeout=3.0)
+            if not getattr(state, "valid", False):
+                errors["base"] = "cannot_connect"
+        except Exception:
+            errors["base"] = "cannot_connect"
+
+    def _async_configured_addresses(self) -> set[str]:
+        if getattr(self, "hass", None) is None:
+            return set()
+        return set(self._async_current_ids())
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -178,6 +259,10 @@ class FanSyncOptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Coerce(int),
                     vol.Range(min=MIN_POLL_INTERVAL, max=MAX_POLL_INTERVAL),
                 ),
+                vol.Required(
+                    CONF_POLL_MODE,
+                    default=opts.get(CONF_POLL_MODE, DEFAULT_POLL_MODE),
+                ): vol.In(POLL_MODES),
                 vol.Required(
                     CONF_TURN_ON_SPEED,
                     default=opts.get(CONF_TURN_ON_SPEED, DEFAULT_TURN_ON_SPEED),
@@ -185,6 +270,21 @@ class FanSyncOptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Coerce(int),
                     vol.Range(min=MIN_SPEED, max=MAX_SPEED),
                 ),
+                vol.Required(
+                    CONF_KEEP_ALIVE,
+                    default=opts.get(CONF_KEEP_ALIVE, DEFAULT_KEEP_ALIVE),
+                ): bool,
+                vol.Required(
+                    CONF_IDLE_TIMEOUT,
+                    default=opts.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=MIN_IDLE_TIMEOUT, max=MAX_IDLE_TIMEOUT),
+                ),
+                vol.Required(
+                    CONF_PUSH_UPDATES,
+                    default=opts.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES),
+                ): bool,
             }
         )
         return self.async_show_form(step_id="init", data_schema=schema)
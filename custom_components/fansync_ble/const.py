@@ -17,6 +17,10 @@ CONF_DIMMABLE = "dimmable"
 CONF_DIRECTION_SUPPORTED = "direction_supported"
 CONF_POLL_INTERVAL = "poll_interval"
 CONF_TURN_ON_SPEED = "turn_on_speed"
+CONF_KEEP_ALIVE = "keep_alive"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_PUSH_UPDATES = "push_updates"
+CONF_POLL_MODE = "poll_mode"
 
 DEFAULT_HAS_LIGHT = True
 DEFAULT_DIMMABLE = True
@@ -27,6 +31,70 @@ MIN_POLL_INTERVAL = 5
 MAX_POLL_INTERVAL = 300
 MIN_SPEED = 1
 MAX_SPEED = 3
+DEFAULT_KEEP_ALIVE = False
+DEFAULT_IDLE_TIMEOUT = 30  # seconds
+MIN_IDLE_TIMEOUT = 5
+MAX_IDLE_TIMEOUT = 600
+DEFAULT_PUSH_UPDATES = False
+
+# Poll scheduling modes
+POLL_MODE_FIXED = "fixed"  # poll every poll_interval seconds
+POLL_MODE_ADAPTIVE = "adaptive"  # faster after activity, slower when idle or failing
+POLL_MODE_ON_DEMAND = "on_demand"  # only refresh after commands or on request
+POLL_MODES = (POLL_MODE_FIXED, POLL_MODE_ADAPTIVE, POLL_MODE_ON_DEMAND)
+DEFAULT_POLL_MODE = POLL_MODE_FIXED
+ADAPTIVE_FAST_INTERVAL = 5  # seconds, used right after writes or detected changes
+ADAPTIVE_ACTIVE_WINDOW = 60  # seconds a write/change keeps the fast interval
+ADAPTIVE_IDLE_STEP = 4  # unchanged polls before the idle interval doubles
+ADAPTIVE_MAX_INTERVAL = 600  # seconds, cap for idle and failure backoff
+
+# Number of recent polls / commands behind the rolling diagnostic sensors.
+POLL_RESULT_WINDOW = 50
+COMMAND_LATENCY_WINDOW = 20
+
+# Max wait for the RETURN echo confirming a CONTROL write.
+WRITE_CONFIRM_TIMEOUT = 2.0  # seconds
+# Minimum gap between a disconnect and the next connect to the same fan.
+POST_DISCONNECT_DELAY = 0.4  # seconds
+
+# First refresh after setup: at most this many at once, spread by stagger + jitter.
+STARTUP_CONCURRENCY = 2
+STARTUP_STAGGER = 0.5  # seconds between queued entries
+STARTUP_JITTER = 2.0  # seconds of random extra delay
+# Target for all first refreshes to complete, reported in diagnostics.
+STARTUP_BUDGET = 60  # seconds
+
+# Manual scan: give up after SCAN_TIMEOUT, or stop once no new fan has appeared
+# for SCAN_SETTLE seconds; results are reused for SCAN_CACHE_TTL.
+SCAN_TIMEOUT = 8.0  # seconds
+SCAN_SETTLE = 1.5  # seconds
+SCAN_CACHE_TTL = 60  # seconds
+
+# Circuit breaker: open after this many device failures in a row, then probe
+# with a single connect attempt, doubling the wait after each failed probe.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_PROBE_INTERVAL = 60  # seconds
+BREAKER_MAX_PROBE_INTERVAL = 900  # seconds
+
+# Concurrent BLE sessions allowed per adapter/proxy (ESPHome proxies default to 3).
+DEFAULT_ADAPTER_SLOTS = 3
+
+# End-to-end budget for one BLE operation (lock wait, resolve, connect, read/write).
+SESSION_BUDGET = 20.0  # seconds
+# Learned phase timeouts: once a phase has TIMEOUT_MIN_SAMPLES timings, its
+# timeout is TIMEOUT_MARGIN x the p99 of the last TIMEOUT_WINDOW timings (shorter
+# or longer than the fixed default), longer on weak links. Waits that timed out count as samples at the time waited.
+TIMEOUT_MIN_SAMPLES = 5
+TIMEOUT_WINDOW = 20
+TIMEOUT_MARGIN = 2.0
+WEAK_RSSI = -85  # dBm
+WEAK_RSSI_FACTOR = 1.5
+
+# Connection path ranking (dB-equivalent score adjustments per adapter/proxy).
+PATH_STICKY_BONUS = 6  # last path that connected successfully
+
+# Intents arriving within this window are merged into one CONTROL frame.
+COMMAND_COALESCE_WINDOW = 0.15  # seconds
 
 
 def normalize_poll_interval(value) -> int:
@@ -45,3 +113,17 @@ def normalize_turn_on_speed(value) -> int:
     except (TypeError, ValueError):
         return DEFAULT_TURN_ON_SPEED
     return max(MIN_SPEED, min(MAX_SPEED, ivalue))
+
+
+def normalize_poll_mode(value) -> str:
+    """Normalize poll mode to one of POLL_MODES."""
+    return value if value in POLL_MODES else DEFAULT_POLL_MODE
+
+
+def normalize_idle_timeout(value) -> int:
+    """Normalize keep-alive idle timeout to a safe integer range."""
+    try:
+        ivalue = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_IDLE_TIMEOUT
+    return max(MIN_IDLE_TIMEOUT, min(MAX_IDLE_TIMEOUT, ivalue))
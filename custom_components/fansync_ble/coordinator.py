@@ -2,13 +2,15 @@ from __future__ import annotations
 import logging
 from datetime import UTC, datetime, timedelta
 import asyncio
-from dataclasses import replace
-from bleak.exc import BleakError
+from collections import deque
+from dataclasses import asdict, fields, replace
 
 try:
     from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
 except Exception:  # pragma: no cover - fallback for minimal test environments
+    Store = None  # type: ignore[assignment,misc]
 
     class HomeAssistant:  # type: ignore[no-redef]
         def async_create_task(self, _coro):
@@ -27,21 +29,97 @@ except Exception:  # pragma: no cover - fallback for minimal test environments
         async def async_refresh(self):
             return await self._async_update_data()
 
+        async def async_shutdown(self):
+            return None
+
 
-from .client import FanSyncBleClient, FanState
-from .const import DEFAULT_POLL_INTERVAL
+from .breaker import (
+    ERROR_NO_SLOT,
+    ERROR_NOT_FOUND,
+    ERROR_TIMEOUT,
+    STATE_OPEN,
+    CircuitBreaker,
+    classify_error,
+)
+from .client import FanSyncBleClient, FanState, PollSuperseded
+from .commands import FanSyncCommandQueue
+from .presence import REASON_NO_SCANNER, DeviceNotReachable, FanSyncPresence
+from .scheduler import FanSyncSessionScheduler
+from .const import (
+    DOMAIN,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_POLL_MODE,
+    POLL_MODE_ADAPTIVE,
+    POLL_MODE_ON_DEMAND,
+    ADAPTIVE_FAST_INTERVAL,
+    ADAPTIVE_ACTIVE_WINDOW,
+    ADAPTIVE_IDLE_STEP,
+    ADAPTIVE_MAX_INTERVAL,
+    POLL_RESULT_WINDOW,
+    SESSION_BUDGET,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+STORAGE_VERSION = 1
+# Coalesce state writes to disk; the fan can change many times per minute.
+STORAGE_SAVE_DELAY = 10  # seconds
+_STATE_FIELDS = tuple(f.name for f in fields(FanState) if f.name != "valid")
+
+
+def compute_poll_interval(
+    mode: str,
+    base: float,
+    failures: int,
+    since_activity: float | None,
+    unchanged_polls: int,
+) -> float | None:
+    """Return seconds until the next poll, or None to stop timed polling.
+
+    Adaptive mode polls at ADAPTIVE_FAST_INTERVAL for ADAPTIVE_ACTIVE_WINDOW seconds
+    after a write or detected change, doubles the interval every ADAPTIVE_IDLE_STEP
+    unchanged polls, and backs off exponentially on consecutive failures.
+    """
+    if mode == POLL_MODE_ON_DEMAND:
+        return None
+    if mode != POLL_MODE_ADAPTIVE:
+        return base
+    if failures:
+        return min(ADAPTIVE_MAX_INTERVAL, base * 2 ** min(failures, 16))
+    if since_activity is not None and since_activity < ADAPTIVE_ACTIVE_WINDOW:
+        return min(base, ADAPTIVE_FAST_INTERVAL)
+    return min(
+        ADAPTIVE_MAX_INTERVAL, base * 2 ** (unchanged_polls // ADAPTIVE_IDLE_STEP)
+    )
+
+
+def storage_key(address: str) -> str:
+    """Return the storage key holding the last known state for ``address``."""
+    return f"{DOMAIN}.{address.replace(':', '').lower()}"
+
 
 class FanSyncCoordinator(DataUpdateCoordinator):
     """Coordinator that periodically polls the fan state over BLE.
 
     Keeps the last known (possibly invalid) state to avoid flapping availability.
+    The last valid state is persisted so it can be restored, unverified, at startup.
+    In push mode it holds a notify subscription open instead and only polls while
+    the subscription is down.
     """
 
     def __init__(
-        self, hass: HomeAssistant, address: str, poll_interval: int | None = None
+        self,
+        hass: HomeAssistant,
+        address: str,
+        poll_interval: int | None = None,
+        keep_alive: bool = DEFAULT_KEEP_ALIVE,
+        idle_timeout: int | None = None,
+        push_updates: bool = DEFAULT_PUSH_UPDATES,
+        scheduler: FanSyncSessionScheduler | None = None,
+        poll_mode: str = DEFAULT_POLL_MODE,
     ):
         super().__init__(
             hass,
@@ -49,13 +127,42 @@ class FanSyncCoordinator(DataUpdateCoordinator):
             name="fansync_ble",
             update_interval=timedelta(seconds=poll_interval or DEFAULT_POLL_INTERVAL),
         )
-        self.client = FanSyncBleClient(address, hass=hass)
+        self.client = FanSyncBleClient(
+            address,
+            hass=hass,
+            keep_alive=keep_alive,
+            idle_timeout=idle_timeout or DEFAULT_IDLE_TIMEOUT,
+            scheduler=scheduler,
+        )
         self.address = address
         self._last_state: "FanState | None" = None
         self._last_success_at: datetime | None = None
         self._last_attempt_at: datetime | None = None
         self._consecutive_failures = 0
         self._last_error: str | None = None
+        # Whether _last_state was confirmed by the device since startup.
+        self._state_verified = False
+        self._restored_at: str | None = None
+        self._store = (
+            Store(hass, STORAGE_VERSION, storage_key(address))
+            if Store is not None
+            else None
+        )
+        self._poll_interval = timedelta(seconds=poll_interval or DEFAULT_POLL_INTERVAL)
+        self._push_updates = push_updates
+        self._poll_mode = poll_mode
+        self._last_activity_at: datetime | None = None
+        self._unchanged_polls = 0
+        self._commands = FanSyncCommandQueue(self)
+        self._presence = FanSyncPresence(
+            hass,
+            address,
+            self._async_device_seen,
+            link_held=lambda: self.client.is_connected,
+        )
+        # Outcome of the most recent polls, for the success-ratio sensor.
+        self._poll_results: deque[bool] = deque(maxlen=POLL_RESULT_WINDOW)
+        self._breaker = CircuitBreaker()
 
     def async_apply_local_state(
         self,
@@ -77,12 +184,188 @@ class FanSyncCoordinator(DataUpdateCoordinator):
         if down is not None:
             st.down = down
         self._last_state = st
+        self._async_note_activity()
         self.async_set_updated_data(st)
 
+    async def async_control(
+        self,
+        *,
+        speed: int | None = None,
+        direction: int | None = None,
+        down: int | None = None,
+        assume_speed: int | None = None,
+        assume_light: int | None = None,
+    ) -> None:
+        """Queue a control intent; concurrent intents are coalesced into one write."""
+        if self._presence.unreachable_reason() == REASON_NO_SCANNER:
+            raise DeviceNotReachable(
+                f"No connectable Bluetooth adapter or proxy can reach {self.address}"
+            )
+        await self._commands.async_submit(
+            speed=speed,
+            direction=direction,
+            down=down,
+            assume_speed=assume_speed,
+            assume_light=assume_light,
+        )
+
     def async_schedule_immediate_refresh(self) -> None:
         """Trigger a non-debounced refresh in the background."""
         self.hass.async_create_task(self.async_refresh())
 
+    def async_start_presence_tracking(self) -> None:
+        """Follow advertisements so polls skip fans that are off or out of range."""
+        self._presence.async_start()
+
+    def _async_device_seen(self) -> None:
+        """Refresh right away when an absent fan advertises again."""
+        self._breaker.probe_now()
+        self.async_schedule_immediate_refresh()
+
+    @property
+    def state_verified(self) -> bool:
+        """Return False while the state is restored from storage or only assumed."""
+        return self._state_verified
+
+    async def async_restore_state(self) -> None:
+        """Load the last persisted valid state as an unverified starting point."""
+        if self._store is None:
+            return
+        try:
+            data = await self._store.async_load()
+        except Exception as e:  # corrupt or unreadable storage is not fatal
+            _LOGGER.debug("FanSync Bluetooth could not restore state: %s", e)
+            return
+        if not data or self._last_state is not None:
+            return
+        stored = data.get("state") or {}
+        try:
+            st = FanState(
+                **{k: int(stored[k]) for k in _STATE_FIELDS if k in stored},
+                valid=True,
+            )
+        except (TypeError, ValueError):
+            return
+        self._last_state = st
+        self._state_verified = False
+        self._restored_at = data.get("saved_at")
+
+    def _async_note_activity(self) -> None:
+        """Record a write or detected change; adaptive polling speeds up for a while."""
+        self._last_activity_at = datetime.now(UTC)
+        self._unchanged_polls = 0
+        if self._poll_mode == POLL_MODE_ADAPTIVE:
+            self._async_update_poll_interval()
+
+    def _async_update_poll_interval(self) -> None:
+        """Pick the next poll interval for the current mode, push state and health."""
+        if self._push_updates and self.client.push_active:
+            # No timed polling while the subscription delivers updates.
+            self.update_interval = None
+            return
+        until_probe = self._breaker.seconds_until_probe()
+        if until_probe is not None:
+            # Breaker open: the next poll is the probe.
+            self.update_interval = timedelta(seconds=max(1.0, until_probe))
+            return
+        since = (
+            (datetime.now(UTC) - self._last_activity_at).total_seconds()
+            if self._last_activity_at is not None
+            else None
+        )
+        base = self._poll_interval.total_seconds()
+        seconds = compute_poll_interval(
+            self._poll_mode,
+            base,
+            self._consecutive_failures,
+            since,
+            self._unchanged_polls,
+        )
+        if seconds is None and self._push_updates:
+            # Keep retrying the subscription even when polling is on demand.
+            seconds = base
+        self.update_interval = None if seconds is None else timedelta(seconds=seconds)
+
+    def _async_record_live_state(self, st: FanState) -> None:
+        """Adopt a state read from the device and schedule persisting it."""
+        prev = self._last_state
+        if prev is not None and prev.valid and prev == st:
+            self._unchanged_polls += 1
+        elif prev is not None and prev.valid:
+            self._async_note_activity()
+        self._last_state = st
+        self._state_verified = True
+        if self._store is not None:
+            self._store.async_delay_save(self._stored_data, STORAGE_SAVE_DELAY)
+
+    def _stored_data(self) -> dict:
+        st = self._last_state
+        state = asdict(st) if st is not None else {}
+        state.pop("valid", None)
+        return {"state": state, "saved_at": datetime.now(UTC).isoformat()}
+
+    def async_apply_device_state(self, st: FanState) -> None:
+        """Publish a state reported by the device outside of a poll."""
+        self._async_record_live_state(st)
+        self._consecutive_failures = 0
+        self._last_error = None
+        self._last_success_at = datetime.now(UTC)
+        self._breaker.record_success()
+        self.async_set_updated_data(st)
+
+    def _async_handle_push_state(self, st: FanState) -> None:
+        """Publish a RETURN frame received over the push subscription."""
+        self.async_apply_device_state(st)
+
+    def _async_handle_push_lost(self) -> None:
+        """Fall back to timed polling until the subscription is re-established."""
+        _LOGGER.debug("FanSync Bluetooth push subscription lost for %s", self.address)
+        self._async_update_poll_interval()
+        self.async_schedule_immediate_refresh()
+
+    async def _async_fetch_state(self, probe: bool = False) -> FanState:
+        """Read state, (re)subscribing first when push mode is enabled.
+
+        A ``probe`` is a single connect attempt with a short read timeout.
+        """
+        if probe:
+            return await self.client.get_state(timeout=2.0, attempts=1)
+        if self._push_updates and not self.client.push_active:
+            return await self.client.async_start_push(
+                self._async_handle_push_state,
+                self._async_handle_push_lost,
+                timeout=4.0,
+            )
+        return await self.client.get_state(timeout=4.0)
+
+    def link_stats(self) -> dict:
+        """Return link-quality values for the diagnostic sensors."""
+        results = self._poll_results
+        since_good = (
+            (datetime.now(UTC) - self._last_success_at).total_seconds()
+            if self._last_success_at
+            else None
+        )
+        return {
+            "last_command_latency": self._commands.last_latency_ms,
+            "mean_command_latency": self._commands.mean_latency_ms,
+            "poll_success_ratio": (
+                round(100 * sum(results) / len(results), 1) if results else None
+            ),
+            "consecutive_failures": self._consecutive_failures,
+            "seconds_since_good_state": (
+                round(since_good) if since_good is not None else None
+            ),
+            "rssi": self._presence.last_rssi,
+        }
+
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled refreshes and close any kept-alive BLE connection."""
+        self._commands.cancel()
+        self._presence.async_stop()
+        await super().async_shutdown()
+        await self.client.async_close()
+
     def diagnostics_snapshot(self) -> dict:
         """Return lightweight coordinator health diagnostics."""
         return {
@@ -95,51 +378,99 @@ class FanSyncCoordinator(DataUpdateCoordinator):
             ),
             "consecutive_failures": self._consecutive_failures,
             "last_error": self._last_error,
+            "breaker": self._breaker.diagnostics(),
+            "keep_alive": self.client.keep_alive,
+            "connected": self.client.is_connected,
+            "connection": self.client.connection_diagnostics(),
+            "push_updates": self._push_updates,
+            "push_active": self.client.push_active,
+            "poll_mode": self._poll_mode,
+            "poll_interval": (
+                self.update_interval.total_seconds() if self.update_interval else None
+            ),
+            "commands": self._commands.diagnostics(),
+            "presence": self._presence.diagnostics(),
             "has_last_state": self._last_state is not None,
             "last_state_valid": bool(
                 getattr(self._last_state, "valid", False) if self._last_state else False
             ),
+            "state_verified": self._state_verified,
+            "restored_state_saved_at": self._restored_at,
         }
 
     async def _async_update_data(self):
+        try:
+            return await self._async_poll()
+        finally:
+            self._async_update_poll_interval()
+
+    async def _async_poll(self):
         self._last_attempt_at = datetime.now(UTC)
+        reason = self._presence.unreachable_reason()
+        if reason is not None:
+            # Don't spend connect retries (and a connection slot) on a fan nobody hears.
+            self._presence.skipped += 1
+            self._consecutive_failures += 1
+            self._poll_results.append(False)
+            self._last_error = reason
+            _LOGGER.debug(
+                "FanSync Bluetooth poll skipped for %s: %s", self.address, reason
+            )
+            return self._last_state
+        if not self._breaker.allow():
+            # Breaker open: serve the cached state without touching the radio.
+            return self._last_state
+        probe = self._breaker.probing
         try:
-            # Overall guard to ensure BLE client does not block coordinator forever
-            # Allow sufficient time for BLE discovery/connection + notify roundtrip.
-            # Inner get_state notification wait is short; give a larger outer budget to avoid spurious timeouts.
+            # The client holds every phase to its SESSION_BUDGET deadline; this is
+            # only a backstop in case a backend ignores its timeout.
             state = await asyncio.wait_for(
-                self.client.get_state(timeout=4.0), timeout=20.0
+                self._async_fetch_state(probe=probe), timeout=SESSION_BUDGET + 5
             )
             # Only overwrite with a valid state; otherwise keep last known
-            if getattr(state, "valid", False):
-                self._last_state = state
-            elif self._last_state is None:
-                # If we have no previous state at all, store whatever we got
-                self._last_state = state
+            if not getattr(state, "valid", False):
+                if self._last_state is None:
+                    # If we have no previous state at all, store whatever we got
+                    self._last_state = state
+                # Connected, but the fan never answered the GET.
+                raise asyncio.TimeoutError("No RETURN frame received")
+            self._async_record_live_state(state)
             self._consecutive_failures = 0
+            self._poll_results.append(True)
             self._last_error = None
             self._last_success_at = datetime.now(UTC)
-        except asyncio.TimeoutError:
-            self._consecutive_failures += 1
-            self._last_error = "timeout"
-            _LOGGER.warning("FanSync Bluetooth update timed out; keeping last state")
-            return self._last_state
-        except BleakError as e:
-            # Common transient issue: no available backend connection slot or device out of range
-            msg = str(e)
-            self._consecutive_failures += 1
-            self._last_error = msg
-            if "connection slot" in msg or "Not Found" in msg or "reach address" in msg:
-                _LOGGER.debug(
-                    "FanSync Bluetooth update skipped due to transient BLE backend issue: %s",
-                    msg,
-                )
-                return self._last_state
-            _LOGGER.warning("FanSync Bluetooth update failed: %s", msg)
-            return self._last_state
-        except Exception as e:  # safeguard against other transient issues
-            self._consecutive_failures += 1
-            self._last_error = str(e)
-            _LOGGER.warning("FanSync Bluetooth unexpected update error: %s", e)
-            return self._last_state
+            if probe:
+                _LOGGER.info("FanSync Bluetooth %s is reachable again", self.address)
+            self._breaker.record_success()
+        except PollSuperseded:
+            # A user command took the session; its own refresh follows.
+            _LOGGER.debug("FanSync Bluetooth poll superseded by a command")
+        except Exception as e:  # classified; any failure keeps the last state
+            self._async_poll_failed(e)
         return self._last_state
+
+    def _async_poll_failed(self, err: Exception) -> None:
+        """Count a failed poll and feed the breaker; the last state is kept."""
+        kind = classify_error(err)
+        self._consecutive_failures += 1
+        self._poll_results.append(False)
+        self._last_error = kind if kind == ERROR_TIMEOUT else (str(err) or kind)
+        tripped = self._breaker.record_failure(kind)
+        if tripped:
+            _LOGGER.warning(
+                "FanSync Bluetooth %s unreachable (%s); probing every %ss",
+                self.address,
+                kind,
+                int(self._breaker.interval),
+            )
+        elif kind in (ERROR_NO_SLOT, ERROR_NOT_FOUND) or self._breaker.state == (
+            STATE_OPEN
+        ):
+            # Transient (no free slot, out of range) or a failed probe: stay quiet.
+            _LOGGER.debug(
+                "FanSync Bluetooth update skipped due to transient BLE issue (%s): %s",
+                kind,
+                err,
+            )
+        else:
+            _LOGGER.warning("FanSync Bluetooth update failed (%s): %s", kind, err)
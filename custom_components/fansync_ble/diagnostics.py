@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from .const import DOMAIN
+
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
@@ -11,8 +13,9 @@ async def async_get_config_entry_diagnostics(
     hass: "HomeAssistant", config_entry: "ConfigEntry"
 ) -> dict:
     """Return diagnostics for a config entry."""
-    del hass
     coord = config_entry.runtime_data
+    scheduler = hass.data.get(DOMAIN, {}).get("scheduler")
+    startup = hass.data.get(DOMAIN, {}).get("startup")
     return {
         "entry": {
             "entry_id": config_entry.entry_id,
@@ -21,4 +24,7 @@ async def async_get_config_entry_diagnostics(
             "options": dict(config_entry.options),
         },
         "coordinator": coord.diagnostics_snapshot(),
+        "timings": coord.client.timings.snapshot(),
+        "scheduler": scheduler.diagnostics() if scheduler is not None else None,
+        "startup": startup.diagnostics() if startup is not None else None,
     }
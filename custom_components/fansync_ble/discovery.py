@@ -0,0 +1,177 @@
+from __future__ import annotations
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from bleak import BleakScanner
+
+from .const import (
+    DEFAULT_NAME_HINT,
+    DOMAIN,
+    SCAN_CACHE_TTL,
+    SCAN_SETTLE,
+    SCAN_TIMEOUT,
+    SERVICE_UUID,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+@dataclass
+class ScanResult:
+    """One FanSync fan heard during a scan."""
+
+    address: str
+    name: str
+    rssi: int | None = None
+
+
+def is_fansync_advertisement(info: Any, name_hint: str = DEFAULT_NAME_HINT) -> bool:
+    """Return True if an advertisement (HA service info or bleak data) looks like a fan."""
+    uuids = [u.lower() for u in getattr(info, "service_uuids", None) or []]
+    if SERVICE_UUID in uuids:
+        return True
+    name = getattr(info, "name", None) or getattr(info, "local_name", None) or ""
+    return bool(name_hint) and name_hint.lower() in name.lower()
+
+
+def rank_by_rssi(results) -> list[ScanResult]:
+    """Strongest signal first; fans without an RSSI go last."""
+    return sorted(
+        results, key=lambda r: -127 if r.rssi is None else r.rssi, reverse=True
+    )
+
+
+async def async_scan(
+    timeout: float = SCAN_TIMEOUT,
+    settle: float = SCAN_SETTLE,
+    target: str | None = None,
+    name_hint: str = DEFAULT_NAME_HINT,
+    on_found: Callable[[ScanResult], None] | None = None,
+    scanner_factory: Callable[..., Any] = BleakScanner,
+) -> list[ScanResult]:
+    """Scan for FanSync fans and return them ranked by RSSI.
+
+    Matches are taken from the detection callback as they arrive (and passed to
+    ``on_found``). The scan ends at ``timeout``, when ``target`` is heard, or once
+    at least one fan was found and none has been added for ``settle`` seconds.
+    """
+    found: dict[str, ScanResult] = {}
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+    done = asyncio.Event()
+    target_key = target.upper() if target else None
+
+    def _detected(device, adv) -> None:
+        if not (
+            is_fansync_advertisement(adv, name_hint)
+            or is_fansync_advertisement(device, name_hint)
+        ):
+            return
+        name = getattr(adv, "local_name", None) or device.name or device.address
+        rssi = getattr(adv, "rssi", None)
+        known = found.get(device.address)
+        if known is None:
+            result = found[device.address] = ScanResult(device.address, name, rssi)
+            changed.set()
+            if on_found is not None:
+                on_found(result)
+        elif rssi is not None:
+            known.rssi = rssi
+        if target_key and device.address.upper() == target_key:
+            done.set()
+
+    scanner = scanner_factory(detection_callback=_detected)
+    deadline = loop.time() + timeout
+    await scanner.start()
+    try:
+        while not done.is_set():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            wait = min(remaining, settle) if found else remaining
+            changed.clear()
+            waiters = [
+                asyncio.ensure_future(changed.wait()),
+                asyncio.ensure_future(done.wait()),
+            ]
+            finished, pending = await asyncio.wait(
+                waiters, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+            )
+            for fut in pending:
+                fut.cancel()
+            if not finished and found:
+                break  # settled
+    finally:
+        await scanner.stop()
+    return rank_by_rssi(found.values())
+
+
+class ScanCache:
+    """Keeps the last scan's results for ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = SCAN_CACHE_TTL) -> None:
+        self._ttl = ttl
+        self._results: list[ScanResult] | None = None
+        self._stamp = 0.0
+        self._lock = asyncio.Lock()
+        self.scans = 0
+        self.hits = 0
+
+    def get(self) -> list[ScanResult] | None:
+        if self._results is None or time.monotonic() - self._stamp > self._ttl:
+            return None
+        return list(self._results)
+
+    def put(self, results: list[ScanResult]) -> None:
+        self._results = list(results)
+        self._stamp = time.monotonic()
+
+    def invalidate(self) -> None:
+        self._results = None
+
+    async def async_scan(self, **kwargs: Any) -> list[ScanResult]:
+        """Return cached results, or scan (once, even with concurrent callers)."""
+        async with self._lock:
+            cached = self.get()
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.scans += 1
+            results = await async_scan(**kwargs)
+            # An empty scan is not cached, so a retry scans again.
+            if results:
+                self.put(results)
+            return results
+
+    async def async_find(self, address: str, **kwargs: Any) -> ScanResult | None:
+        """Return ``address`` from the cache, or scan until it is heard.
+
+        The scan stops as soon as the target advertises; its partial results are
+        not cached.
+        """
+        key = address.upper()
+        for result in self.get() or []:
+            if result.address.upper() == key:
+                self.hits += 1
+                return result
+        async with self._lock:
+            self.scans += 1
+            results = await async_scan(target=address, **kwargs)
+        return next((r for r in results if r.address.upper() == key), None)
+
+
+_DEFAULT_CACHE = ScanCache()
+
+
+def async_get_scan_cache(hass: "HomeAssistant | None") -> ScanCache:
+    """Return the scan cache shared by config flows (module-wide without hass)."""
+    if hass is None:
+        return _DEFAULT_CACHE
+    data = hass.data.setdefault(DOMAIN, {})
+    cache = data.get("scan")
+    if cache is None:
+        cache = data["scan"] = ScanCache()
+    return cache
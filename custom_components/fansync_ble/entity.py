@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .client import FanState
 
 
-class FanSyncBaseEntity(Entity):
-    """Shared entity behavior for FanSync platforms."""
+class FanSyncBaseEntity(CoordinatorEntity):
+    """Shared entity behavior for FanSync platforms.
+
+    Entities listen to the coordinator, so both polled and pushed states are written
+    as soon as they arrive.
+    """
 
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, entry, *, object_id_suffix: str) -> None:
-        self.coordinator = coordinator
+        super().__init__(coordinator)
         self.entry = entry
         self._attr_unique_id = f"{entry.entry_id}-{object_id_suffix}"
         self._attr_device_info = DeviceInfo(
@@ -24,5 +29,7 @@ class FanSyncBaseEntity(Entity):
         st: FanState | None = self.coordinator._last_state
         return st is not None and st.valid
 
-    async def async_update(self) -> None:
-        await self.coordinator.async_refresh()
+    @property
+    def assumed_state(self) -> bool:
+        # Restored or optimistic state that the device has not confirmed yet.
+        return not self.coordinator.state_verified
@@ -47,11 +47,7 @@ class FanSyncFan(FanSyncBaseEntity, FanEntity):
     async def async_set_percentage(self, percentage: int) -> None:
         p = percentage or 0
         new_speed = 0 if p <= 0 else 1 if p <= 33 else 2 if p <= 66 else 3
-        await self.coordinator.client.set_speed(
-            new_speed, st=self.coordinator._last_state, assume_light=100
-        )
-        self.coordinator.async_apply_local_state(speed=new_speed)
-        self.coordinator.async_schedule_immediate_refresh()
+        await self.coordinator.async_control(speed=new_speed, assume_light=100)
 
     async def async_turn_on(
         self, percentage: int | None = None, preset_mode: str | None = None, **kwargs
@@ -66,16 +62,10 @@ class FanSyncFan(FanSyncBaseEntity, FanEntity):
                 self.entry.options.get(CONF_TURN_ON_SPEED, DEFAULT_TURN_ON_SPEED)
             )
             target = default_speed if curr == 0 else curr
-            await self.coordinator.client.set_speed(target, st=st, assume_light=100)
-            self.coordinator.async_apply_local_state(speed=target)
-            self.coordinator.async_schedule_immediate_refresh()
+            await self.coordinator.async_control(speed=target, assume_light=100)
 
     async def async_turn_off(self, **kwargs) -> None:
-        await self.coordinator.client.set_speed(
-            0, st=self.coordinator._last_state, assume_light=100
-        )
-        self.coordinator.async_apply_local_state(speed=0)
-        self.coordinator.async_schedule_immediate_refresh()
+        await self.coordinator.async_control(speed=0, assume_light=100)
 
     @property
     def current_direction(self):
@@ -89,13 +79,12 @@ class FanSyncFan(FanSyncBaseEntity, FanEntity):
         if not self.entry.options.get(CONF_DIRECTION_SUPPORTED, False):
             return
         d = 1 if direction == "reverse" else 0
-        await self.coordinator.client.set_direction(d, st=self.coordinator._last_state)
-        self.coordinator.async_apply_local_state(direction=d)
-        self.coordinator.async_schedule_immediate_refresh()
+        await self.coordinator.async_control(direction=d)
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     coord = entry.runtime_data
-    async_add_entities([FanSyncFan(coord, entry)], update_before_add=True)
+    # State comes from the coordinator's first refresh; no extra BLE session here.
+    async_add_entities([FanSyncFan(coord, entry)])
@@ -41,18 +41,10 @@ class FanSyncLight(FanSyncBaseEntity, LightEntity):
             percent = max(1, percent)  # avoid 0 when turning on
         else:
             percent = 100  # on/off only
-        st = self.coordinator._last_state
-        await self.coordinator.client.set_light(percent, st=st, assume_speed=1)
-        speed = None if (st and st.valid) else 1
-        self.coordinator.async_apply_local_state(down=percent, speed=speed)
-        self.coordinator.async_schedule_immediate_refresh()
+        await self.coordinator.async_control(down=percent, assume_speed=1)
 
     async def async_turn_off(self, **kwargs):
-        st = self.coordinator._last_state
-        await self.coordinator.client.set_light(0, st=st, assume_speed=0)
-        speed = None if (st and st.valid) else 0
-        self.coordinator.async_apply_local_state(down=0, speed=speed)
-        self.coordinator.async_schedule_immediate_refresh()
+        await self.coordinator.async_control(down=0, assume_speed=0)
 
 
 async def async_setup_entry(
@@ -61,4 +53,5 @@ async def async_setup_entry(
     coord = entry.runtime_data
     # Only add light entity if enabled in options
     if entry.options.get(CONF_HAS_LIGHT, True):
-        async_add_entities([FanSyncLight(coord, entry)], update_before_add=True)
+        # State comes from the coordinator's first refresh; no extra BLE session here.
+        async_add_entities([FanSyncLight(coord, entry)])
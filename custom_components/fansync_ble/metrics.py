@@ -0,0 +1,124 @@
+from __future__ import annotations
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+import time
+from typing import Iterator
+
+from .const import TIMEOUT_WINDOW
+
+# Bucket upper bounds in milliseconds; the last bucket is open-ended.
+BUCKET_BOUNDS_MS = (
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+    5000,
+    10000,
+    20000,
+)
+
+# Session phases timed by the client.
+PHASE_LOCK_WAIT = "lock_wait"
+PHASE_RESOLVE = "resolve"
+PHASE_CONNECT = "connect"
+PHASE_SERVICES = "services"
+PHASE_NOTIFY_START = "notify_start"
+PHASE_WRITE = "write"
+PHASE_FIRST_RETURN = "first_return"
+PHASE_DISCONNECT = "disconnect"
+
+
+class Histogram:
+    """Fixed-bucket streaming histogram of durations; memory use is constant.
+
+    The last TIMEOUT_WINDOW samples are also kept so timeouts can follow the
+    link's current latency rather than its all-time history.
+    """
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: float | None = None
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+        self.recent: deque[float] = deque(maxlen=TIMEOUT_WINDOW)
+
+    def add(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.last_ms = ms
+        self.recent.append(ms)
+        self.max_ms = max(self.max_ms, ms)
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+
+    def percentile(self, pct: float) -> float:
+        """Return an upper-bound estimate (ms) of the ``pct`` percentile."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                if i < len(BUCKET_BOUNDS_MS):
+                    return float(min(BUCKET_BOUNDS_MS[i], self.max_ms))
+                return self.max_ms
+        return self.max_ms
+
+    def recent_percentile(self, pct: float) -> float:
+        """Return the ``pct`` percentile (ms) of the recent samples."""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "last_ms": round(self.last_ms, 1),
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "min_ms": round(self.min_ms or 0.0, 1),
+            "max_ms": round(self.max_ms, 1),
+            "p50_ms": round(self.percentile(50), 1),
+            "p95_ms": round(self.percentile(95), 1),
+            "p99_ms": round(self.percentile(99), 1),
+        }
+
+
+class SessionTimings:
+    """Per-phase histograms for one device's BLE sessions."""
+
+    def __init__(self) -> None:
+        self._phases: dict[str, Histogram] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        hist = self._phases.get(phase)
+        if hist is None:
+            hist = self._phases[phase] = Histogram()
+        hist.add(seconds)
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Record the duration of the block, whether or not it raises."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(phase, time.monotonic() - start)
+
+    def get(self, phase: str) -> Histogram | None:
+        return self._phases.get(phase)
+
+    def snapshot(self) -> dict:
+        return {phase: hist.snapshot() for phase, hist in self._phases.items()}
@@ -0,0 +1,176 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+from .const import PATH_STICKY_BONUS
+from .presence import _bluetooth_api
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+@dataclass
+class ConnectionPath:
+    """One adapter or proxy that can currently hear the fan."""
+
+    source: str
+    name: str
+    rssi: int
+    # HA's slot allocations for the scanner, when it reports them.
+    free_slots: int | None = None
+    total_slots: int | None = None
+
+    @property
+    def has_free_slot(self) -> bool:
+        return self.free_slots is None or self.free_slots > 0
+
+
+@dataclass
+class _PathStats:
+    successes: int = 0
+    connect_ms: float | None = None
+
+
+def async_connection_paths(hass: "HomeAssistant", address: str) -> list[ConnectionPath]:
+    """Return every connectable scanner that has heard ``address``, from HA's cache."""
+    bt = _bluetooth_api()
+    if bt is None or hass is None:
+        return []
+    try:
+        devices = bt.async_scanner_devices_by_address(hass, address, connectable=True)
+    except Exception:
+        return []
+    paths: list[ConnectionPath] = []
+    for dev in devices:
+        scanner = dev.scanner
+        free = total = None
+        get_allocations = getattr(scanner, "get_allocations", None)
+        if get_allocations is not None:
+            try:
+                allocations = get_allocations()
+            except Exception:
+                allocations = None
+            if allocations is not None:
+                free, total = allocations.free, allocations.slots
+        paths.append(
+            ConnectionPath(
+                source=scanner.source,
+                name=getattr(scanner, "name", scanner.source),
+                rssi=dev.advertisement.rssi,
+                free_slots=free,
+                total_slots=total,
+            )
+        )
+    return paths
+
+
+def connected_source(client: Any) -> str | None:
+    """Return the scanner source a connected client actually went through.
+
+    HA's ``HaBleakClientWrapper`` keeps only the address of the device it is
+    given and picks its own backend; the scanner it used is kept on the client.
+    """
+    scanner = getattr(client, "_connected_scanner", None)
+    return getattr(scanner, "source", None)
+
+
+class FanSyncPathSelector:
+    """Predicts the adapter or proxy HA will connect through and learns the real one.
+
+    HA picks the backend itself, so the prediction only decides which scheduler
+    slot a session waits for. Paths with a free connection slot (per HA and, if
+    given, our own scheduler) come first; among those the score is RSSI, plus
+    PATH_STICKY_BONUS for the source the last connect actually used. Connect
+    history is kept per actual source.
+    """
+
+    def __init__(self, free_slots: Callable[[str], int | None] | None = None) -> None:
+        # Optional lookup of free scheduler slots per source.
+        self._free_slots = free_slots
+        self._stats: dict[str, _PathStats] = {}
+        self._last_good: str | None = None
+        self.predicted: str | None = None
+        self.connected: str | None = None
+        self.mispredicted = 0
+        self.failures = 0
+        self._candidates: list[tuple[ConnectionPath, float]] = []
+
+    def _score(self, path: ConnectionPath) -> float:
+        score = float(path.rssi)
+        if path.source == self._last_good:
+            score += PATH_STICKY_BONUS
+        return score
+
+    def _slot_free(self, path: ConnectionPath) -> bool:
+        if not path.has_free_slot:
+            return False
+        if self._free_slots is None:
+            return True
+        free = self._free_slots(path.source)
+        return free is None or free > 0
+
+    def rank(self, paths: list[ConnectionPath]) -> list[ConnectionPath]:
+        scored = [(p, self._score(p)) for p in paths]
+        scored.sort(key=lambda ps: (self._slot_free(ps[0]), ps[1]), reverse=True)
+        self._candidates = scored
+        return [p for p, _ in scored]
+
+    def select(self, paths: list[ConnectionPath]) -> ConnectionPath | None:
+        """Return the likeliest path, or None if nothing has heard the fan."""
+        ranked = self.rank(paths)
+        best = ranked[0] if ranked else None
+        self.predicted = best.source if best else None
+        return best
+
+    def candidate(self, source: str) -> ConnectionPath | None:
+        """Return the last ranked path for ``source``, if it was among them."""
+        return next((p for p, _ in self._candidates if p.source == source), None)
+
+    def record(self, source: str | None, seconds: float | None = None) -> None:
+        """Record a connect that went through ``source`` (None when unknown)."""
+        self.connected = source
+        if source is None:
+            return
+        if self.predicted is not None and source != self.predicted:
+            self.mispredicted += 1
+        stats = self._stats.setdefault(source, _PathStats())
+        stats.successes += 1
+        self._last_good = source
+        if seconds is not None:
+            ms = seconds * 1000
+            stats.connect_ms = (
+                ms if stats.connect_ms is None else 0.8 * stats.connect_ms + 0.2 * ms
+            )
+
+    def record_failure(self) -> None:
+        """Count a failed connect; HA does not say which backend it tried."""
+        self.failures += 1
+
+    def diagnostics(self) -> dict:
+        return {
+            "predicted": self.predicted,
+            "connected": self.connected,
+            "mispredicted": self.mispredicted,
+            "failures": self.failures,
+            "candidates": [
+                {
+                    "source": p.source,
+                    "name": p.name,
+                    "rssi": p.rssi,
+                    "free_slots": p.free_slots,
+                    "total_slots": p.total_slots,
+                    "score": round(score, 1),
+                    "slot_free": self._slot_free(p),
+                }
+                for p, score in self._candidates
+            ],
+            "paths": {
+                source: {
+                    "successes": s.successes,
+                    "connect_ms": (
+                        None if s.connect_ms is None else round(s.connect_ms, 1)
+                    ),
+                }
+                for source, s in self._stats.items()
+            },
+        }
@@ -0,0 +1,156 @@
+from __future__ import annotations
+import logging
+from typing import TYPE_CHECKING, Any, Callable
+
+try:
+    from homeassistant.exceptions import HomeAssistantError
+except Exception:  # pragma: no cover - fallback for minimal test environments
+
+    class HomeAssistantError(Exception):  # type: ignore[no-redef]
+        pass
+
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+REASON_NO_SCANNER = "no_connectable_scanner"
+REASON_NOT_ADVERTISING = "not_advertising"
+
+
+class DeviceNotReachable(HomeAssistantError):
+    """Raised when a command cannot be sent because the fan is not reachable."""
+
+
+def _bluetooth_api() -> Any | None:
+    """Return HA's bluetooth module, or None outside a full HA runtime."""
+    try:
+        from homeassistant.components import bluetooth  # type: ignore
+
+        return bluetooth
+    except Exception:
+        return None
+
+
+class FanSyncPresence:
+    """Track whether the fan advertises and a connectable scanner can reach it.
+
+    Uses HA's bluetooth callbacks: every advertisement marks the device present and
+    HA's unavailable tracking marks it absent. ``on_seen`` is called when a device
+    that was absent advertises again. A fan with an open link stops advertising, so
+    it counts as reachable while ``link_held`` returns True. Without HA bluetooth,
+    tracking is disabled and the device always counts as reachable.
+    """
+
+    def __init__(
+        self,
+        hass: "HomeAssistant",
+        address: str,
+        on_seen: Callable[[], None],
+        link_held: Callable[[], bool] | None = None,
+    ) -> None:
+        self._hass = hass
+        self._address = address
+        self._on_seen = on_seen
+        self._link_held = link_held
+        self._bt: Any | None = None
+        self._present = True
+        self._unsubs: list[Callable[[], None]] = []
+        self.skipped = 0
+        self.last_rssi: int | None = None
+
+    @property
+    def tracking(self) -> bool:
+        return self._bt is not None
+
+    @property
+    def device_present(self) -> bool:
+        return self._present
+
+    def async_start(self) -> None:
+        """Subscribe to advertisements and unavailability for the address."""
+        bt = _bluetooth_api()
+        if bt is None or self._hass is None:
+            return
+        try:
+            self._present = bool(
+                bt.async_address_present(self._hass, self._address, connectable=True)
+            )
+            info = bt.async_last_service_info(
+                self._hass, self._address, connectable=False
+            )
+            self.last_rssi = getattr(info, "rssi", None)
+            self._unsubs.append(
+                bt.async_register_callback(
+                    self._hass,
+                    self._async_advertisement,
+                    bt.BluetoothCallbackMatcher(
+                        address=self._address, connectable=True
+                    ),
+                    bt.BluetoothScanningMode.PASSIVE,
+                )
+            )
+            self._unsubs.append(
+                bt.async_track_unavailable(
+                    self._hass,
+                    self._async_unavailable,
+                    self._address,
+                    connectable=True,
+                )
+            )
+        except Exception as err:
+            _LOGGER.debug("FanSync Bluetooth presence tracking unavailable: %s", err)
+            self.async_stop()
+            self._present = True
+            return
+        self._bt = bt
+
+    def async_stop(self) -> None:
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        self._bt = None
+
+    def _async_advertisement(self, service_info, _change) -> None:
+        self.last_rssi = getattr(service_info, "rssi", self.last_rssi)
+        if self._present:
+            return
+        self._present = True
+        _LOGGER.debug("FanSync Bluetooth device %s is advertising again", self._address)
+        self._on_seen()
+
+    def _async_unavailable(self, _service_info) -> None:
+        self._present = False
+
+    @property
+    def link_held(self) -> bool:
+        """Return True while a kept-alive or push connection to the fan is open."""
+        return self._link_held is not None and self._link_held()
+
+    def scanner_available(self) -> bool:
+        if self._bt is None:
+            return True
+        try:
+            return self._bt.async_scanner_count(self._hass, connectable=True) > 0
+        except Exception:
+            return True
+
+    def unreachable_reason(self) -> str | None:
+        """Return why a BLE session would be pointless right now, or None."""
+        if self._bt is None or self.link_held:
+            return None
+        if not self.scanner_available():
+            return REASON_NO_SCANNER
+        if not self._present:
+            return REASON_NOT_ADVERTISING
+        return None
+
+    def diagnostics(self) -> dict:
+        return {
+            "tracking": self.tracking,
+            "device_present": self._present,
+            "link_held": self.link_held,
+            "scanner_available": self.scanner_available(),
+            "skipped_polls": self.skipped,
+        }
@@ -0,0 +1,408 @@
+from __future__ import annotations
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+import heapq
+import itertools
+import random
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable
+
+from .const import (
+    DEFAULT_ADAPTER_SLOTS,
+    DOMAIN,
+    STARTUP_BUDGET,
+    STARTUP_CONCURRENCY,
+    STARTUP_JITTER,
+    STARTUP_STAGGER,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+DEFAULT_ADAPTER = "default"
+
+# Session priorities for a single device; lower values are served first.
+PRIORITY_COMMAND = 0
+PRIORITY_MAINTENANCE = 1
+PRIORITY_POLL = 2
+
+
+class PollSuperseded(Exception):
+    """Raised when a queued or running poll gives way to a user command."""
+
+
+class SlotUnavailable(Exception):
+    """Raised when no connection slot frees up before the operation's deadline."""
+
+
+class PrioritySessionLock:
+    """Per-device session lock that serves interactive commands before polls.
+
+    ``session(PRIORITY_COMMAND)`` drops every poll still waiting for the lock (they
+    raise ``PollSuperseded``) and, when a poll currently holds it, calls
+    ``on_preempt`` so the owner can cancel that poll. Plain ``async with`` acquires
+    at maintenance priority, which neither preempts nor is dropped.
+    """
+
+    def __init__(self, on_preempt: Callable[[], None] | None = None) -> None:
+        self._on_preempt = on_preempt
+        self._locked = False
+        self._holder_priority: int | None = None
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def locked(self) -> bool:
+        return self._locked
+
+    @property
+    def holder_priority(self) -> int | None:
+        return self._holder_priority
+
+    @property
+    def command_pending(self) -> bool:
+        return any(p == PRIORITY_COMMAND and not f.done() for p, _, f in self._waiters)
+
+    async def acquire(self, priority: int = PRIORITY_MAINTENANCE) -> None:
+        if priority == PRIORITY_COMMAND:
+            self._drop_polls()
+            if self._holder_priority == PRIORITY_POLL and self._on_preempt:
+                self._on_preempt()
+        elif priority == PRIORITY_POLL and self.command_pending:
+            raise PollSuperseded
+        if not self._locked and not self._waiters:
+            self._locked = True
+            self._holder_priority = priority
+            return
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                # Lock was handed to us as we were cancelled; pass it on.
+                self.release()
+            else:
+                self._waiters = [w for w in self._waiters if w[2] is not fut]
+                heapq.heapify(self._waiters)
+            raise
+        self._holder_priority = priority
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                # Ownership passes directly to the next waiter.
+                self._holder_priority = None
+                fut.set_result(None)
+                return
+        self._locked = False
+        self._holder_priority = None
+
+    def _drop_polls(self) -> None:
+        keep = []
+        for item in self._waiters:
+            if item[0] == PRIORITY_POLL:
+                if not item[2].done():
+                    item[2].set_exception(PollSuperseded())
+            else:
+                keep.append(item)
+        if len(keep) != len(self._waiters):
+            heapq.heapify(keep)
+            self._waiters = keep
+
+    @asynccontextmanager
+    async def session(self, priority: int) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
+
+
+class _AdapterQueue:
+    """Slot accounting and fair wait queue for one adapter or proxy."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        # Waiters grouped per device address; served round-robin across devices.
+        self.waiters: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+        self.timeouts = 0
+        # Leases whose kept-alive link is open but idle, with the callback that
+        # closes it; reclaimed first-in when another device is waiting.
+        self.idle: dict["SessionLease", Callable[[], None]] = {}
+        self.reclaimed = 0
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self.waiters.values())
+
+
+class SessionLease:
+    """A held connection slot; ``release`` is idempotent."""
+
+    def __init__(self, scheduler: "FanSyncSessionScheduler", adapter: str) -> None:
+        self._scheduler = scheduler
+        self.adapter = adapter
+        self._released = False
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._scheduler._mark_busy(self)
+        self._scheduler._release(self.adapter)
+
+    def move(self, adapter: str) -> None:
+        """Count the held slot against ``adapter`` instead, e.g. after HA picked it."""
+        if self._released or adapter == self.adapter:
+            return
+        self._scheduler._mark_busy(self)
+        self._scheduler._move(self.adapter, adapter)
+        self.adapter = adapter
+
+    def mark_idle(self, reclaim: Callable[[], None]) -> None:
+        """Keep the slot for an idle open link; ``reclaim`` closes it when needed."""
+        if not self._released:
+            self._scheduler._mark_idle(self, reclaim)
+
+    def mark_busy(self) -> None:
+        """The link is in use again and must not be reclaimed."""
+        self._scheduler._mark_busy(self)
+
+
+class FanSyncSessionScheduler:
+    """Integration-wide owner of BLE connection slots across all config entries.
+
+    Each adapter or Bluetooth proxy gets at most ``slots_per_adapter`` open
+    connections. When slots are exhausted, waiting fans are served round-robin so
+    a single busy device cannot starve the others, and an idle kept-alive link on
+    the adapter is asked to close to make room.
+    """
+
+    def __init__(self, slots_per_adapter: int = DEFAULT_ADAPTER_SLOTS) -> None:
+        self._slots_per_adapter = slots_per_adapter
+        self._adapters: dict[str, _AdapterQueue] = {}
+
+    def _queue(self, adapter: str) -> _AdapterQueue:
+        q = self._adapters.get(adapter)
+        if q is None:
+            q = self._adapters[adapter] = _AdapterQueue(self._slots_per_adapter)
+        return q
+
+    async def async_acquire(
+        self, address: str, adapter: str | None, timeout: float | None = None
+    ) -> SessionLease:
+        """Wait for a free slot on ``adapter`` and return a lease for it.
+
+        Raises ``SlotUnavailable`` if no slot is granted within ``timeout`` seconds.
+        """
+        adapter = adapter or DEFAULT_ADAPTER
+        q = self._queue(adapter)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        if q.active < q.limit and not q.waiters:
+            q.active += 1
+        else:
+            fut: asyncio.Future = loop.create_future()
+            q.waiters.setdefault(address, deque()).append(fut)
+            self._reclaim_idle(q)
+            try:
+                await asyncio.wait((fut,), timeout=timeout)
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    # Slot was granted just as we were cancelled; hand it on.
+                    self._release(adapter)
+                else:
+                    self._discard_waiter(q, address, fut)
+                raise
+            if not fut.done():
+                fut.cancel()
+                self._discard_waiter(q, address, fut)
+                q.timeouts += 1
+                raise SlotUnavailable(
+                    f"No free connection slot on {adapter} within {timeout:g}s"
+                )
+        waited = loop.time() - start
+        q.granted += 1
+        q.total_wait += waited
+        q.last_wait = waited
+        q.max_wait = max(q.max_wait, waited)
+        return SessionLease(self, adapter)
+
+    @staticmethod
+    def _discard_waiter(q: _AdapterQueue, address: str, fut: asyncio.Future) -> None:
+        pending = q.waiters.get(address)
+        if pending is None:
+            return
+        try:
+            pending.remove(fut)
+        except ValueError:
+            pass
+        if not pending:
+            del q.waiters[address]
+
+    def _release(self, adapter: str) -> None:
+        q = self._queue(adapter)
+        q.active = max(0, q.active - 1)
+        while q.active < q.limit and q.waiters:
+            address, pending = next(iter(q.waiters.items()))
+            fut = pending.popleft()
+            if pending:
+                q.waiters.move_to_end(address)
+            else:
+                del q.waiters[address]
+            if fut.done():
+                continue
+            q.active += 1
+            fut.set_result(None)
+
+    def _mark_idle(self, lease: SessionLease, reclaim: Callable[[], None]) -> None:
+        q = self._queue(lease.adapter)
+        q.idle[lease] = reclaim
+        if q.waiters:
+            self._reclaim_idle(q)
+
+    def _mark_busy(self, lease: SessionLease) -> None:
+        q = self._adapters.get(lease.adapter)
+        if q is not None:
+            q.idle.pop(lease, None)
+
+    @staticmethod
+    def _reclaim_idle(q: _AdapterQueue) -> None:
+        """Ask the longest-idle open link on the adapter to close for a waiter."""
+        if not q.idle:
+            return
+        lease = next(iter(q.idle))
+        reclaim = q.idle.pop(lease)
+        q.reclaimed += 1
+        reclaim()
+
+    def _move(self, old: str, new: str) -> None:
+        # The link already exists on ``new``, so it is counted even over the limit.
+        self._queue(new).active += 1
+        self._release(old)
+
+    def free_slots(self, adapter: str) -> int:
+        """Return slots on ``adapter`` that a new session could take right now."""
+        q = self._adapters.get(adapter)
+        if q is None:
+            return self._slots_per_adapter
+        return max(0, q.limit - q.active) if not q.waiters else 0
+
+    def diagnostics(self) -> dict:
+        """Return per-adapter slot usage, queue depth and wait times (seconds)."""
+        return {
+            adapter: {
+                "limit": q.limit,
+                "active": q.active,
+                "queued": q.queued,
+                "granted": q.granted,
+                "last_wait": round(q.last_wait, 3),
+                "max_wait": round(q.max_wait, 3),
+                "timeouts": q.timeouts,
+                "idle": len(q.idle),
+                "reclaimed": q.reclaimed,
+                "avg_wait": round(q.total_wait / q.granted, 3) if q.granted else 0.0,
+            }
+            for adapter, q in self._adapters.items()
+        }
+
+
+def async_get_scheduler(hass: "HomeAssistant") -> FanSyncSessionScheduler:
+    """Return the scheduler shared by all FanSync config entries."""
+    data = hass.data.setdefault(DOMAIN, {})
+    scheduler = data.get("scheduler")
+    if scheduler is None:
+        scheduler = data["scheduler"] = FanSyncSessionScheduler()
+    return scheduler
+
+
+class FanSyncStartupQueue:
+    """Spreads the first BLE read of each config entry over HA startup.
+
+    Entries finish setup without waiting for the radio; their first refresh is
+    queued here. A refresh queued behind n pending ones starts after
+    ``n * stagger`` seconds plus up to ``jitter`` seconds of random delay, and at
+    most ``concurrency`` first refreshes run at once. Progress against ``budget``
+    is kept for diagnostics.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = STARTUP_CONCURRENCY,
+        stagger: float = STARTUP_STAGGER,
+        jitter: float = STARTUP_JITTER,
+        budget: float = STARTUP_BUDGET,
+    ) -> None:
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._concurrency = concurrency
+        self._stagger = stagger
+        self._jitter = jitter
+        self._budget = budget
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+        self._entries: dict[str, dict[str, Any]] = {}
+
+    async def async_run(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        """Run ``refresh`` once its stagger slot and a concurrency slot come up.
+
+        The first refresh queued while none are pending opens a new timing window,
+        so entries added or reloaded after boot are measured on their own.
+        """
+        loop = asyncio.get_running_loop()
+        ahead = sum(1 for info in self._entries.values() if not info["done"])
+        if not ahead:
+            self._started_at = loop.time()
+            self._finished_at = None
+        delay = ahead * self._stagger + random.uniform(0, self._jitter)
+        info: dict[str, Any] = {"delay": round(delay, 3), "done": False}
+        self._entries[key] = info
+        try:
+            await asyncio.sleep(delay)
+            queued_at = loop.time()
+            async with self._semaphore:
+                info["wait"] = round(loop.time() - queued_at, 3)
+                began = loop.time()
+                try:
+                    await refresh()
+                finally:
+                    info["duration"] = round(loop.time() - began, 3)
+        finally:
+            # Also reached when setup is cancelled while still waiting.
+            info["done"] = True
+            self._finished_at = loop.time()
+
+    def diagnostics(self) -> dict:
+        """Return per-entry startup delays and total boot time against the budget."""
+        elapsed = None
+        if self._started_at is not None and self._finished_at is not None:
+            elapsed = round(self._finished_at - self._started_at, 3)
+        pending = sum(1 for info in self._entries.values() if not info["done"])
+        return {
+            "concurrency": self._concurrency,
+            "budget": self._budget,
+            "elapsed": elapsed,
+            "pending": pending,
+            "within_budget": None if elapsed is None else elapsed <= self._budget,
+            "entries": {key: dict(info) for key, info in self._entries.items()},
+        }
+
+
+def async_get_startup_queue(hass: "HomeAssistant") -> FanSyncStartupQueue:
+    """Return the startup queue shared by all FanSync config entries."""
+    data = hass.data.setdefault(DOMAIN, {})
+    queue = data.get("startup")
+    if queue is None:
+        queue = data["startup"] = FanSyncStartupQueue()
+    return queue
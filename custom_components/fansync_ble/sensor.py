@@ -0,0 +1,94 @@
+from __future__ import annotations
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .entity import FanSyncBaseEntity
+
+# Each ``key`` names a value returned by the coordinator's ``link_stats()``.
+SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="last_command_latency",
+        name="Last command latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="mean_command_latency",
+        name="Command latency (rolling mean)",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="poll_success_ratio",
+        name="Poll success ratio",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="consecutive_failures",
+        name="Consecutive failures",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="seconds_since_good_state",
+        name="Time since last good state",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="rssi",
+        name="Signal strength",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+
+class FanSyncLinkSensor(FanSyncBaseEntity, SensorEntity):
+    """Diagnostic link-quality value; disabled by default."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self, coordinator, entry, description: SensorEntityDescription
+    ) -> None:
+        super().__init__(coordinator, entry, object_id_suffix=description.key)
+        self.entity_description = description
+
+    @property
+    def available(self) -> bool:
+        # Link health stays readable while the fan itself is unreachable.
+        return True
+
+    @property
+    def assumed_state(self) -> bool:
+        return False
+
+    @property
+    def native_value(self):
+        return self.coordinator.link_stats().get(self.entity_description.key)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    coord = entry.runtime_data
+    async_add_entities(FanSyncLinkSensor(coord, entry, desc) for desc in SENSORS)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+from .const import (
+    CONF_DIMMABLE,
+    CONF_DIRECTION_SUPPORTED,
+    CONF_HAS_LIGHT,
+    DEFAULT_DIMMABLE,
+    DEFAULT_DIRECTION_SUPPORTED,
+    DEFAULT_HAS_LIGHT,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall
+
+    from .coordinator import FanSyncCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_GROUP = "set_group"
+ATTR_CONFIG_ENTRIES = "config_entries"
+ATTR_SPEED = "speed"
+ATTR_DIRECTION = "direction"
+ATTR_LIGHT = "light"
+
+
+def group_intent(
+    speed: int | None = None,
+    direction: int | None = None,
+    light: int | None = None,
+    options: Mapping[str, Any] | None = None,
+) -> dict[str, int | None] | None:
+    """Map a group target to one fan's control intent, with the entities' fallbacks.
+
+    ``options`` are the entry's options: fields the fan does not support are
+    skipped and the light is clamped to on/off when it is not dimmable. Returns
+    None when nothing in the target applies to the fan.
+    """
+    if options is not None:
+        if not options.get(CONF_DIRECTION_SUPPORTED, DEFAULT_DIRECTION_SUPPORTED):
+            direction = None
+        if not options.get(CONF_HAS_LIGHT, DEFAULT_HAS_LIGHT):
+            light = None
+        elif light is not None and not options.get(CONF_DIMMABLE, DEFAULT_DIMMABLE):
+            light = 100 if light > 0 else 0
+    if speed is None and direction is None and light is None:
+        return None
+    intent: dict[str, int | None] = {
+        "speed": speed,
+        "direction": direction,
+        "down": light,
+    }
+    if speed is not None and light is None:
+        intent["assume_light"] = 100
+    if light is not None and speed is None:
+        intent["assume_speed"] = 1 if light > 0 else 0
+    return intent
+
+
+async def async_drive_group(
+    targets: Iterable[tuple[str, "FanSyncCoordinator", dict[str, int | None] | None]],
+) -> dict[str, Any]:
+    """Send each fan its own intent at once and collect per-fan results.
+
+    Concurrency is bounded by the shared session scheduler's connection slots, not
+    here. One fan failing does not stop the others; a fan whose intent is None is
+    reported as skipped without connecting.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def _one(entry_id: str, coord: "FanSyncCoordinator", intent):
+        began = loop.time()
+        if intent is None:
+            result = {"success": True, "error": None, "skipped": True}
+        else:
+            try:
+                await coord.async_control(**intent)
+            except Exception as err:  # reported per fan
+                _LOGGER.debug("FanSync group command failed for %s: %s", entry_id, err)
+                result = {
+                    "success": False,
+                    "error": str(err) or type(err).__name__,
+                    "skipped": False,
+                }
+            else:
+                result = {"success": True, "error": None, "skipped": False}
+        result["elapsed"] = round(loop.time() - began, 3)
+        return entry_id, result
+
+    results = dict(await asyncio.gather(*(_one(*target) for target in targets)))
+    succeeded = sum(1 for r in results.values() if r["success"])
+    return {
+        "results": results,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "total_time": round(loop.time() - start, 3),
+    }
+
+
+def async_setup_services(hass: "HomeAssistant") -> None:
+    """Register the integration's services once; shared by all config entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_SET_GROUP):
+        return
+
+    import voluptuous as vol
+    from homeassistant.core import SupportsResponse
+    from homeassistant.exceptions import ServiceValidationError
+    import homeassistant.helpers.config_validation as cv
+
+    schema = vol.All(
+        vol.Schema(
+            {
+                vol.Optional(ATTR_CONFIG_ENTRIES): vol.All(cv.ensure_list, [cv.string]),
+                vol.Optional(ATTR_SPEED): vol.All(vol.Coerce(int), vol.Range(0, 3)),
+                vol.Optional(ATTR_DIRECTION): vol.In(["forward", "reverse"]),
+                vol.Optional(ATTR_LIGHT): vol.All(vol.Coerce(int), vol.Range(0, 100)),
+            }
+        ),
+        cv.has_at_least_one_key(ATTR_SPEED, ATTR_DIRECTION, ATTR_LIGHT),
+    )
+
+    async def _async_set_group(call: "ServiceCall") -> dict[str, Any]:
+        wanted = call.data.get(ATTR_CONFIG_ENTRIES)
+        entries = [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if getattr(entry, "runtime_data", None) is not None
+            and (wanted is None or entry.entry_id in wanted)
+        ]
+        if not entries:
+            raise ServiceValidationError("No loaded FanSync Bluetooth fans matched")
+        direction = call.data.get(ATTR_DIRECTION)
+        return await async_drive_group(
+            (
+                entry.entry_id,
+                entry.runtime_data,
+                group_intent(
+                    speed=call.data.get(ATTR_SPEED),
+                    direction=(
+                        None if direction is None else int(direction == "reverse")
+                    ),
+                    light=call.data.get(ATTR_LIGHT),
+                    options=entry.options,
+                ),
+            )
+            for entry in entries
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_GROUP,
+        _async_set_group,
+        schema=schema,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,38 @@
+from __future__ import annotations
+from typing import Any, Callable, Protocol
+
+
+class FanSyncConnection(Protocol):
+    """The subset of the ``BleakClient`` API the client uses on an open link."""
+
+    @property
+    def is_connected(self) -> bool: ...
+
+    async def start_notify(
+        self, uuid: str, callback: Callable[[Any, bytearray], None]
+    ) -> None: ...
+
+    async def stop_notify(self, uuid: str) -> None: ...
+
+    async def write_gatt_char(
+        self, uuid: str, data: bytes, response: bool = ...
+    ) -> None: ...
+
+    async def disconnect(self) -> None: ...
+
+
+class FanSyncTransport(Protocol):
+    """Opens connections to a fan in place of bleak / bleak-retry-connector.
+
+    Passed to ``FanSyncBleClient(transport=...)``; used by the simulated peripheral
+    in tests and benchmarks. ``disconnected_callback`` must be called with the
+    connection when the link drops.
+    """
+
+    name: str
+
+    async def async_connect(
+        self,
+        address: str,
+        disconnected_callback: Callable[[Any], None],
+    ) -> FanSyncConnection: ...
@@ -0,0 +1,186 @@
+"""In-process simulated FanSync peripheral for tests and benchmarks.
+
+``SimulatedFan`` speaks the 10-byte 0x53 protocol: it answers GET with a RETURN
+frame, applies CONTROL frames and echoes the new state as RETURN, and ignores
+frames with a bad header or checksum. ``SimulatedTransport`` plugs it into
+``FanSyncBleClient(transport=...)``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import random
+from typing import Any, Callable
+
+from custom_components.fansync_ble.codec import build_frame
+from custom_components.fansync_ble.const import (
+    CONTROL_FAN_STATUS,
+    GET_FAN_STATUS,
+    NOTIFY_CHAR_UUID,
+    RETURN_FAN_STATUS,
+    WRITE_CHAR_UUID,
+)
+
+
+@dataclass
+class SimConfig:
+    """Radio behaviour of the simulated fan; delays are in seconds."""
+
+    connect_latency: float = 0.0
+    notify_delay: float = 0.0
+    # Probability that a RETURN notification is lost.
+    loss: float = 0.0
+    # Probability that the link drops right after a write.
+    disconnect_rate: float = 0.0
+    seed: int | None = None
+
+
+class SimulatedFan:
+    """Fan state plus protocol handling shared by all connections to it."""
+
+    def __init__(self, config: SimConfig | None = None, **state: int) -> None:
+        self.config = config or SimConfig()
+        self.rng = random.Random(self.config.seed)
+        self.speed = state.get("speed", 0)
+        self.direction = state.get("direction", 0)
+        self.up = state.get("up", 0)
+        self.down = state.get("down", 0)
+        self.timer_lo = state.get("timer_lo", 0)
+        self.timer_hi = state.get("timer_hi", 0)
+        self.fan_type = state.get("fan_type", 0)
+        self.connections: list[SimulatedConnection] = []
+        self.connects = 0
+        self.frames_received = 0
+        self.frames_rejected = 0
+
+    def return_frame(self) -> bytes:
+        return build_frame(
+            RETURN_FAN_STATUS,
+            self.speed,
+            self.direction,
+            self.up,
+            self.down,
+            self.timer_lo,
+            self.timer_hi,
+            self.fan_type,
+        )
+
+    def handle_frame(self, data: bytes) -> bytes | None:
+        """Apply a frame written by the client; return the RETURN reply, if any."""
+        self.frames_received += 1
+        if len(data) != 10 or data[0] != 0x53 or sum(data[:9]) & 0xFF != data[9]:
+            self.frames_rejected += 1
+            return None
+        if data[1] == CONTROL_FAN_STATUS:
+            (
+                self.speed,
+                self.direction,
+                self.up,
+                self.down,
+                self.timer_lo,
+                self.timer_hi,
+                self.fan_type,
+            ) = data[2:9]
+        elif data[1] != GET_FAN_STATUS:
+            self.frames_rejected += 1
+            return None
+        return self.return_frame()
+
+    def press_remote(self, **changes: int) -> None:
+        """Change state outside BLE (wall remote) and notify subscribers."""
+        for key, value in changes.items():
+            setattr(self, key, value)
+        frame = self.return_frame()
+        for conn in list(self.connections):
+            conn.notify(frame)
+
+    def drop_links(self) -> None:
+        """Simulate the fan going out of range."""
+        for conn in list(self.connections):
+            conn.drop()
+
+
+class SimulatedConnection:
+    """BleakClient-like link to a ``SimulatedFan``."""
+
+    def __init__(
+        self, fan: SimulatedFan, disconnected_callback: Callable[[Any], None]
+    ) -> None:
+        self._fan = fan
+        self._disconnected_callback = disconnected_callback
+        self._callback: Callable[[Any, bytearray], None] | None = None
+        self._connected = True
+        self.services = True
+        self.writes: list[bytes] = []
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def start_notify(self, uuid: str, callback) -> None:
+        self._require_link()
+        if uuid == NOTIFY_CHAR_UUID:
+            self._callback = callback
+
+    async def stop_notify(self, uuid: str) -> None:
+        self._callback = None
+
+    async def write_gatt_char(self, uuid: str, data, response: bool = True) -> None:
+        self._require_link()
+        if uuid != WRITE_CHAR_UUID:
+            return
+        self.writes.append(bytes(data))
+        reply = self._fan.handle_frame(bytes(data))
+        cfg = self._fan.config
+        if reply is not None and self._fan.rng.random() >= cfg.loss:
+            loop = asyncio.get_running_loop()
+            if cfg.notify_delay:
+                loop.call_later(cfg.notify_delay, self.notify, reply)
+            else:
+                loop.call_soon(self.notify, reply)
+        if cfg.disconnect_rate and self._fan.rng.random() < cfg.disconnect_rate:
+            asyncio.get_running_loop().call_soon(self.drop)
+
+    def notify(self, frame: bytes) -> None:
+        if self._connected and self._callback is not None:
+            self._callback(NOTIFY_CHAR_UUID, bytearray(frame))
+
+    def drop(self) -> None:
+        """Lose the link unexpectedly."""
+        if not self._connected:
+            return
+        self._close()
+        self._disconnected_callback(self)
+
+    async def disconnect(self) -> None:
+        self._close()
+
+    def _close(self) -> None:
+        self._connected = False
+        self._callback = None
+        if self in self._fan.connections:
+            self._fan.connections.remove(self)
+
+    def _require_link(self) -> None:
+        if not self._connected:
+            raise ConnectionError("Simulated link is down")
+
+
+class SimulatedTransport:
+    """``FanSyncTransport`` that connects to a ``SimulatedFan``."""
+
+    name = "simulated"
+
+    def __init__(self, fan: SimulatedFan) -> None:
+        self.fan = fan
+
+    async def async_connect(
+        self, address: str, disconnected_callback: Callable[[Any], None]
+    ) -> SimulatedConnection:
+        if self.fan.config.connect_latency:
+            await asyncio.sleep(self.fan.config.connect_latency)
+        conn = SimulatedConnection(self.fan, disconnected_callback)
+        self.fan.connections.append(conn)
+        self.fan.connects += 1
+        return conn
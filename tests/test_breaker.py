@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from bleak.exc import BleakError
+
+from custom_components.fansync_ble import breaker as breaker_mod
+from custom_components.fansync_ble.breaker import (
+    ERROR_CONNECTION,
+    ERROR_NO_SLOT,
+    ERROR_NOT_FOUND,
+    ERROR_TIMEOUT,
+    ERROR_UNKNOWN,
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    classify_error,
+)
+from custom_components.fansync_ble.scheduler import SlotUnavailable
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize(
+    ("err", "kind"),
+    [
+        (asyncio.TimeoutError(), ERROR_TIMEOUT),
+        (BleakError("No backend with an available connection slot"), ERROR_NO_SLOT),
+        (SlotUnavailable("No free connection slot on hci0"), ERROR_NO_SLOT),
+        (BleakError("Device with address AA was Not Found"), ERROR_NOT_FOUND),
+        (BleakError("ESP_GATT_CONN_FAIL_ESTABLISH"), ERROR_CONNECTION),
+        (ValueError("bad"), ERROR_UNKNOWN),
+    ],
+)
+def test_classify_error(err, kind):
+    assert classify_error(err) == kind
+
+
+def test_classify_error_prefers_exception_types():
+    slots = breaker_mod.BleakOutOfConnectionSlotsError
+    not_found = breaker_mod.BleakNotFoundError
+    if slots is None or not_found is None:
+        pytest.skip("bleak-retry-connector error types unavailable")
+    # The message would suggest otherwise; the type wins.
+    assert classify_error(slots("device Not Found")) == ERROR_NO_SLOT
+    assert classify_error(not_found("boom")) == ERROR_NOT_FOUND
+
+
+def test_breaker_opens_after_threshold_and_probes_after_interval():
+    clock = Clock()
+    br = CircuitBreaker(threshold=3, interval=60, max_interval=200, clock=clock)
+
+    assert br.record_failure(ERROR_TIMEOUT) is False
+    assert br.record_failure(ERROR_TIMEOUT) is False
+    assert br.record_failure(ERROR_TIMEOUT) is True
+    assert br.state == STATE_OPEN
+    assert br.allow() is False
+    assert br.seconds_until_probe() == 60
+
+    clock.now += 60
+    assert br.allow() is True
+    assert br.state == STATE_HALF_OPEN
+    assert br.probing
+
+    # A failed probe reopens with a doubled, capped interval.
+    assert br.record_failure(ERROR_CONNECTION) is True
+    assert br.interval == 120
+    clock.now += 120
+    assert br.allow() is True
+    br.record_failure(ERROR_CONNECTION)
+    assert br.interval == 200
+
+    clock.now += 200
+    assert br.allow() is True
+    br.record_success()
+    assert br.state == STATE_CLOSED
+    assert br.interval == 60
+    diag = br.diagnostics()
+    assert diag["trips"] == 1
+    assert diag["probes"] == 3
+    assert diag["rejected_polls"] == 1
+
+
+def test_adapter_failures_do_not_trip_the_breaker():
+    br = CircuitBreaker(threshold=1, clock=Clock())
+    assert br.record_failure(ERROR_NO_SLOT) is False
+    assert br.state == STATE_CLOSED
+    assert br.last_error_kind == ERROR_NO_SLOT
+
+
+def test_probe_now_allows_an_early_probe():
+    clock = Clock()
+    br = CircuitBreaker(threshold=1, interval=60, clock=clock)
+    br.record_failure(ERROR_NOT_FOUND)
+    assert br.allow() is False
+    br.probe_now()
+    assert br.allow() is True
+    assert br.state == STATE_HALF_OPEN
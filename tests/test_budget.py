@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.fansync_ble import client as client_mod
+from custom_components.fansync_ble.budget import AdaptiveTimeouts, Deadline
+from custom_components.fansync_ble.client import FanSyncBleClient
+from custom_components.fansync_ble.const import (
+    TIMEOUT_MIN_SAMPLES,
+    TIMEOUT_WINDOW,
+    WEAK_RSSI,
+    WEAK_RSSI_FACTOR,
+)
+from custom_components.fansync_ble.metrics import PHASE_CONNECT, SessionTimings
+from tests.fansync_sim import SimConfig, SimulatedFan, SimulatedTransport
+
+
+class Clock:
+    def __init__(self):
+        self.now = 50.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_deadline_caps_timeouts_and_raises_when_spent():
+    clock = Clock()
+    deadline = Deadline(10, clock=clock)
+
+    assert deadline.cap(4.0) == 4.0
+    clock.now += 8
+    assert deadline.cap(4.0) == pytest.approx(2.0)
+    clock.now += 2
+    assert deadline.expired
+    with pytest.raises(asyncio.TimeoutError):
+        deadline.cap(4.0)
+
+
+def test_adaptive_timeouts_learn_from_recent_latency():
+    timings = SessionTimings()
+    timeouts = AdaptiveTimeouts(timings)
+
+    for _ in range(TIMEOUT_MIN_SAMPLES - 1):
+        timings.record(PHASE_CONNECT, 3.0)
+    # Not enough samples yet: the fixed default applies.
+    assert timeouts.timeout(PHASE_CONNECT, 4.0, 1.0) == 4.0
+
+    timings.record(PHASE_CONNECT, 3.0)
+    # p99 of 3 s with a 2x margin, above the default on a slow link.
+    assert timeouts.timeout(PHASE_CONNECT, 4.0, 1.0) == pytest.approx(6.0)
+    # Weak links get more time.
+    assert timeouts.timeout(PHASE_CONNECT, 4.0, 1.0, rssi=WEAK_RSSI) == pytest.approx(
+        6.0 * WEAK_RSSI_FACTOR
+    )
+    assert timeouts.snapshot() == {PHASE_CONNECT: pytest.approx(9.0)}
+
+    # Old slow samples roll out of the window once the link is fast again,
+    # and a fast link fails fast: well below the default, down to the minimum.
+    for _ in range(TIMEOUT_WINDOW):
+        timings.record(PHASE_CONNECT, 0.8)
+    assert timeouts.timeout(PHASE_CONNECT, 4.0, 1.0) == pytest.approx(1.6)
+    for _ in range(TIMEOUT_WINDOW):
+        timings.record(PHASE_CONNECT, 0.2)
+    assert timeouts.timeout(PHASE_CONNECT, 4.0, 1.0) == 1.0
+
+
+@pytest.mark.asyncio
+async def test_session_fails_within_its_budget(monkeypatch):
+    monkeypatch.setattr(client_mod, "POST_DISCONNECT_DELAY", 0.0)
+    fan = SimulatedFan(SimConfig(connect_latency=5.0))
+    c = FanSyncBleClient("AA:BB", transport=SimulatedTransport(fan), session_budget=0.2)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await c.get_state(timeout=2.0)
+
+    assert loop.time() - start < 1.0
+
+
+@pytest.mark.asyncio
+async def test_return_wait_follows_the_link_speed(monkeypatch):
+    monkeypatch.setattr(client_mod, "POST_DISCONNECT_DELAY", 0.0)
+    config = SimConfig()
+    fan = SimulatedFan(config, speed=2)
+    c = FanSyncBleClient("AA:BB", transport=SimulatedTransport(fan))
+
+    for _ in range(10):
+        assert (await c.get_state(timeout=2.0)).valid
+    # Fast replies shrink the wait from the 2 s default to the minimum.
+    assert c.connection_diagnostics()["timeouts"]["first_return"] == pytest.approx(
+        client_mod._RETURN_MIN_TIMEOUT
+    )
+
+    # Replies now take longer than the learned wait; the first one is missed
+    # and counted at the time waited, which lengthens the next wait.
+    config.notify_delay = 0.4
+    results = [(await c.get_state(timeout=2.0)).valid for _ in range(3)]
+
+    assert results == [False, True, True]
+    assert c.connection_diagnostics()["timeouts"]["first_return"] >= 0.6
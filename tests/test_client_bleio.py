@@ -1,5 +1,6 @@
 import asyncio
 import pytest
+from bleak.exc import BleakError
 from custom_components.fansync_ble.client import FanState, FanSyncBleClient
 from custom_components.fansync_ble.const import CONTROL_FAN_STATUS, RETURN_FAN_STATUS
 
@@ -21,6 +22,8 @@ class DummyClient:
         self.writes = []
         self.connected = False
         self.notifies = []
+        self.echo = True
+        self._cb = None
 
     async def connect(self, timeout=15.0):
         self.connected = True
@@ -30,6 +33,7 @@ class DummyClient:
 
     async def start_notify(self, uuid, cb):
         self.notifies.append(uuid)
+        self._cb = cb
         # immediately simulate a RETURN frame arriving; handle async callback
         res = cb(uuid, bytearray(make_return(speed=2, down=25)))
         if asyncio.iscoroutine(res):
@@ -40,6 +44,9 @@ class DummyClient:
 
     async def write_gatt_char(self, uuid, payload, response=True):
         self.writes.append((uuid, bytes(payload), response))
+        if self.echo and self._cb and payload[1] == CONTROL_FAN_STATUS:
+            # The fan answers a CONTROL write with a RETURN frame of its new state
+            self._cb(uuid, bytearray(make_return(*payload[2:9])))
 
     async def disconnect(self):
         self.connected = False
@@ -137,36 +144,282 @@ async def test_set_direction_preserves_or_assumes(monkeypatch):
     assert payload2[5] == 100
 
 
+class CountingClient(DummyClient):
+    def __init__(self):
+        super().__init__()
+        self.connects = 0
+        self.disconnects = 0
+
+    @property
+    def is_connected(self):
+        return self.connected
+
+    async def connect(self, timeout=15.0):
+        self.connects += 1
+        await super().connect(timeout=timeout)
+
+    async def disconnect(self):
+        self.disconnects += 1
+        await super().disconnect()
+
+
 @pytest.mark.asyncio
-async def test_discover_candidates_filters_by_name_hint(monkeypatch):
-    # Prepare fake devices
-    class Dev:
-        def __init__(self, address, name):
-            self.address = address
-            self.name = name
-
-    async def fake_discover(timeout=8.0):
-        return [
-            Dev("AA", "CeilingFan-123"),
-            Dev("BB", "OtherDevice"),
-            Dev("CC", None),
-            Dev("DD", "ceiling-helper"),
-        ]
-
-    # Patch BleakScanner.discover inside module
+async def test_keep_alive_reuses_connection_across_operations(monkeypatch):
     from custom_components.fansync_ble import client as client_mod
 
-    monkeypatch.setattr(client_mod.BleakScanner, "discover", fake_discover)
+    dummy = CountingClient()
+    monkeypatch.setattr(client_mod, "BleakClient", lambda addr: dummy)
+
+    c = FanSyncBleClient("AA:BB", keep_alive=True, idle_timeout=60)
+    st = await c.get_state(timeout=0.1)
+    await c.set_speed(3, st=st)
+    await c.set_light(50, st=st)
+
+    assert st.valid
+    assert dummy.connects == 1
+    assert dummy.disconnects == 0
+    assert c.is_connected
+    # One GET plus two CONTROL writes over the same connection
+    assert [p[1] for _, p, _ in dummy.writes] == [0x30, CONTROL_FAN_STATUS, 0x31]
+
+    await c.async_close()
+    assert dummy.disconnects == 1
+    assert not c.is_connected
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_disconnects_after_idle_timeout(monkeypatch):
+    from custom_components.fansync_ble import client as client_mod
+
+    dummy = CountingClient()
+    monkeypatch.setattr(client_mod, "BleakClient", lambda addr: dummy)
+
+    c = FanSyncBleClient("AA:BB", keep_alive=True, idle_timeout=0.05)
+    await c.set_speed(1, st=FanState(valid=True))
+    assert c.is_connected
+
+    await asyncio.sleep(0.15)
+    assert dummy.disconnects == 1
+    assert not c.is_connected
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_reconnects_after_unexpected_disconnect(monkeypatch):
+    from custom_components.fansync_ble import client as client_mod
+
+    dummy = CountingClient()
+    monkeypatch.setattr(client_mod, "BleakClient", lambda addr: dummy)
+
+    c = FanSyncBleClient("AA:BB", keep_alive=True, idle_timeout=60)
+    await c.set_speed(1, st=FanState(valid=True))
+
+    # Simulate the link dropping underneath us
+    dummy.connected = False
+    c._on_disconnected(dummy)
+    assert not c.is_connected
+    await c._reconnect_task
+
+    assert dummy.connects == 2
+    assert c.is_connected
+    await c.async_close()
+
+
+@pytest.mark.asyncio
+async def test_push_subscription_forwards_frames_and_reports_loss(monkeypatch):
+    from custom_components.fansync_ble import client as client_mod
+
+    dummy = CountingClient()
+    monkeypatch.setattr(client_mod, "BleakClient", lambda addr: dummy)
+    callbacks = {}
+
+    async def start_notify(uuid, cb):
+        callbacks["cb"] = cb
+
+    async def write_gatt_char(uuid, payload, response=True):
+        dummy.writes.append((uuid, bytes(payload), response))
+        if payload[1] == 0x30:
+            callbacks["cb"](uuid, bytearray(make_return(speed=1, down=60)))
+
+    dummy.start_notify = start_notify
+    dummy.write_gatt_char = write_gatt_char
+
+    seen = []
+    lost = []
+    c = FanSyncBleClient("AA:BB")
+    st = await c.async_start_push(seen.append, lambda: lost.append(True))
+
+    assert st.valid and st.speed == 1
+    assert c.push_active
+    # Unsolicited frame (e.g., wall remote) is forwarded
+    callbacks["cb"](None, bytearray(make_return(speed=3, down=0)))
+    assert seen[-1].speed == 3
+    # Corrupt frames are ignored
+    callbacks["cb"](None, bytearray(b"\x00" * 10))
+    assert seen[-1].speed == 3
+
+    # A GET while subscribed reuses the held connection and the push stream
+    st2 = await c.get_state(timeout=0.5)
+    assert st2.valid
+    assert dummy.connects == 1 and dummy.disconnects == 0
+
+    dummy.connected = False
+    c._on_disconnected(dummy)
+    assert lost == [True]
+    assert not c.push_active
+    await c.async_close()
+
+
+@pytest.mark.asyncio
+async def test_set_fields_writes_merged_control_frame(monkeypatch):
+    from custom_components.fansync_ble import client as client_mod
+
+    dummy = CountingClient()
+    monkeypatch.setattr(client_mod, "BleakClient", lambda addr: dummy)
+
+    c = FanSyncBleClient("AA:BB", keep_alive=True)
+    st = FanState.from_bytes(
+        make_return(speed=1, direction=0, up=4, down=10, tlo=2, thi=1, ftype=9)
+    )
+    await c.set_fields(speed=3, down=150, direction=1, st=st)
+
+    assert len(dummy.writes) == 1
+    _, payload, _ = dummy.writes[0]
+    assert payload[2] == 3
+    assert payload[3] == 1
+    assert payload[4] == st.up
+    assert payload[5] == 100
+    assert (payload[6], payload[7], payload[8]) == (2, 1, 9)
+    await c.async_close()
+
+
+@pytest.mark.asyncio
+async def test_control_write_completes_on_matching_echo(monkeypatch):
+    from custom_components.fansync_ble import client as client_mod
+
+    dummy = DummyClient()
+    monkeypatch.setattr(client_mod, "BleakClient", lambda addr: dummy)
+
+    c = FanSyncBleClient("AA:BB")
+    st = FanState.from_bytes(make_return(speed=1, down=40))
+    frame = client_mod.build_frame(CONTROL_FAN_STATUS, 3, 0, 0, 40, 0, 0, 0)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    echo = await c._control_unlocked(st, lambda _: frame)
+
+    assert echo is not None and echo.speed == 3 and echo.down == 40
+    # Neither the confirm timeout nor the fixed settle delay was paid
+    assert loop.time() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_control_write_without_echo_gives_up_after_timeout(monkeypatch):
+    from custom_components.fansync_ble import client as client_mod
+
+    dummy = DummyClient()
+    dummy.echo = False
+    monkeypatch.setattr(client_mod, "BleakClient", lambda addr: dummy)
+    monkeypatch.setattr(client_mod, "WRITE_CONFIRM_TIMEOUT", 0.05)
+
+    c = FanSyncBleClient("AA:BB")
+    st = FanState.from_bytes(make_return(speed=1, down=40))
+    echo = await c._control_unlocked(
+        st,
+        lambda _: client_mod.build_frame(CONTROL_FAN_STATUS, 3, 0, 0, 40, 0, 0, 0),
+    )
+
+    assert echo is None
+    assert dummy.writes[-1][1][2] == 3
+    assert not dummy.connected
+
+
+@pytest.mark.asyncio
+async def test_connect_strategy_is_probed_once(monkeypatch):
+    from custom_components.fansync_ble import client as client_mod
+
+    dummy = CountingClient()
+    monkeypatch.setattr(client_mod, "BleakClient", lambda addr: dummy)
+    probes = []
+    real = client_mod._bleak_ctor_accepts_disconnected
+
+    def counting_probe():
+        probes.append(True)
+        return real()
+
+    monkeypatch.setattr(client_mod, "_bleak_ctor_accepts_disconnected", counting_probe)
+
+    c = FanSyncBleClient("AA:BB")
+    await c.get_state(timeout=0.1)
+    await c.get_state(timeout=0.1)
+
+    assert len(probes) == 1
+    diag = c.connection_diagnostics()
+    assert diag["strategy"] == client_mod.STRATEGY_BLEAK_PLAIN
+    assert diag["connects"] == {client_mod.STRATEGY_BLEAK_PLAIN: 2}
+    assert diag["service_cache"] is False
+    assert diag["stale_cleanups"] == 0
+
+
+def test_brc_call_style_reads_signature(monkeypatch):
+    from custom_components.fansync_ble import client as client_mod
+
+    async def modern(client_class, device, name, disconnected_callback=None, **kw):
+        pass
+
+    async def ha_style(hass, client_class, device, name=None, **kw):
+        pass
+
+    async def legacy(client_class, device, timeout=10.0):
+        pass
+
+    monkeypatch.setattr(client_mod, "establish_connection", modern)
+    assert client_mod._brc_call_style(True) == client_mod.STRATEGY_BRC_NAME
+    monkeypatch.setattr(client_mod, "establish_connection", ha_style)
+    assert client_mod._brc_call_style(True) == client_mod.STRATEGY_BRC_HASS
+    monkeypatch.setattr(client_mod, "establish_connection", legacy)
+    assert client_mod._brc_call_style(False) == client_mod.STRATEGY_BRC_LEGACY
+
+
+@pytest.mark.asyncio
+async def test_brc_connect_uses_service_cache_and_clears_stale_links(monkeypatch):
+    from custom_components.fansync_ble import client as client_mod
+
+    dummy = CountingClient()
+    calls = []
+    stale = []
+
+    class KwargsClient:
+        def __init__(self, address, **kwargs):
+            pass
+
+    async def establish(client_class, device, name=None, **kwargs):
+        calls.append((client_class, device))
+        if len(calls) == 1:
+            raise BleakError("busy")
+        return dummy
+
+    async def close_stale(address):
+        stale.append(address)
+
+    async def no_device(self):
+        return None
+
+    monkeypatch.setattr(client_mod, "BleakClient", KwargsClient)
+    monkeypatch.setattr(client_mod, "establish_connection", establish)
+    monkeypatch.setattr(client_mod, "close_stale_connections_by_address", close_stale)
+    monkeypatch.setattr(client_mod.FanSyncBleClient, "_resolve_device", no_device)
+    monkeypatch.setattr(client_mod.asyncio, "sleep", _no_sleep)
+
+    c = FanSyncBleClient("AA:BB")
+    assert await c._connect() is dummy
+
+    assert [cls for cls, _ in calls] == [client_mod.BleakClientWithServiceCache] * 2
+    # Cleaned before the first attempt and again after it failed
+    assert stale == ["AA:BB", "AA:BB"]
+    diag = c.connection_diagnostics()
+    assert diag["strategy"] == client_mod.STRATEGY_BRC_NAME
+    assert diag["service_cache"] is True
+    assert diag["stale_cleanups"] == 2
 
-    # No hint -> all with names
-    res_all = await client_mod.discover_candidates(timeout=0.01)
-    assert ("AA", "CeilingFan-123") in res_all
-    assert ("BB", "OtherDevice") in res_all
-    # Device with None name excluded
-    assert not any(addr == "CC" for addr, _ in res_all)
 
-    # Hint filters case-insensitively
-    res_hint = await client_mod.discover_candidates(timeout=0.01, name_hint="Ceiling")
-    assert ("AA", "CeilingFan-123") in res_hint
-    assert ("DD", "ceiling-helper") in res_hint
-    assert ("BB", "OtherDevice") not in res_hint
+async def _no_sleep(_delay):
+    return None
@@ -14,7 +14,7 @@ async def test_set_speed_commands_are_serialized(monkeypatch):
             nonlocal active_sessions
             active_sessions -= 1
 
-    async def fake_connect(self):
+    async def fake_connect(self, attempts=None):
         nonlocal active_sessions, max_concurrent
         active_sessions += 1
         max_concurrent = max(max_concurrent, active_sessions)
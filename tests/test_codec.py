@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import struct
+
+import pytest
+
+from custom_components.fansync_ble import client as client_mod
+from custom_components.fansync_ble.codec import (
+    FRAME_LEN,
+    GET_FRAME,
+    FanState,
+    build_frame,
+    decode_frame,
+    decode_frames,
+    encode_control,
+    encode_frames,
+    iter_decode,
+)
+from custom_components.fansync_ble.const import (
+    CONTROL_FAN_STATUS,
+    GET_FAN_STATUS,
+    RETURN_FAN_STATUS,
+)
+
+
+def test_client_module_re_exports_codec_types():
+    assert client_mod.FanState is FanState
+    assert client_mod.build_frame is build_frame
+
+
+def test_build_frame_masks_values_and_appends_checksum():
+    frame = build_frame(CONTROL_FAN_STATUS, 0x103, 1, 0, 100, 0x34, 0x12, 9)
+    assert frame[:9] == bytes(
+        [0x53, CONTROL_FAN_STATUS, 0x03, 1, 0, 100, 0x34, 0x12, 9]
+    )
+    assert frame[9] == sum(frame[:9]) & 0xFF
+    assert GET_FRAME == build_frame(GET_FAN_STATUS, 0, 0, 0, 0, 0, 0, 0)
+
+
+def test_encode_control_applies_only_given_changes():
+    st = FanState(
+        speed=1, direction=1, up=2, down=40, timer_lo=5, timer_hi=1, fan_type=7
+    )
+    frame = encode_control(st, speed=3, direction=None, down=0)
+
+    assert frame == build_frame(CONTROL_FAN_STATUS, 3, 1, 2, 0, 5, 1, 7)
+
+
+def test_decode_frame_at_offset_and_rejects_other_frames():
+    ret = build_frame(RETURN_FAN_STATUS, 2, 0, 0, 30, 0, 0, 0)
+    buf = b"\x00" * 3 + ret
+
+    assert decode_frame(buf, 3) == FanState(2, 0, 0, 30, 0, 0, 0, True)
+    assert decode_frame(GET_FRAME) is None
+
+
+def test_batch_round_trip_marks_bad_frames():
+    states = [FanState(speed=i % 4, down=i, valid=True) for i in range(50)]
+    buf = bytearray(encode_frames(RETURN_FAN_STATUS, states))
+    assert len(buf) == 50 * FRAME_LEN
+    buf[FRAME_LEN * 7 + 9] ^= 0xFF
+
+    decoded = list(iter_decode(buf))
+    assert decoded[7] is None
+    assert decoded[8] == states[8]
+    assert decode_frames(buf) == states[:7] + states[8:]
+
+
+def test_iter_decode_requires_aligned_buffer():
+    with pytest.raises(struct.error):
+        list(iter_decode(GET_FRAME[:7]))
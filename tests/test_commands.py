@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.fansync_ble.client import FanState
+from custom_components.fansync_ble.commands import FanSyncCommandQueue
+
+
+class _Client:
+    def __init__(self, fail: bool = False, echo: FanState | None = None):
+        self.calls = []
+        self.fail = fail
+        self.echo = echo
+
+    async def set_fields(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("write failed")
+        return self.echo
+
+
+def _coordinator(state, client, verified: bool = True):
+    coord = SimpleNamespace(
+        _last_state=state,
+        state_verified=verified,
+        client=client,
+        local_updates=[],
+        device_states=[],
+        refreshes=0,
+        activity=0,
+    )
+
+    def apply(**kwargs):
+        coord.local_updates.append(kwargs)
+
+    def refresh():
+        coord.refreshes += 1
+
+    def activity():
+        coord.activity += 1
+
+    coord.async_apply_local_state = apply
+    coord.async_apply_device_state = coord.device_states.append
+    coord._async_note_activity = activity
+    coord.async_schedule_immediate_refresh = refresh
+    return coord
+
+
+@pytest.mark.asyncio
+async def test_concurrent_intents_are_merged_into_one_write():
+    client = _Client()
+    coord = _coordinator(FanState(speed=1, down=10, valid=True), client)
+    queue = FanSyncCommandQueue(coord, window=0.01)
+
+    await asyncio.gather(
+        queue.async_submit(down=20),
+        queue.async_submit(down=40),
+        queue.async_submit(speed=2, assume_light=100),
+        queue.async_submit(down=80, assume_speed=1),
+    )
+
+    assert len(client.calls) == 1
+    call = client.calls[0]
+    assert call["speed"] == 2
+    assert call["down"] == 80
+    assert call["direction"] is None
+    assert call["st"] is coord._last_state
+    assert coord.local_updates == [{"speed": 2, "direction": None, "down": 80}]
+    assert coord.refreshes == 1
+    assert queue.diagnostics() == {
+        "submitted": 4,
+        "sent": 1,
+        "confirmed": 0,
+        "pending": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_intents_during_in_flight_write_are_sent_as_next_batch():
+    client = _Client()
+    coord = _coordinator(FanState(valid=True), client)
+    queue = FanSyncCommandQueue(coord, window=0.0)
+
+    first = asyncio.create_task(queue.async_submit(speed=1))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    # First write is in flight; these supersede each other
+    await asyncio.gather(
+        first,
+        queue.async_submit(speed=2),
+        queue.async_submit(speed=3),
+    )
+
+    assert [c["speed"] for c in client.calls] == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_invalid_state_applies_assumed_speed_locally():
+    client = _Client()
+    coord = _coordinator(FanState(valid=False), client)
+    queue = FanSyncCommandQueue(coord, window=0.0)
+
+    await queue.async_submit(down=0, assume_speed=0)
+
+    assert client.calls[0]["assume_speed"] == 0
+    assert coord.local_updates == [{"speed": 0, "direction": None, "down": 0}]
+
+
+@pytest.mark.asyncio
+async def test_unverified_state_is_not_used_as_control_base():
+    client = _Client()
+    restored = FanState(speed=2, down=80, timer_lo=30, valid=True)
+    coord = _coordinator(restored, client, verified=False)
+    queue = FanSyncCommandQueue(coord, window=0.0)
+
+    await queue.async_submit(speed=3, assume_light=100)
+
+    # The client reads the device before building the CONTROL frame.
+    assert client.calls[0]["st"] is None
+    assert coord.local_updates == [{"speed": 3, "direction": None, "down": None}]
+
+
+@pytest.mark.asyncio
+async def test_unknown_state_applies_assumed_speed_locally():
+    client = _Client()
+    coord = _coordinator(None, client, verified=False)
+    queue = FanSyncCommandQueue(coord, window=0.0)
+
+    await queue.async_submit(down=60, assume_speed=1)
+
+    assert client.calls[0]["st"] is None
+    assert coord.local_updates == [{"speed": 1, "direction": None, "down": 60}]
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_write_releases_waiting_callers():
+    client = _Client()
+    started = asyncio.Event()
+
+    async def slow_set_fields(**kwargs):
+        started.set()
+        await asyncio.sleep(10)
+
+    client.set_fields = slow_set_fields
+    coord = _coordinator(FanState(valid=True), client)
+    queue = FanSyncCommandQueue(coord, window=0.0)
+
+    caller = asyncio.create_task(queue.async_submit(speed=2))
+    await started.wait()
+    queue.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(caller, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_write_errors_reach_every_waiter():
+    client = _Client(fail=True)
+    coord = _coordinator(FanState(valid=True), client)
+    queue = FanSyncCommandQueue(coord, window=0.0)
+
+    results = await asyncio.gather(
+        queue.async_submit(speed=1),
+        queue.async_submit(direction=1),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert coord.local_updates == []
+    assert coord.refreshes == 0
+
+
+@pytest.mark.asyncio
+async def test_matching_echo_is_published_without_refresh():
+    echo = FanState(speed=2, direction=0, down=80, valid=True)
+    client = _Client(echo=echo)
+    coord = _coordinator(FanState(speed=1, down=10, valid=True), client)
+    queue = FanSyncCommandQueue(coord, window=0.0)
+
+    await queue.async_submit(speed=2, down=80)
+
+    assert coord.device_states == [echo]
+    assert coord.local_updates == []
+    assert coord.refreshes == 0
+    assert coord.activity == 1
+    assert queue.diagnostics()["confirmed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_mismatched_echo_falls_back_to_refresh():
+    client = _Client(echo=FanState(speed=1, down=80, valid=True))
+    coord = _coordinator(FanState(speed=1, down=10, valid=True), client)
+    queue = FanSyncCommandQueue(coord, window=0.0)
+
+    await queue.async_submit(speed=2)
+
+    assert coord.device_states == []
+    assert coord.local_updates == [{"speed": 2, "direction": None, "down": None}]
+    assert coord.refreshes == 1
@@ -16,8 +16,12 @@ from custom_components.fansync_ble.const import (
     CONF_DIMMABLE,
     CONF_DIRECTION_SUPPORTED,
     CONF_HAS_LIGHT,
+    CONF_IDLE_TIMEOUT,
+    CONF_KEEP_ALIVE,
     CONF_POLL_INTERVAL,
+    CONF_POLL_MODE,
     CONF_TURN_ON_SPEED,
+    SERVICE_UUID,
 )
 
 AbortFlow = pytest.importorskip("homeassistant.data_entry_flow").AbortFlow
@@ -25,10 +29,10 @@ AbortFlow = pytest.importorskip("homeassistant.data_entry_flow").AbortFlow
 
 @pytest.mark.asyncio
 async def test_config_flow_discovery_error_shows_bluetooth_unavailable(monkeypatch):
-    async def boom(timeout=8.0, name_hint=None):
+    async def boom(hass):
         raise RuntimeError("no bt")
 
-    monkeypatch.setattr(cfg, "discover_candidates", boom)
+    monkeypatch.setattr(cfg, "_async_scan_candidates", boom)
     flow = FanSyncConfigFlow()
 
     res = await flow.async_step_user(None)
@@ -38,10 +42,10 @@ async def test_config_flow_discovery_error_shows_bluetooth_unavailable(monkeypat
 
 @pytest.mark.asyncio
 async def test_config_flow_no_devices_shows_no_devices_found(monkeypatch):
-    async def no_devices(timeout=8.0, name_hint=None):
+    async def no_devices(hass):
         return []
 
-    monkeypatch.setattr(cfg, "discover_candidates", no_devices)
+    monkeypatch.setattr(cfg, "_async_scan_candidates", no_devices)
     flow = FanSyncConfigFlow()
 
     res = await flow.async_step_user(None)
@@ -51,10 +55,10 @@ async def test_config_flow_no_devices_shows_no_devices_found(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_config_flow_devices_found_uses_choice_schema(monkeypatch):
-    async def found(timeout=8.0, name_hint=None):
+    async def found(hass):
         return [("AA:BB", "CeilingFan-A"), ("CC:DD", "CeilingFan-B")]
 
-    monkeypatch.setattr(cfg, "discover_candidates", found)
+    monkeypatch.setattr(cfg, "_async_scan_candidates", found)
     flow = FanSyncConfigFlow()
 
     res = await flow.async_step_user(None)
@@ -96,6 +100,9 @@ async def test_options_flow_schema_defaults_reflect_entry_options():
             CONF_DIRECTION_SUPPORTED: True,
             CONF_POLL_INTERVAL: 42,
             CONF_TURN_ON_SPEED: 1,
+            CONF_KEEP_ALIVE: True,
+            CONF_IDLE_TIMEOUT: 120,
+            CONF_POLL_MODE: "adaptive",
         }
     )
     flow = FanSyncOptionsFlowHandler(config_entry)
@@ -110,14 +117,17 @@ async def test_options_flow_schema_defaults_reflect_entry_options():
     assert normalized[CONF_DIRECTION_SUPPORTED] is True
     assert normalized[CONF_POLL_INTERVAL] == 42
     assert normalized[CONF_TURN_ON_SPEED] == 1
+    assert normalized[CONF_KEEP_ALIVE] is True
+    assert normalized[CONF_IDLE_TIMEOUT] == 120
+    assert normalized[CONF_POLL_MODE] == "adaptive"
 
 
 @pytest.mark.asyncio
 async def test_config_flow_submit_blank_address_shows_address_required(monkeypatch):
-    async def no_devices(timeout=8.0, name_hint=None):
+    async def no_devices(hass):
         return []
 
-    monkeypatch.setattr(cfg, "discover_candidates", no_devices)
+    monkeypatch.setattr(cfg, "_async_scan_candidates", no_devices)
     flow = FanSyncConfigFlow()
 
     res = await flow.async_step_user(
@@ -136,7 +146,7 @@ async def test_config_flow_submit_blank_address_shows_address_required(monkeypat
 
 @pytest.mark.asyncio
 async def test_config_flow_submit_valid_creates_entry_with_options(monkeypatch):
-    async def no_devices(timeout=8.0, name_hint=None):
+    async def no_devices(hass):
         return []
 
     class OkClient:
@@ -147,7 +157,11 @@ async def test_config_flow_submit_valid_creates_entry_with_options(monkeypatch):
         async def get_state(self, timeout=3.0):
             return FanState(valid=True)
 
-    monkeypatch.setattr(cfg, "discover_candidates", no_devices)
+    async def advertising(hass, address):
+        return True
+
+    monkeypatch.setattr(cfg, "_async_scan_candidates", no_devices)
+    monkeypatch.setattr(cfg, "_async_advertising", advertising)
     monkeypatch.setattr(cfg, "FanSyncBleClient", OkClient)
 
     flow = FanSyncConfigFlow()
@@ -179,7 +193,7 @@ async def test_config_flow_submit_valid_creates_entry_with_options(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_config_flow_submit_shows_cannot_connect_on_failed_probe(monkeypatch):
-    async def no_devices(timeout=8.0, name_hint=None):
+    async def no_devices(hass):
         return []
 
     class FailingClient:
@@ -190,7 +204,7 @@ async def test_config_flow_submit_shows_cannot_connect_on_failed_probe(monkeypat
         async def get_state(self, timeout=3.0):
             raise RuntimeError("boom")
 
-    monkeypatch.setattr(cfg, "discover_candidates", no_devices)
+    monkeypatch.setattr(cfg, "_async_scan_candidates", no_devices)
     monkeypatch.setattr(cfg, "FanSyncBleClient", FailingClient)
 
     flow = FanSyncConfigFlow()
@@ -215,12 +229,54 @@ async def test_config_flow_submit_shows_cannot_connect_on_failed_probe(monkeypat
     assert res["errors"]["base"] == "cannot_connect"
 
 
+@pytest.mark.asyncio
+async def test_config_flow_submit_scans_for_the_typed_address(monkeypatch):
+    scans = []
+
+    async def find(address, **kwargs):
+        scans.append(address)
+        return None
+
+    class NoProbeClient:
+        def __init__(self, address, hass=None):
+            raise AssertionError("no probe for a fan that is not advertising")
+
+    monkeypatch.setattr(cfg, "_async_cached_candidates", lambda hass: [])
+    monkeypatch.setattr(cfg.async_get_scan_cache(None), "async_find", find)
+    monkeypatch.setattr(cfg, "FanSyncBleClient", NoProbeClient)
+
+    flow = FanSyncConfigFlow()
+    flow._abort_if_unique_id_configured = lambda: None
+
+    async def _set_unique_id(_uid):
+        return None
+
+    async def no_devices(hass):
+        return []
+
+    flow.async_set_unique_id = _set_unique_id
+    monkeypatch.setattr(cfg, "_async_scan_candidates", no_devices)
+
+    res = await flow.async_step_user(
+        {
+            "address": "AA:BB:CC:DD:EE:FF",
+            CONF_HAS_LIGHT: True,
+            CONF_DIMMABLE: True,
+            CONF_DIRECTION_SUPPORTED: False,
+            CONF_POLL_INTERVAL: 15,
+            CONF_TURN_ON_SPEED: 2,
+        }
+    )
+    assert scans == ["AA:BB:CC:DD:EE:FF"]
+    assert res["errors"]["base"] == "cannot_connect"
+
+
 @pytest.mark.asyncio
 async def test_config_flow_submit_duplicate_unique_id_aborts(monkeypatch):
-    async def no_devices(timeout=8.0, name_hint=None):
+    async def no_devices(hass):
         return []
 
-    monkeypatch.setattr(cfg, "discover_candidates", no_devices)
+    monkeypatch.setattr(cfg, "_async_scan_candidates", no_devices)
     flow = FanSyncConfigFlow()
 
     async def _set_unique_id(_uid):
@@ -261,3 +317,115 @@ async def test_options_flow_submit_creates_entry():
 
     assert res["type"] == "create_entry"
     assert res["data"] == user_input
+
+
+def _service_info(address, name="CeilingFan", uuids=None, rssi=-60):
+    return SimpleNamespace(
+        address=address, name=name, service_uuids=uuids or [], rssi=rssi
+    )
+
+
+@pytest.mark.asyncio
+async def test_bluetooth_discovery_confirms_and_creates_entry_without_probe(
+    monkeypatch,
+):
+    class NoProbeClient:
+        def __init__(self, *args, **kwargs):
+            raise AssertionError("discovered fans are not probed")
+
+    monkeypatch.setattr(cfg, "FanSyncBleClient", NoProbeClient)
+    flow = FanSyncConfigFlow()
+    flow.context = {}
+    flow._abort_if_unique_id_configured = lambda: None
+
+    async def _set_unique_id(_uid):
+        return None
+
+    flow.async_set_unique_id = _set_unique_id
+
+    res = await flow.async_step_bluetooth(
+        _service_info("AA:BB", name="Hall", uuids=[SERVICE_UUID.upper()])
+    )
+    assert res["type"] == "form"
+    assert res["step_id"] == "bluetooth_confirm"
+    assert flow.context["title_placeholders"] == {"name": "Hall"}
+
+    res = await flow.async_step_bluetooth_confirm(
+        res["data_schema"]({CONF_HAS_LIGHT: False})
+    )
+    assert res["type"] == "create_entry"
+    assert res["data"] == {"address": "AA:BB"}
+    assert res["options"][CONF_HAS_LIGHT] is False
+    assert res["options"][CONF_TURN_ON_SPEED] == 2
+
+
+@pytest.mark.asyncio
+async def test_bluetooth_discovery_aborts_for_other_devices():
+    flow = FanSyncConfigFlow()
+    flow.context = {}
+    flow._abort_if_unique_id_configured = lambda: None
+
+    async def _set_unique_id(_uid):
+        return None
+
+    flow.async_set_unique_id = _set_unique_id
+
+    res = await flow.async_step_bluetooth(_service_info("AA:BB", name="Thermometer"))
+    assert res["type"] == "abort"
+    assert res["reason"] == "not_supported"
+
+
+@pytest.mark.asyncio
+async def test_user_step_uses_cached_advertisements_without_scanning(monkeypatch):
+    async def no_scan(hass):
+        raise AssertionError("no scan expected")
+
+    monkeypatch.setattr(cfg, "_async_scan_candidates", no_scan)
+    monkeypatch.setattr(
+        cfg, "_async_cached_candidates", lambda hass: [("AA:BB", "CeilingFan-A")]
+    )
+    flow = FanSyncConfigFlow()
+
+    res = await flow.async_step_user(None)
+    assert res["type"] == "form"
+    assert "errors" not in res or not res["errors"]
+    normalized = res["data_schema"]({"address": "AA:BB"})
+    assert normalized["address"] == "AA:BB"
+
+
+@pytest.mark.asyncio
+async def test_user_step_scans_when_cache_has_no_fans(monkeypatch):
+    async def found(hass):
+        return [("CC:DD", "CeilingFan-B")]
+
+    monkeypatch.setattr(cfg, "_async_scan_candidates", found)
+    monkeypatch.setattr(cfg, "_async_cached_candidates", lambda hass: [])
+    flow = FanSyncConfigFlow()
+
+    res = await flow.async_step_user(None)
+    assert res["type"] == "form"
+    assert "errors" not in res or not res["errors"]
+    assert res["data_schema"]({"address": "CC:DD"})["address"] == "CC:DD"
+
+
+def test_cached_candidates_filter_and_rank_by_rssi(monkeypatch):
+    import sys
+
+    infos = [
+        _service_info("01", name="Other"),
+        _service_info("02", name="CeilingFan", rssi=-80),
+        _service_info("03", name=None, uuids=[SERVICE_UUID], rssi=-50),
+    ]
+    fake_bt = SimpleNamespace(
+        async_discovered_service_info=lambda hass, connectable=True: infos
+    )
+    monkeypatch.setitem(sys.modules, "homeassistant.components.bluetooth", fake_bt)
+    import homeassistant.components as components
+
+    monkeypatch.setattr(components, "bluetooth", fake_bt, raising=False)
+
+    assert cfg._async_cached_candidates(object()) == [
+        ("03", "03"),
+        ("02", "CeilingFan"),
+    ]
+    assert cfg._async_cached_candidates(None) is None
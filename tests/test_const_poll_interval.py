@@ -1,8 +1,13 @@
 from custom_components.fansync_ble.const import (
+    DEFAULT_IDLE_TIMEOUT,
     DEFAULT_POLL_INTERVAL,
+    MAX_IDLE_TIMEOUT,
     MAX_POLL_INTERVAL,
+    MIN_IDLE_TIMEOUT,
     MIN_POLL_INTERVAL,
+    normalize_idle_timeout,
     normalize_poll_interval,
+    normalize_poll_mode,
 )
 
 
@@ -20,3 +25,17 @@ def test_normalize_poll_interval_accepts_valid_values():
     assert normalize_poll_interval(MIN_POLL_INTERVAL) == MIN_POLL_INTERVAL
     assert normalize_poll_interval("42") == 42
     assert normalize_poll_interval(MAX_POLL_INTERVAL) == MAX_POLL_INTERVAL
+
+
+def test_normalize_idle_timeout_defaults_and_clamps():
+    assert normalize_idle_timeout(None) == DEFAULT_IDLE_TIMEOUT
+    assert normalize_idle_timeout(MIN_IDLE_TIMEOUT - 1) == MIN_IDLE_TIMEOUT
+    assert normalize_idle_timeout(MAX_IDLE_TIMEOUT + 1) == MAX_IDLE_TIMEOUT
+    assert normalize_idle_timeout("45") == 45
+
+
+def test_normalize_poll_mode_falls_back_to_default():
+    assert normalize_poll_mode("adaptive") == "adaptive"
+    assert normalize_poll_mode("on_demand") == "on_demand"
+    assert normalize_poll_mode(None) == "fixed"
+    assert normalize_poll_mode("bogus") == "fixed"
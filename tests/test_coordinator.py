@@ -1,14 +1,27 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 from types import SimpleNamespace
 
 import pytest
 from bleak.exc import BleakError
 
-from custom_components.fansync_ble.client import FanState
-from custom_components.fansync_ble.coordinator import FanSyncCoordinator
+from custom_components.fansync_ble.breaker import STATE_OPEN, CircuitBreaker
+from custom_components.fansync_ble.client import FanState, PollSuperseded
+from custom_components.fansync_ble.const import (
+    ADAPTIVE_FAST_INTERVAL,
+    ADAPTIVE_MAX_INTERVAL,
+    POLL_MODE_ADAPTIVE,
+    POLL_MODE_FIXED,
+    POLL_MODE_ON_DEMAND,
+)
+from custom_components.fansync_ble.coordinator import (
+    FanSyncCoordinator,
+    compute_poll_interval,
+)
+from custom_components.fansync_ble.presence import FanSyncPresence
 
 
 def _coord_without_init() -> FanSyncCoordinator:
@@ -20,6 +33,18 @@ def _coord_without_init() -> FanSyncCoordinator:
     coord._last_attempt_at = None
     coord._consecutive_failures = 0
     coord._last_error = None
+    coord._poll_interval = timedelta(seconds=15)
+    coord._push_updates = False
+    coord.update_interval = coord._poll_interval
+    coord._state_verified = False
+    coord._restored_at = None
+    coord._store = None
+    coord._poll_mode = POLL_MODE_FIXED
+    coord._last_activity_at = None
+    coord._unchanged_polls = 0
+    coord._presence = FanSyncPresence(None, "AA:BB", lambda: None)
+    coord._poll_results = deque(maxlen=50)
+    coord._breaker = CircuitBreaker()
     return coord
 
 
@@ -94,6 +119,42 @@ async def test_update_data_ble_error_keeps_last_state_and_tracks_failure():
     assert coord._last_error == "Not Found"
 
 
+@pytest.mark.asyncio
+async def test_update_data_without_return_frame_is_a_failure():
+    coord = _coord_without_init()
+    coord._last_state = FanState(speed=2, valid=True)
+
+    async def fake_get_state(timeout=4.0):
+        return FanState()
+
+    coord.client.get_state = fake_get_state
+    for _ in range(3):
+        st = await coord._async_update_data()
+
+    assert st is coord._last_state and st.valid
+    assert coord._consecutive_failures == 3
+    assert coord._last_error == "timeout"
+    assert coord._last_success_at is None
+    assert list(coord._poll_results) == [False] * 3
+    assert coord._breaker.state == STATE_OPEN
+
+
+@pytest.mark.asyncio
+async def test_update_data_superseded_poll_is_not_a_failure():
+    coord = _coord_without_init()
+    coord._last_state = FanState(speed=2, valid=True)
+
+    async def fake_get_state(timeout=4.0):
+        raise PollSuperseded
+
+    coord.client.get_state = fake_get_state
+    st = await coord._async_update_data()
+
+    assert st is coord._last_state
+    assert coord._consecutive_failures == 0
+    assert coord._last_error is None
+
+
 @pytest.mark.asyncio
 async def test_update_data_success_resets_failure_counters():
     coord = _coord_without_init()
@@ -111,3 +172,205 @@ async def test_update_data_success_resets_failure_counters():
     assert coord._consecutive_failures == 0
     assert coord._last_error is None
     assert isinstance(coord._last_success_at, datetime)
+
+
+@pytest.mark.asyncio
+async def test_update_data_push_mode_subscribes_and_stops_polling():
+    coord = _coord_without_init()
+    coord._push_updates = True
+    subscribed = {}
+
+    async def fake_start_push(on_state, on_lost, timeout=4.0):
+        subscribed["on_state"] = on_state
+        subscribed["on_lost"] = on_lost
+        coord.client.push_active = True
+        return FanState(speed=1, valid=True)
+
+    coord.client.push_active = False
+    coord.client.async_start_push = fake_start_push
+    st = await coord._async_update_data()
+
+    assert st.speed == 1
+    assert coord.update_interval is None
+    assert subscribed["on_state"] == coord._async_handle_push_state
+
+
+def test_push_state_is_published_and_lost_subscription_resumes_polling():
+    coord = _coord_without_init()
+    coord._push_updates = True
+    coord.client.push_active = False
+    coord.update_interval = None
+    published = []
+    refreshes = []
+    coord.async_set_updated_data = published.append
+    coord.async_schedule_immediate_refresh = lambda: refreshes.append(True)
+    coord._consecutive_failures = 2
+
+    coord._async_handle_push_state(FanState(speed=3, down=40, valid=True))
+    assert coord._last_state.speed == 3
+    assert published == [coord._last_state]
+    assert coord._consecutive_failures == 0
+
+    coord._async_handle_push_lost()
+    assert coord.update_interval == timedelta(seconds=15)
+    assert refreshes == [True]
+
+
+class _MemoryStore:
+    def __init__(self, data=None):
+        self.data = data
+        self.saved = []
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay=0):
+        self.saved.append(data_func())
+
+
+@pytest.mark.asyncio
+async def test_restore_state_loads_unverified_state():
+    coord = _coord_without_init()
+    coord._store = _MemoryStore(
+        {
+            "state": {"speed": 2, "direction": 1, "down": 70, "fan_type": 5},
+            "saved_at": "2026-01-01T00:00:00+00:00",
+        }
+    )
+
+    await coord.async_restore_state()
+
+    assert coord._last_state == FanState(
+        speed=2, direction=1, down=70, fan_type=5, valid=True
+    )
+    assert coord.state_verified is False
+    assert coord._restored_at == "2026-01-01T00:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_restore_state_ignores_missing_or_corrupt_data():
+    coord = _coord_without_init()
+    coord._store = _MemoryStore(None)
+    await coord.async_restore_state()
+    assert coord._last_state is None
+
+    coord._store = _MemoryStore({"state": {"speed": "fast"}})
+    await coord.async_restore_state()
+    assert coord._last_state is None
+
+
+@pytest.mark.asyncio
+async def test_live_read_verifies_and_persists_state():
+    coord = _coord_without_init()
+    coord._store = _MemoryStore()
+    coord._last_state = FanState(speed=1, valid=True)
+
+    async def fake_get_state(timeout=4.0):
+        return FanState(speed=3, down=20, valid=True)
+
+    coord.client.get_state = fake_get_state
+    await coord._async_update_data()
+
+    assert coord.state_verified is True
+    saved = coord._store.saved[-1]
+    assert saved["state"]["speed"] == 3
+    assert saved["state"]["down"] == 20
+    assert "valid" not in saved["state"]
+    assert "saved_at" in saved
+
+
+def test_compute_poll_interval_modes():
+    assert compute_poll_interval(POLL_MODE_FIXED, 15, 3, 1.0, 50) == 15
+    assert compute_poll_interval(POLL_MODE_ON_DEMAND, 15, 0, None, 0) is None
+    # Recent activity polls fast
+    assert (
+        compute_poll_interval(POLL_MODE_ADAPTIVE, 15, 0, 10.0, 0)
+        == ADAPTIVE_FAST_INTERVAL
+    )
+    # Idle doubles every few unchanged polls, capped
+    assert compute_poll_interval(POLL_MODE_ADAPTIVE, 15, 0, None, 3) == 15
+    assert compute_poll_interval(POLL_MODE_ADAPTIVE, 15, 0, 3600.0, 4) == 30
+    assert (
+        compute_poll_interval(POLL_MODE_ADAPTIVE, 15, 0, None, 400)
+        == ADAPTIVE_MAX_INTERVAL
+    )
+    # Failures back off exponentially, even right after activity
+    assert compute_poll_interval(POLL_MODE_ADAPTIVE, 15, 1, 1.0, 0) == 30
+    assert compute_poll_interval(POLL_MODE_ADAPTIVE, 15, 3, None, 0) == 120
+    assert (
+        compute_poll_interval(POLL_MODE_ADAPTIVE, 15, 50, None, 0)
+        == ADAPTIVE_MAX_INTERVAL
+    )
+
+
+@pytest.mark.asyncio
+async def test_adaptive_mode_backs_off_on_failure_and_speeds_up_on_change():
+    coord = _coord_without_init()
+    coord._poll_mode = POLL_MODE_ADAPTIVE
+    coord._last_state = FanState(speed=1, valid=True)
+    coord.async_set_updated_data = lambda _st: None
+    results = [asyncio.TimeoutError(), asyncio.TimeoutError()]
+
+    async def fake_get_state(timeout=4.0):
+        if results:
+            raise results.pop(0)
+        return FanState(speed=2, valid=True)
+
+    coord.client.get_state = fake_get_state
+    await coord._async_update_data()
+    assert coord.update_interval == timedelta(seconds=30)
+    await coord._async_update_data()
+    assert coord.update_interval == timedelta(seconds=60)
+
+    # Fan changed (e.g., wall remote): poll fast for a while
+    await coord._async_update_data()
+    assert coord.update_interval == timedelta(seconds=ADAPTIVE_FAST_INTERVAL)
+
+
+@pytest.mark.asyncio
+async def test_on_demand_mode_stops_timed_polling():
+    coord = _coord_without_init()
+    coord._poll_mode = POLL_MODE_ON_DEMAND
+
+    async def fake_get_state(timeout=4.0):
+        return FanState(speed=1, valid=True)
+
+    coord.client.get_state = fake_get_state
+    await coord._async_update_data()
+    assert coord.update_interval is None
+
+
+@pytest.mark.asyncio
+async def test_breaker_skips_polls_while_open_and_probes_once():
+    coord = _coord_without_init()
+    coord._last_state = FanState(speed=2, valid=True)
+    calls = []
+
+    async def failing_get_state(timeout=4.0, attempts=None):
+        calls.append(attempts)
+        raise BleakError("failed to connect")
+
+    coord.client.get_state = failing_get_state
+    for _ in range(3):
+        assert await coord._async_update_data() is coord._last_state
+    assert coord._breaker.state == "open"
+    assert calls == [None, None, None]
+    # The next poll is scheduled for the probe, not the normal interval.
+    assert coord.update_interval.total_seconds() > 15
+
+    # While open, polls return the cached state without a session.
+    assert await coord._async_update_data() is coord._last_state
+    assert len(calls) == 3
+
+    async def good_get_state(timeout=4.0, attempts=None):
+        calls.append(attempts)
+        return FanState(speed=3, valid=True)
+
+    coord.client.get_state = good_get_state
+    coord._breaker.probe_now()
+    st = await coord._async_update_data()
+
+    assert calls[-1] == 1  # single connect attempt
+    assert st.speed == 3
+    assert coord._breaker.state == "closed"
+    assert coord.update_interval == coord._poll_interval
@@ -2,17 +2,22 @@ from types import SimpleNamespace
 
 import pytest
 
+from custom_components.fansync_ble.const import DOMAIN
 from custom_components.fansync_ble.diagnostics import async_get_config_entry_diagnostics
+from custom_components.fansync_ble.metrics import SessionTimings
+from custom_components.fansync_ble.scheduler import FanSyncSessionScheduler
 
 
 @pytest.mark.asyncio
 async def test_async_get_config_entry_diagnostics_returns_coordinator_snapshot():
     class DummyCoordinator:
+        client = SimpleNamespace(timings=SessionTimings())
+
         def diagnostics_snapshot(self):
             return {"consecutive_failures": 2, "last_error": "timeout"}
 
     coord = DummyCoordinator()
-    hass = SimpleNamespace()
+    hass = SimpleNamespace(data={})
     entry = SimpleNamespace(
         entry_id="entry-1",
         title="FanSync Bluetooth (AA:BB)",
@@ -24,3 +29,27 @@ async def test_async_get_config_entry_diagnostics_returns_coordinator_snapshot()
     assert diag["entry"]["entry_id"] == "entry-1"
     assert diag["entry"]["options"]["has_light"] is True
     assert diag["coordinator"]["consecutive_failures"] == 2
+    assert diag["scheduler"] is None
+    assert diag["startup"] is None
+    assert diag["timings"] == {}
+
+
+@pytest.mark.asyncio
+async def test_async_get_config_entry_diagnostics_includes_scheduler():
+    class DummyCoordinator:
+        client = SimpleNamespace(timings=SessionTimings())
+
+        def diagnostics_snapshot(self):
+            return {}
+
+    scheduler = FanSyncSessionScheduler(slots_per_adapter=2)
+    lease = await scheduler.async_acquire("AA:BB", "proxy-1")
+    hass = SimpleNamespace(data={DOMAIN: {"scheduler": scheduler}})
+    entry = SimpleNamespace(
+        entry_id="entry-1", title="t", options={}, runtime_data=DummyCoordinator()
+    )
+
+    diag = await async_get_config_entry_diagnostics(hass, entry)
+    assert diag["scheduler"]["proxy-1"]["active"] == 1
+    assert diag["scheduler"]["proxy-1"]["limit"] == 2
+    lease.release()
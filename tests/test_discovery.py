@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.fansync_ble import discovery
+from custom_components.fansync_ble.const import SERVICE_UUID
+from custom_components.fansync_ble.discovery import ScanCache, async_scan
+
+
+def _adv(address, name=None, uuids=(), rssi=-70):
+    return (
+        SimpleNamespace(address=address, name=name),
+        SimpleNamespace(local_name=name, service_uuids=list(uuids), rssi=rssi),
+    )
+
+
+class FakeScanner:
+    """Replays (delay, advertisement) pairs through the detection callback."""
+
+    def __init__(self, script):
+        self.script = script
+        self.stopped_at = None
+        self._task = None
+
+    def __call__(self, detection_callback):
+        self._callback = detection_callback
+        return self
+
+    async def start(self):
+        self._task = asyncio.ensure_future(self._replay())
+
+    async def _replay(self):
+        for delay, (device, adv) in self.script:
+            await asyncio.sleep(delay)
+            self._callback(device, adv)
+
+    async def stop(self):
+        self.stopped_at = asyncio.get_running_loop().time()
+        self._task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_scan_filters_and_ranks_by_rssi():
+    scanner = FakeScanner(
+        [
+            (0, _adv("01", "Thermometer", rssi=-40)),
+            (0, _adv("02", "CeilingFan", rssi=-80)),
+            (0, _adv("03", None, uuids=[SERVICE_UUID], rssi=-55)),
+        ]
+    )
+    seen = []
+
+    res = await async_scan(
+        timeout=1.0, settle=0.05, on_found=seen.append, scanner_factory=scanner
+    )
+
+    assert [(r.address, r.rssi) for r in res] == [("03", -55), ("02", -80)]
+    assert [r.address for r in seen] == ["02", "03"]
+
+
+@pytest.mark.asyncio
+async def test_scan_stops_once_results_settle():
+    scanner = FakeScanner([(0.01, _adv("02", "CeilingFan"))])
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    res = await async_scan(timeout=5.0, settle=0.05, scanner_factory=scanner)
+
+    assert [r.address for r in res] == ["02"]
+    assert loop.time() - start < 1.0
+
+
+@pytest.mark.asyncio
+async def test_scan_stops_when_target_seen():
+    scanner = FakeScanner(
+        [(0.01, _adv("aa:bb", "CeilingFan")), (2.0, _adv("cc:dd", "CeilingFan"))]
+    )
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    res = await async_scan(
+        timeout=5.0, settle=5.0, target="AA:BB", scanner_factory=scanner
+    )
+
+    assert [r.address for r in res] == ["aa:bb"]
+    assert loop.time() - start < 1.0
+
+
+@pytest.mark.asyncio
+async def test_scan_without_matches_runs_to_timeout():
+    scanner = FakeScanner([(0, _adv("01", "Thermometer"))])
+
+    assert await async_scan(timeout=0.05, settle=0.01, scanner_factory=scanner) == []
+    assert scanner.stopped_at is not None
+
+
+@pytest.mark.asyncio
+async def test_scan_cache_reuses_results_within_ttl(monkeypatch):
+    calls = []
+
+    async def fake_scan(**kwargs):
+        calls.append(kwargs)
+        return [discovery.ScanResult("02", "CeilingFan", -60)]
+
+    monkeypatch.setattr(discovery, "async_scan", fake_scan)
+    cache = ScanCache(ttl=60)
+
+    first, second = await asyncio.gather(cache.async_scan(), cache.async_scan())
+    assert first == second
+    assert len(calls) == 1
+    assert (cache.scans, cache.hits) == (1, 1)
+
+    cache.invalidate()
+    await cache.async_scan()
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_scan_cache_does_not_keep_empty_or_expired_results(monkeypatch):
+    calls = []
+
+    async def fake_scan(**kwargs):
+        calls.append(kwargs)
+        return []
+
+    monkeypatch.setattr(discovery, "async_scan", fake_scan)
+    cache = ScanCache(ttl=0)
+    await cache.async_scan()
+    await cache.async_scan()
+    assert len(calls) == 2
+
+    cache.put([discovery.ScanResult("02", "CeilingFan")])
+    await asyncio.sleep(0.01)
+    assert cache.get() is None
+
+
+@pytest.mark.asyncio
+async def test_scan_cache_find_uses_cache_then_targeted_scan(monkeypatch):
+    calls = []
+
+    async def fake_scan(**kwargs):
+        calls.append(kwargs)
+        return [discovery.ScanResult("03", "CeilingFan", -70)]
+
+    monkeypatch.setattr(discovery, "async_scan", fake_scan)
+    cache = ScanCache(ttl=60)
+    cache.put([discovery.ScanResult("02", "CeilingFan", -60)])
+
+    assert (await cache.async_find("02")).rssi == -60
+    assert calls == []
+
+    assert (await cache.async_find("03")).address == "03"
+    assert calls == [{"target": "03"}]
+    assert await cache.async_find("04") is None
+    # Targeted scans stop early, so they do not replace the cached list.
+    assert [r.address for r in cache.get()] == ["02"]
+
+
+def test_scan_cache_is_shared_per_hass():
+    hass = SimpleNamespace(data={})
+    assert discovery.async_get_scan_cache(hass) is discovery.async_get_scan_cache(hass)
+    assert discovery.async_get_scan_cache(None) is not discovery.async_get_scan_cache(
+        hass
+    )
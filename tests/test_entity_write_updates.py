@@ -19,32 +19,13 @@ from custom_components.fansync_ble.fan import FanSyncFan
 from custom_components.fansync_ble.light import FanSyncLight
 
 
-class _DummyClient:
-    def __init__(self):
-        self.calls = []
-
-    async def set_speed(self, speed, st=None, assume_light=None):
-        self.calls.append(("set_speed", speed, st, assume_light))
-
-    async def set_direction(self, direction, st=None):
-        self.calls.append(("set_direction", direction, st))
-
-    async def set_light(self, percent, st=None, assume_speed=None):
-        self.calls.append(("set_light", percent, st, assume_speed))
-
-
 class _DummyCoordinator:
     def __init__(self, state):
         self._last_state = state
-        self.client = _DummyClient()
-        self.local_updates = []
-        self.refresh_scheduled = 0
-
-    def async_apply_local_state(self, **kwargs):
-        self.local_updates.append(kwargs)
+        self.controls = []
 
-    def async_schedule_immediate_refresh(self):
-        self.refresh_scheduled += 1
+    async def async_control(self, **kwargs):
+        self.controls.append(kwargs)
 
 
 def _entry(options):
@@ -52,29 +33,23 @@ def _entry(options):
 
 
 @pytest.mark.asyncio
-async def test_fan_set_percentage_applies_local_state_and_refresh():
+async def test_fan_set_percentage_queues_speed_control():
     coord = _DummyCoordinator(FanState(speed=1, valid=True))
     ent = FanSyncFan(coord, _entry({CONF_DIRECTION_SUPPORTED: True}))
 
     await ent.async_set_percentage(100)
 
-    assert coord.client.calls[0][0] == "set_speed"
-    assert coord.client.calls[0][1] == 3
-    assert coord.local_updates[-1] == {"speed": 3}
-    assert coord.refresh_scheduled == 1
+    assert coord.controls == [{"speed": 3, "assume_light": 100}]
 
 
 @pytest.mark.asyncio
-async def test_fan_set_direction_applies_local_state_and_refresh():
+async def test_fan_set_direction_queues_direction_control():
     coord = _DummyCoordinator(FanState(speed=2, direction=0, valid=True))
     ent = FanSyncFan(coord, _entry({CONF_DIRECTION_SUPPORTED: True}))
 
     await ent.async_set_direction("reverse")
 
-    assert coord.client.calls[0][0] == "set_direction"
-    assert coord.client.calls[0][1] == 1
-    assert coord.local_updates[-1] == {"direction": 1}
-    assert coord.refresh_scheduled == 1
+    assert coord.controls == [{"direction": 1}]
 
 
 @pytest.mark.asyncio
@@ -86,10 +61,7 @@ async def test_fan_turn_on_uses_configured_default_speed_when_off():
 
     await ent.async_turn_on()
 
-    assert coord.client.calls[0][0] == "set_speed"
-    assert coord.client.calls[0][1] == 2
-    assert coord.local_updates[-1] == {"speed": 2}
-    assert coord.refresh_scheduled == 1
+    assert coord.controls == [{"speed": 2, "assume_light": 100}]
 
 
 @pytest.mark.asyncio
@@ -101,23 +73,17 @@ async def test_fan_turn_on_accepts_ha_positional_preset_mode_arg():
 
     await ent.async_turn_on(None, None)
 
-    assert coord.client.calls[0][0] == "set_speed"
-    assert coord.client.calls[0][1] == 2
-    assert coord.local_updates[-1] == {"speed": 2}
-    assert coord.refresh_scheduled == 1
+    assert coord.controls[-1]["speed"] == 2
 
 
 @pytest.mark.asyncio
-async def test_fan_turn_off_sets_speed_zero_and_refreshes():
+async def test_fan_turn_off_sets_speed_zero():
     coord = _DummyCoordinator(FanState(speed=3, valid=True))
     ent = FanSyncFan(coord, _entry({CONF_DIRECTION_SUPPORTED: True}))
 
     await ent.async_turn_off()
 
-    assert coord.client.calls[0][0] == "set_speed"
-    assert coord.client.calls[0][1] == 0
-    assert coord.local_updates[-1] == {"speed": 0}
-    assert coord.refresh_scheduled == 1
+    assert coord.controls == [{"speed": 0, "assume_light": 100}]
 
 
 def test_fan_supported_features_include_turn_on_off_and_direction_when_enabled():
@@ -133,25 +99,42 @@ def test_fan_supported_features_include_turn_on_off_and_direction_when_enabled()
 
 
 @pytest.mark.asyncio
-async def test_light_turn_on_dimmable_updates_down_and_refresh():
+async def test_light_turn_on_dimmable_queues_down_control():
     coord = _DummyCoordinator(FanState(speed=2, down=10, valid=True))
     ent = FanSyncLight(coord, _entry({CONF_DIMMABLE: True}))
 
     await ent.async_turn_on(brightness=128)
 
-    assert coord.client.calls[0][0] == "set_light"
-    assert coord.local_updates[-1]["down"] == int(128 * 100 / 255)
-    assert coord.local_updates[-1]["speed"] is None
-    assert coord.refresh_scheduled == 1
+    assert coord.controls == [{"down": int(128 * 100 / 255), "assume_speed": 1}]
 
 
 @pytest.mark.asyncio
-async def test_light_turn_off_without_valid_state_sets_assumed_speed():
+async def test_light_turn_off_assumes_speed_off():
     coord = _DummyCoordinator(FanState(valid=False))
     ent = FanSyncLight(coord, _entry({CONF_DIMMABLE: False}))
 
     await ent.async_turn_off()
 
-    assert coord.client.calls[0][0] == "set_light"
-    assert coord.local_updates[-1] == {"down": 0, "speed": 0}
-    assert coord.refresh_scheduled == 1
+    assert coord.controls == [{"down": 0, "assume_speed": 0}]
+
+
+@pytest.mark.asyncio
+async def test_platform_setup_adds_entities_without_extra_refresh():
+    from custom_components.fansync_ble import fan as fan_platform
+    from custom_components.fansync_ble import light as light_platform
+
+    coord = _DummyCoordinator(FanState(speed=1, down=50, valid=True))
+    entry = SimpleNamespace(entry_id="entry-1", options={}, runtime_data=coord)
+    calls = []
+
+    def add_entities(entities, update_before_add=False):
+        calls.append((entities, update_before_add))
+
+    await fan_platform.async_setup_entry(None, entry, add_entities)
+    await light_platform.async_setup_entry(None, entry, add_entities)
+
+    assert [type(e[0][0]) for e in calls] == [FanSyncFan, FanSyncLight]
+    assert all(update_before_add is False for _, update_before_add in calls)
+    # Entities read the coordinator's first result directly
+    assert calls[0][0][0].is_on is True
+    assert calls[1][0][0].brightness == int(50 * 255 / 100)
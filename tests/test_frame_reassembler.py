@@ -0,0 +1,69 @@
+from custom_components.fansync_ble.client import FrameReassembler, build_frame
+from custom_components.fansync_ble.const import GET_FAN_STATUS, RETURN_FAN_STATUS
+
+
+def _ret(speed=1, down=0):
+    return build_frame(RETURN_FAN_STATUS, speed, 0, 0, down, 0, 0, 0)
+
+
+def test_single_frame_is_parsed_without_buffering():
+    r = FrameReassembler()
+    states = r.feed(bytearray(_ret(speed=2, down=30)))
+
+    assert [(s.speed, s.down) for s in states] == [(2, 30)]
+    assert r.diagnostics()["buffered_bytes"] == 0
+
+
+def test_split_frame_is_reassembled_across_notifications():
+    r = FrameReassembler()
+    frame = _ret(speed=3)
+
+    assert r.feed(frame[:4]) == []
+    assert r.feed(frame[4:7]) == []
+    states = r.feed(frame[7:])
+
+    assert len(states) == 1 and states[0].speed == 3
+    assert r.frames == 1
+
+
+def test_batched_frames_and_noise_are_separated():
+    r = FrameReassembler()
+    payload = b"\x00\x01" + _ret(speed=1) + _ret(speed=2) + _ret(speed=3)[:5]
+
+    states = r.feed(payload)
+    assert [s.speed for s in states] == [1, 2]
+    assert r.dropped_bytes == 2
+    assert r.diagnostics()["buffered_bytes"] == 5
+
+    states = r.feed(_ret(speed=3)[5:])
+    assert [s.speed for s in states] == [3]
+
+
+def test_corrupt_frame_resyncs_on_next_header():
+    r = FrameReassembler()
+    bad = bytearray(_ret(speed=1))
+    bad[9] ^= 0xFF
+
+    states = r.feed(bytes(bad) + _ret(speed=2))
+
+    assert [s.speed for s in states] == [2]
+    assert r.corrupt_frames == 1
+    assert r.dropped_bytes == 10
+
+
+def test_other_command_frames_are_ignored():
+    r = FrameReassembler()
+    get = build_frame(GET_FAN_STATUS, 0, 0, 0, 0, 0, 0, 0)
+
+    assert r.feed(get + _ret(speed=1))[0].speed == 1
+    assert r.feed(get) == []
+    assert r.ignored_frames == 2
+
+
+def test_reset_discards_partial_frame():
+    r = FrameReassembler()
+    r.feed(_ret()[:6])
+    r.reset()
+
+    assert r.feed(_ret(speed=2))[0].speed == 2
+    assert r.dropped_bytes == 6
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from custom_components.fansync_ble import client as client_mod
+from custom_components.fansync_ble.client import FanSyncBleClient
+from custom_components.fansync_ble.metrics import (
+    BUCKET_BOUNDS_MS,
+    Histogram,
+    SessionTimings,
+)
+from tests.fansync_sim import SimConfig, SimulatedFan, SimulatedTransport
+
+
+def test_histogram_percentiles_use_bucket_upper_bounds():
+    hist = Histogram()
+    for ms in [3] * 90 + [150] * 9 + [30000]:
+        hist.add(ms / 1000)
+
+    snap = hist.snapshot()
+    assert snap["count"] == 100
+    assert snap["p50_ms"] == 5
+    assert snap["p95_ms"] == 200
+    assert snap["p99_ms"] == 200
+    assert snap["max_ms"] == 30000
+    assert snap["min_ms"] == 3
+    # Memory stays bounded regardless of sample count
+    assert len(hist.counts) == len(BUCKET_BOUNDS_MS) + 1
+
+
+def test_timer_records_even_when_block_raises():
+    timings = SessionTimings()
+    with pytest.raises(RuntimeError):
+        with timings.time("connect"):
+            raise RuntimeError
+    assert timings.snapshot()["connect"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_times_every_session_phase(monkeypatch):
+    monkeypatch.setattr(client_mod, "POST_DISCONNECT_DELAY", 0.0)
+    fan = SimulatedFan(SimConfig(notify_delay=0.01), speed=1)
+    c = FanSyncBleClient("AA:BB", transport=SimulatedTransport(fan))
+
+    st = await c.get_state(timeout=0.5)
+    await c.set_speed(2, st=st)
+
+    snap = c.timings.snapshot()
+    for phase in (
+        "lock_wait",
+        "connect",
+        "notify_start",
+        "write",
+        "first_return",
+        "disconnect",
+    ):
+        assert snap[phase]["count"] == 2, phase
+    assert snap["first_return"]["min_ms"] >= 10
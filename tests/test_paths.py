@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.fansync_ble import paths as paths_mod
+from custom_components.fansync_ble.client import FanSyncBleClient
+from custom_components.fansync_ble.const import PATH_STICKY_BONUS
+from custom_components.fansync_ble.paths import (
+    ConnectionPath,
+    FanSyncPathSelector,
+    async_connection_paths,
+)
+from custom_components.fansync_ble.scheduler import FanSyncSessionScheduler
+
+
+def _scanner_device(source, rssi, free=None, slots=3):
+    allocations = (
+        None if free is None else SimpleNamespace(source=source, slots=slots, free=free)
+    )
+    return SimpleNamespace(
+        scanner=SimpleNamespace(
+            source=source, name=f"proxy-{source}", get_allocations=lambda: allocations
+        ),
+        advertisement=SimpleNamespace(rssi=rssi),
+    )
+
+
+class _FakeBluetooth:
+    def __init__(self, devices):
+        self.devices = devices
+
+    def async_scanner_devices_by_address(self, hass, address, connectable=True):
+        return self.devices
+
+
+def test_connection_paths_read_rssi_and_slot_allocations(monkeypatch):
+    bt = _FakeBluetooth(
+        [_scanner_device("p1", -60, free=0), _scanner_device("p2", -80)]
+    )
+    monkeypatch.setattr(paths_mod, "_bluetooth_api", lambda: bt)
+
+    paths = async_connection_paths(object(), "AA:BB")
+
+    assert [(p.source, p.rssi, p.free_slots, p.total_slots) for p in paths] == [
+        ("p1", -60, 0, 3),
+        ("p2", -80, None, None),
+    ]
+    assert async_connection_paths(None, "AA:BB") == []
+
+
+def test_selector_prefers_free_slots_then_rssi():
+    selector = FanSyncPathSelector()
+    full = ConnectionPath("near", "near", -50, free_slots=0, total_slots=3)
+    far = ConnectionPath("far", "far", -85, free_slots=1, total_slots=3)
+    mid = ConnectionPath("mid", "mid", -70)
+
+    assert [p.source for p in selector.rank([full, far, mid])] == ["mid", "far", "near"]
+    assert selector.select([full, far, mid]).source == "mid"
+    assert selector.diagnostics()["predicted"] == "mid"
+    assert selector.select([]) is None
+
+
+def test_selector_learns_from_actual_connections():
+    selector = FanSyncPathSelector()
+    a = ConnectionPath("a", "a", -60)
+    b = ConnectionPath("b", "b", -60 - PATH_STICKY_BONUS + 1)
+
+    assert selector.select([a, b]).source == "a"
+    # HA connected through "b" instead; it gets the sticky bonus.
+    selector.record("b", 0.5)
+    assert selector.select([a, b]).source == "b"
+    selector.record("b", 0.2)
+    selector.record_failure()
+
+    diag = selector.diagnostics()
+    assert (diag["predicted"], diag["connected"]) == ("b", "b")
+    assert diag["mispredicted"] == 1
+    assert diag["failures"] == 1
+    assert diag["paths"] == {"b": {"successes": 2, "connect_ms": 440.0}}
+
+
+@pytest.mark.asyncio
+async def test_selector_skips_adapters_with_busy_scheduler_slots():
+    scheduler = FanSyncSessionScheduler(slots_per_adapter=1)
+    selector = FanSyncPathSelector(scheduler.free_slots)
+    lease = await scheduler.async_acquire("CC:DD", "near")
+
+    near = ConnectionPath("near", "near", -50)
+    far = ConnectionPath("far", "far", -80)
+    assert selector.select([near, far]).source == "far"
+    lease.release()
+    assert selector.select([near, far]).source == "near"
+
+
+@pytest.mark.asyncio
+async def test_client_follows_the_scanner_ha_connected_through(monkeypatch):
+    bt = _FakeBluetooth([_scanner_device("p1", -90), _scanner_device("p2", -55)])
+    monkeypatch.setattr(paths_mod, "_bluetooth_api", lambda: bt)
+    scheduler = FanSyncSessionScheduler()
+    c = FanSyncBleClient("AA:BB", hass=object(), scheduler=scheduler)
+
+    c._select_path()
+    assert c._resolve_adapter() == "p2"
+    await c._acquire_slot()
+    assert scheduler.diagnostics()["p2"]["active"] == 1
+
+    # HA's wrapper picked p1 on its own.
+    wrapper = SimpleNamespace(_connected_scanner=SimpleNamespace(source="p1"))
+    c._record_path(wrapper, 0.3)
+
+    assert c._path.source == "p1"
+    assert c._path.rssi == -90
+    assert scheduler.diagnostics()["p1"]["active"] == 1
+    assert scheduler.diagnostics()["p2"]["active"] == 0
+    path = c.connection_diagnostics()["path"]
+    assert (path["predicted"], path["connected"]) == ("p2", "p1")
+    assert list(path["paths"]) == ["p1"]
+    c._release_slot()
+    assert scheduler.diagnostics()["p1"]["active"] == 0
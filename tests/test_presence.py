@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.fansync_ble import presence as presence_mod
+from custom_components.fansync_ble.client import FanState
+from custom_components.fansync_ble.presence import (
+    REASON_NO_SCANNER,
+    REASON_NOT_ADVERTISING,
+    DeviceNotReachable,
+    FanSyncPresence,
+)
+from tests.test_coordinator import _coord_without_init
+
+
+class _FakeBluetooth:
+    BluetoothScanningMode = SimpleNamespace(PASSIVE="passive")
+
+    def __init__(self, present: bool = True, scanners: int = 1):
+        self.present = present
+        self.scanners = scanners
+        self.advertisement = None
+        self.unavailable = None
+        self.unsubscribed = 0
+
+    @staticmethod
+    def BluetoothCallbackMatcher(**kwargs):
+        return kwargs
+
+    def async_address_present(self, hass, address, connectable=True):
+        return self.present
+
+    def async_last_service_info(self, hass, address, connectable=True):
+        return SimpleNamespace(rssi=-70) if self.present else None
+
+    def async_scanner_count(self, hass, connectable=True):
+        return self.scanners
+
+    def async_register_callback(self, hass, callback, matcher, mode):
+        self.advertisement = callback
+        return self._unsub
+
+    def async_track_unavailable(self, hass, callback, address, connectable=True):
+        self.unavailable = callback
+        return self._unsub
+
+    def _unsub(self):
+        self.unsubscribed += 1
+
+
+def _tracked(monkeypatch, bt, on_seen=lambda: None) -> FanSyncPresence:
+    monkeypatch.setattr(presence_mod, "_bluetooth_api", lambda: bt)
+    presence = FanSyncPresence(object(), "AA:BB", on_seen)
+    presence.async_start()
+    return presence
+
+
+def test_presence_without_ha_bluetooth_never_gates(monkeypatch):
+    monkeypatch.setattr(presence_mod, "_bluetooth_api", lambda: None)
+    presence = FanSyncPresence(object(), "AA:BB", lambda: None)
+    presence.async_start()
+
+    assert not presence.tracking
+    assert presence.unreachable_reason() is None
+
+
+def test_presence_follows_advertisements_and_reports_return(monkeypatch):
+    bt = _FakeBluetooth(present=False)
+    seen = []
+    presence = _tracked(monkeypatch, bt, lambda: seen.append(True))
+
+    assert presence.unreachable_reason() == REASON_NOT_ADVERTISING
+    assert presence.last_rssi is None
+    bt.advertisement(SimpleNamespace(rssi=-80), None)
+    bt.advertisement(SimpleNamespace(rssi=-62), None)
+    assert presence.last_rssi == -62
+    assert presence.unreachable_reason() is None
+    # Only the transition from absent to present triggers a refresh
+    assert seen == [True]
+
+    bt.unavailable(None)
+    assert not presence.device_present
+    bt.scanners = 0
+    assert presence.unreachable_reason() == REASON_NO_SCANNER
+
+    presence.async_stop()
+    assert bt.unsubscribed == 2
+    assert not presence.tracking
+
+
+@pytest.mark.asyncio
+async def test_poll_is_skipped_while_device_is_absent(monkeypatch):
+    coord = _coord_without_init()
+    coord._presence = _tracked(monkeypatch, _FakeBluetooth(present=False))
+    coord._last_state = FanState(speed=1, valid=True)
+
+    async def fetch():
+        raise AssertionError("no BLE session expected")
+
+    coord._async_fetch_state = fetch
+    result = await coord._async_poll()
+
+    assert result is coord._last_state
+    assert coord._last_error == REASON_NOT_ADVERTISING
+    assert coord._consecutive_failures == 1
+    assert coord._presence.diagnostics()["skipped_polls"] == 1
+
+
+def test_open_link_counts_as_present_while_fan_stops_advertising(monkeypatch):
+    bt = _FakeBluetooth(present=True)
+    linked = [True]
+    monkeypatch.setattr(presence_mod, "_bluetooth_api", lambda: bt)
+    presence = FanSyncPresence(object(), "AA:BB", lambda: None, lambda: linked[0])
+    presence.async_start()
+
+    # HA marks the fan gone once the held link silences its advertisements.
+    bt.unavailable(None)
+    assert presence.unreachable_reason() is None
+    assert presence.diagnostics()["link_held"]
+
+    linked[0] = False
+    assert presence.unreachable_reason() == REASON_NOT_ADVERTISING
+
+
+@pytest.mark.asyncio
+async def test_command_fails_fast_without_connectable_scanner(monkeypatch):
+    coord = _coord_without_init()
+    coord._presence = _tracked(monkeypatch, _FakeBluetooth(scanners=0))
+
+    with pytest.raises(DeviceNotReachable):
+        await coord.async_control(speed=2)
@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.fansync_ble.client import FanState, FanSyncBleClient
+from custom_components.fansync_ble.const import DOMAIN
+from custom_components.fansync_ble.scheduler import (
+    PRIORITY_COMMAND,
+    PRIORITY_MAINTENANCE,
+    PRIORITY_POLL,
+    FanSyncSessionScheduler,
+    FanSyncStartupQueue,
+    PollSuperseded,
+    PrioritySessionLock,
+    SlotUnavailable,
+    async_get_scheduler,
+)
+
+
+@pytest.mark.asyncio
+async def test_slots_are_limited_per_adapter():
+    sched = FanSyncSessionScheduler(slots_per_adapter=2)
+    a = await sched.async_acquire("A", "proxy-1")
+    b = await sched.async_acquire("B", "proxy-1")
+    # Other adapters are independent
+    other = await sched.async_acquire("C", "proxy-2")
+
+    waiter = asyncio.create_task(sched.async_acquire("D", "proxy-1"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    assert sched.diagnostics()["proxy-1"]["queued"] == 1
+
+    a.release()
+    lease = await waiter
+    assert sched.diagnostics()["proxy-1"]["active"] == 2
+    assert sched.diagnostics()["proxy-1"]["queued"] == 0
+
+    for held in (b, other, lease):
+        held.release()
+    # Releasing twice is harmless
+    lease.release()
+    assert sched.diagnostics()["proxy-1"]["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_round_robin_across_devices():
+    sched = FanSyncSessionScheduler(slots_per_adapter=1)
+    held = await sched.async_acquire("X", None)
+    order = []
+
+    async def session(address):
+        lease = await sched.async_acquire(address, None)
+        order.append(address)
+        await asyncio.sleep(0)
+        lease.release()
+
+    # Device A queues three sessions before B and C queue one each.
+    tasks = [asyncio.create_task(session(addr)) for addr in ("A", "A", "A", "B", "C")]
+    await asyncio.sleep(0)
+    held.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["A", "B", "C", "A", "A"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    sched = FanSyncSessionScheduler(slots_per_adapter=1)
+    held = await sched.async_acquire("A", None)
+    waiter = asyncio.create_task(sched.async_acquire("B", None))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    held.release()
+    lease = await asyncio.wait_for(sched.async_acquire("C", None), timeout=1)
+    assert sched.diagnostics()["default"]["active"] == 1
+    lease.release()
+
+
+@pytest.mark.asyncio
+async def test_acquire_gives_up_when_no_slot_frees_in_time():
+    sched = FanSyncSessionScheduler(slots_per_adapter=1)
+    held = await sched.async_acquire("A", None)
+    with pytest.raises(SlotUnavailable):
+        await sched.async_acquire("B", None, timeout=0.05)
+    assert sched.diagnostics()["default"]["queued"] == 0
+    assert sched.diagnostics()["default"]["timeouts"] == 1
+
+    held.release()
+    lease = await sched.async_acquire("C", None, timeout=0.05)
+    assert sched.diagnostics()["default"]["active"] == 1
+    lease.release()
+
+
+@pytest.mark.asyncio
+async def test_command_fails_within_budget_when_adapter_is_full():
+    sched = FanSyncSessionScheduler(slots_per_adapter=1)
+    held = await sched.async_acquire("OTHER", None)
+    c = FanSyncBleClient("AA", scheduler=sched, session_budget=0.1)
+
+    with pytest.raises(SlotUnavailable):
+        await asyncio.wait_for(c.set_speed(1, st=FanState(valid=True)), timeout=1)
+    assert sched.diagnostics()["default"]["active"] == 1
+    held.release()
+
+
+@pytest.mark.asyncio
+async def test_idle_keep_alive_link_is_closed_for_a_waiting_fan(monkeypatch):
+    sched = FanSyncSessionScheduler(slots_per_adapter=1)
+
+    class DummyConnection:
+        is_connected = True
+
+        async def disconnect(self):
+            self.is_connected = False
+
+    async def fake_connect(self, attempts=None):
+        return DummyConnection()
+
+    async def fake_write(self, client, payload):
+        return None
+
+    monkeypatch.setattr(FanSyncBleClient, "_connect", fake_connect)
+    monkeypatch.setattr(FanSyncBleClient, "_write", fake_write)
+
+    c = FanSyncBleClient("AA", scheduler=sched, keep_alive=True, idle_timeout=60)
+    await c.set_speed(1, st=FanState(valid=True))
+    # The open link keeps its slot and is reused without another grant.
+    assert c.is_connected
+    assert sched.diagnostics()["default"]["active"] == 1
+    await c.set_speed(2, st=FanState(valid=True))
+    assert sched.diagnostics()["default"]["granted"] == 1
+
+    # Another fan waiting on the adapter makes the idle link close.
+    other = await sched.async_acquire("BB", None, timeout=1.0)
+    assert not c.is_connected
+    diag = sched.diagnostics()["default"]
+    assert diag["active"] == 1
+    assert diag["reclaimed"] == 1
+    other.release()
+    await c.async_close()
+
+
+def test_async_get_scheduler_is_shared_through_hass_data():
+    hass = SimpleNamespace(data={})
+    sched = async_get_scheduler(hass)
+    assert async_get_scheduler(hass) is sched
+    assert hass.data[DOMAIN]["scheduler"] is sched
+
+
+@pytest.mark.asyncio
+async def test_client_sessions_hold_a_slot_until_disconnect(monkeypatch):
+    sched = FanSyncSessionScheduler(slots_per_adapter=1)
+    active = []
+
+    class DummyConnection:
+        async def disconnect(self):
+            active.append(("disconnect", sched.diagnostics()["default"]["active"]))
+
+    async def fake_connect(self, attempts=None):
+        active.append(("connect", sched.diagnostics()["default"]["active"]))
+        return DummyConnection()
+
+    async def fake_write(self, client, payload):
+        return None
+
+    async def fast_sleep(_seconds):
+        return None
+
+    monkeypatch.setattr(FanSyncBleClient, "_connect", fake_connect)
+    monkeypatch.setattr(FanSyncBleClient, "_write", fake_write)
+    monkeypatch.setattr(
+        "custom_components.fansync_ble.client.asyncio.sleep", fast_sleep
+    )
+
+    c1 = FanSyncBleClient("AA", scheduler=sched)
+    c2 = FanSyncBleClient("BB", scheduler=sched)
+    await asyncio.gather(
+        c1.set_speed(1, st=FanState(valid=True)),
+        c2.set_speed(2, st=FanState(valid=True)),
+    )
+
+    assert active == [
+        ("connect", 1),
+        ("disconnect", 1),
+        ("connect", 1),
+        ("disconnect", 1),
+    ]
+    assert sched.diagnostics()["default"]["active"] == 0
+    assert sched.diagnostics()["default"]["granted"] == 2
+
+
+@pytest.mark.asyncio
+async def test_priority_lock_serves_commands_before_maintenance():
+    lock = PrioritySessionLock()
+    order = []
+
+    async def run(priority, name):
+        async with lock.session(priority):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await lock.acquire()
+    tasks = [
+        asyncio.create_task(run(PRIORITY_MAINTENANCE, "maintenance")),
+        asyncio.create_task(run(PRIORITY_COMMAND, "command")),
+    ]
+    await asyncio.sleep(0)
+    lock.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["command", "maintenance"]
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_queued_poll_is_dropped_when_command_arrives():
+    lock = PrioritySessionLock()
+    await lock.acquire()
+    poll = asyncio.create_task(lock.acquire(PRIORITY_POLL))
+    await asyncio.sleep(0)
+    command = asyncio.create_task(lock.acquire(PRIORITY_COMMAND))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PollSuperseded):
+        await poll
+    # New polls are refused while a command waits
+    with pytest.raises(PollSuperseded):
+        await lock.acquire(PRIORITY_POLL)
+
+    lock.release()
+    await command
+    assert lock.holder_priority == PRIORITY_COMMAND
+    lock.release()
+
+
+@pytest.mark.asyncio
+async def test_dropped_poll_cancelled_before_waking_does_not_release():
+    lock = PrioritySessionLock()
+    await lock.acquire()
+    poll = asyncio.create_task(lock.acquire(PRIORITY_POLL))
+    await asyncio.sleep(0)
+    command = asyncio.create_task(lock.acquire(PRIORITY_COMMAND))
+    await asyncio.sleep(0)
+
+    # The poll was superseded but is cancelled before it resumes.
+    poll.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await poll
+    await asyncio.sleep(0)
+    assert not command.done()
+    assert lock.holder_priority == PRIORITY_MAINTENANCE
+
+    lock.release()
+    await command
+    assert lock.holder_priority == PRIORITY_COMMAND
+    lock.release()
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_command_preempts_running_poll(monkeypatch):
+    poll_started = asyncio.Event()
+    disconnects = []
+
+    class DummyConnection:
+        async def disconnect(self):
+            disconnects.append(True)
+
+    async def fake_connect(self, attempts=None):
+        return DummyConnection()
+
+    async def slow_read_state(self, client, timeout=2.0):
+        poll_started.set()
+        await asyncio.sleep(10)
+
+    async def fake_write(self, client, payload):
+        return None
+
+    async def fast_sleep(_seconds):
+        return None
+
+    monkeypatch.setattr(FanSyncBleClient, "_connect", fake_connect)
+    monkeypatch.setattr(FanSyncBleClient, "_read_state", slow_read_state)
+    monkeypatch.setattr(FanSyncBleClient, "_write", fake_write)
+
+    c = FanSyncBleClient("AA:BB")
+    poll = asyncio.create_task(c.get_state(timeout=4.0))
+    await poll_started.wait()
+    monkeypatch.setattr(
+        "custom_components.fansync_ble.client.asyncio.sleep", fast_sleep
+    )
+
+    await asyncio.wait_for(c.set_speed(2, st=FanState(valid=True)), timeout=1)
+    with pytest.raises(PollSuperseded):
+        await poll
+    # The preempted poll still closed its connection
+    assert len(disconnects) == 2
+
+
+@pytest.mark.asyncio
+async def test_startup_queue_staggers_and_limits_first_refreshes():
+    queue = FanSyncStartupQueue(concurrency=2, stagger=0.02, jitter=0.0, budget=5)
+    running = 0
+    peak = 0
+
+    async def refresh():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    await asyncio.gather(*(queue.async_run(f"e{i}", refresh) for i in range(5)))
+
+    diag = queue.diagnostics()
+    assert peak == 2
+    assert [diag["entries"][f"e{i}"]["delay"] for i in range(5)] == [
+        0.0,
+        0.02,
+        0.04,
+        0.06,
+        0.08,
+    ]
+    assert all(info["done"] for info in diag["entries"].values())
+    assert diag["pending"] == 0
+    assert diag["within_budget"] is True
+    assert diag["elapsed"] >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_startup_queue_records_failed_refresh_as_done():
+    queue = FanSyncStartupQueue(concurrency=1, stagger=0.0, jitter=0.0)
+
+    async def refresh():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await queue.async_run("e1", refresh)
+    assert queue.diagnostics()["entries"]["e1"]["done"] is True
+
+
+@pytest.mark.asyncio
+async def test_startup_queue_marks_cancelled_entry_done():
+    queue = FanSyncStartupQueue(concurrency=1, stagger=10.0, jitter=0.0)
+    gate = asyncio.Event()
+
+    first = asyncio.create_task(queue.async_run("e1", gate.wait))
+    second = asyncio.create_task(queue.async_run("e2", gate.wait))
+    await asyncio.sleep(0)
+    # Unloaded while still waiting for its stagger slot
+    second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    gate.set()
+    await first
+
+    diag = queue.diagnostics()
+    assert diag["pending"] == 0
+    assert diag["entries"]["e2"]["done"] is True
+
+
+@pytest.mark.asyncio
+async def test_startup_queue_times_a_later_entry_from_its_own_start():
+    queue = FanSyncStartupQueue(concurrency=1, stagger=0.0, jitter=0.0, budget=0.05)
+
+    async def refresh():
+        return None
+
+    await queue.async_run("boot", refresh)
+    await asyncio.sleep(0.1)
+    await queue.async_run("added", refresh)
+
+    diag = queue.diagnostics()
+    assert diag["elapsed"] < 0.05
+    assert diag["within_budget"] is True
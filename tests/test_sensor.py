@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.fansync_ble.client import FanState
+from custom_components.fansync_ble.commands import FanSyncCommandQueue
+
+pytest.importorskip("homeassistant.components.sensor")
+from custom_components.fansync_ble.sensor import SENSORS, FanSyncLinkSensor
+from custom_components.fansync_ble import sensor as sensor_platform
+from tests.test_coordinator import _coord_without_init
+
+
+def _coord_with_stats():
+    coord = _coord_without_init()
+    coord._commands = FanSyncCommandQueue(coord)
+    coord._commands._latencies.extend([100.0, 300.0])
+    coord._poll_results.extend([True, True, True, False])
+    coord._consecutive_failures = 1
+    coord._last_success_at = datetime.now(UTC) - timedelta(seconds=42)
+    coord._presence.last_rssi = -71
+    return coord
+
+
+def test_link_stats_summarize_recent_activity():
+    stats = _coord_with_stats().link_stats()
+
+    assert stats["last_command_latency"] == 300.0
+    assert stats["mean_command_latency"] == 200.0
+    assert stats["poll_success_ratio"] == 75.0
+    assert stats["consecutive_failures"] == 1
+    assert 41 <= stats["seconds_since_good_state"] <= 43
+    assert stats["rssi"] == -71
+
+
+def test_link_stats_are_empty_before_any_session():
+    coord = _coord_without_init()
+    coord._commands = FanSyncCommandQueue(coord)
+    stats = coord.link_stats()
+
+    assert stats["last_command_latency"] is None
+    assert stats["poll_success_ratio"] is None
+    assert stats["seconds_since_good_state"] is None
+
+
+@pytest.mark.asyncio
+async def test_poll_without_state_reply_counts_against_link_health():
+    coord = _coord_with_stats()
+    coord._last_state = FanState(speed=1, valid=True)
+
+    async def no_reply(timeout=4.0):
+        return FanState()
+
+    coord.client.get_state = no_reply
+    await coord._async_update_data()
+    stats = coord.link_stats()
+
+    assert stats["poll_success_ratio"] == 60.0
+    assert stats["consecutive_failures"] == 2
+    assert stats["seconds_since_good_state"] >= 41
+
+
+@pytest.mark.asyncio
+async def test_sensor_platform_adds_disabled_diagnostic_sensors():
+    coord = _coord_with_stats()
+    coord._last_state = FanState(valid=False)
+    entry = SimpleNamespace(entry_id="entry-1", options={}, runtime_data=coord)
+    added = []
+
+    await sensor_platform.async_setup_entry(None, entry, added.extend)
+
+    assert [s.entity_description.key for s in added] == [d.key for d in SENSORS]
+    by_key = {s.entity_description.key: s for s in added}
+    sensor: FanSyncLinkSensor = by_key["poll_success_ratio"]
+    assert sensor.native_value == 75.0
+    assert sensor.unique_id == "entry-1-poll_success_ratio"
+    # Link health is shown even while the fan state is unknown
+    assert sensor.available is True
+    assert sensor.entity_registry_enabled_default is False
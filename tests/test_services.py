@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.fansync_ble.const import (
+    CONF_DIMMABLE,
+    CONF_DIRECTION_SUPPORTED,
+    CONF_HAS_LIGHT,
+)
+from custom_components.fansync_ble.services import async_drive_group, group_intent
+
+
+class _Coordinator:
+    def __init__(self, delay: float = 0.0, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.controls = []
+
+    async def async_control(self, **intent):
+        self.controls.append(intent)
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+
+
+def test_group_intent_mirrors_entity_fallbacks():
+    assert group_intent(speed=0) == {
+        "speed": 0,
+        "direction": None,
+        "down": None,
+        "assume_light": 100,
+    }
+    assert group_intent(light=0)["assume_speed"] == 0
+    assert group_intent(light=60)["assume_speed"] == 1
+    assert "assume_light" not in group_intent(speed=2, light=10)
+
+
+@pytest.mark.asyncio
+async def test_group_runs_fans_concurrently_and_reports_each_result():
+    fans = {f"entry-{i}": _Coordinator(delay=0.05) for i in range(6)}
+    fans["entry-3"].error = RuntimeError("out of range")
+
+    result = await async_drive_group(
+        (entry_id, fan, group_intent(speed=0)) for entry_id, fan in fans.items()
+    )
+
+    # Six 50 ms sessions in parallel, not back to back
+    assert result["total_time"] < 0.2
+    assert result["succeeded"] == 5 and result["failed"] == 1
+    assert result["results"]["entry-3"] == {
+        "success": False,
+        "error": "out of range",
+        "skipped": False,
+        "elapsed": pytest.approx(0.05, abs=0.04),
+    }
+    assert result["results"]["entry-0"]["success"] is True
+    assert all(f.controls == [group_intent(speed=0)] for f in fans.values())
+
+
+@pytest.mark.asyncio
+async def test_group_builds_each_intent_from_the_entry_options():
+    options = {
+        "full": {CONF_DIRECTION_SUPPORTED: True},
+        "on-off": {CONF_DIMMABLE: False},
+        "no-light": {CONF_HAS_LIGHT: False},
+    }
+    fans = {entry_id: _Coordinator() for entry_id in options}
+
+    result = await async_drive_group(
+        (
+            entry_id,
+            fan,
+            group_intent(direction=1, light=40, options=options[entry_id]),
+        )
+        for entry_id, fan in fans.items()
+    )
+
+    assert fans["full"].controls == [
+        {"speed": None, "direction": 1, "down": 40, "assume_speed": 1}
+    ]
+    # Direction is unsupported and the light is clamped to on/off
+    assert fans["on-off"].controls == [
+        {"speed": None, "direction": None, "down": 100, "assume_speed": 1}
+    ]
+    # Nothing applies: the fan is skipped without a session
+    assert fans["no-light"].controls == []
+    assert result["results"]["no-light"]["skipped"] is True
+    assert result["succeeded"] == 3 and result["failed"] == 0
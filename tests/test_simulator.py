@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.fansync_ble import client as client_mod
+from custom_components.fansync_ble.client import FanState, FanSyncBleClient
+from tests.fansync_sim import SimConfig, SimulatedFan, SimulatedTransport
+
+
+@pytest.fixture(autouse=True)
+def _no_cooldown(monkeypatch):
+    monkeypatch.setattr(client_mod, "POST_DISCONNECT_DELAY", 0.0)
+
+
+@pytest.mark.asyncio
+async def test_get_and_set_round_trip_over_simulated_transport():
+    fan = SimulatedFan(speed=1, down=40, fan_type=7)
+    c = FanSyncBleClient("AA:BB", transport=SimulatedTransport(fan))
+
+    st = await c.get_state(timeout=0.5)
+    assert st.valid and st.speed == 1 and st.down == 40
+
+    echo = await c.set_speed(3, st=st)
+    assert echo is not None and echo.speed == 3
+    # Untouched fields survive the write on the device side
+    assert (fan.speed, fan.down, fan.fan_type) == (3, 40, 7)
+    assert fan.connects == 2
+    assert not fan.connections
+    assert c.connection_diagnostics()["strategy"] == client_mod.STRATEGY_TRANSPORT
+
+
+@pytest.mark.asyncio
+async def test_lost_notifications_time_out_and_keep_write(monkeypatch):
+    monkeypatch.setattr(client_mod, "WRITE_CONFIRM_TIMEOUT", 0.05)
+    fan = SimulatedFan(SimConfig(loss=1.0), speed=1)
+    c = FanSyncBleClient("AA:BB", transport=SimulatedTransport(fan))
+
+    st = await c.get_state(timeout=0.05)
+    assert not st.valid
+    assert await c.set_speed(2, st=FanState(speed=1, valid=True)) is None
+    assert fan.speed == 2
+
+
+@pytest.mark.asyncio
+async def test_remote_changes_are_pushed_and_link_loss_reported():
+    fan = SimulatedFan(speed=0)
+    c = FanSyncBleClient("AA:BB", transport=SimulatedTransport(fan))
+    seen, lost = [], []
+
+    await c.async_start_push(seen.append, lambda: lost.append(True), timeout=0.5)
+    fan.press_remote(speed=2)
+    assert seen[-1].speed == 2
+
+    fan.drop_links()
+    assert lost == [True]
+    assert not c.push_active
+    await c.async_close()
+
+
+def test_simulated_fan_rejects_corrupt_frames():
+    fan = SimulatedFan()
+    frame = bytearray(client_mod.build_frame(0x31, 3, 0, 0, 0, 0, 0, 0))
+    frame[9] ^= 0xFF
+
+    assert fan.handle_frame(bytes(frame)) is None
+    assert fan.speed == 0
+    assert fan.frames_rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_connect_latency_is_applied():
+    fan = SimulatedFan(SimConfig(connect_latency=0.05))
+    c = FanSyncBleClient("AA:BB", transport=SimulatedTransport(fan))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    await c.get_state(timeout=0.5)
+
+    assert loop.time() - start >= 0.05